@@ -6,10 +6,11 @@ Gera planilhas Excel a partir dos dados extraídos.
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
 import os
 
 from src.api.routes import router
+from src.processing.executor import processor_executor
+from src.jobs.runner import job_runner
 
 # Criar aplicação FastAPI
 app = FastAPI(
@@ -30,6 +31,17 @@ app.add_middleware(
 # Incluir rotas da API
 app.include_router(router)
 
+@app.on_event("startup")
+async def iniciar_jobs():
+    """Inicia o consumo da fila de jobs neste worker."""
+    job_runner.iniciar()
+
+@app.on_event("shutdown")
+async def encerrar_executor():
+    """Para o runner de jobs e encerra os pools de processamento ao desligar o worker."""
+    await job_runner.parar()
+    processor_executor.encerrar()
+
 # Definir endpoints fixos ANTES de montar static files (que captura tudo)
 @app.get("/api/info", include_in_schema=False)
 async def get_info():
@@ -55,6 +67,7 @@ if os.path.exists(frontend_path):
 if __name__ == "__main__":
     import uvicorn
     import sys
+    from src.processing.ocr_service import iniciar_servico, parar_servico
     
     # Detectar ambiente
     is_production = "--prod" in sys.argv
@@ -68,19 +81,26 @@ if __name__ == "__main__":
     print(f" Host: {host}")
     print(f" Porta: {port}")
     if is_production:
-        print(f" URL: http://192.168.1.25")
+        print(" URL: http://192.168.1.25")
     else:
         print(f" URL: http://localhost:{port}")
     print("\n Pressione Ctrl+C para parar")
     print("="*60 + "\n")
     
-    # Rodar sem reload quando em produção ou quando há workers múltiplos
-    uvicorn.run(
-        "app:app",
-        host=host,
-        port=port,
-        log_level="info",
-        reload=not is_production,
-        reload_dirs=["."] if not is_production else None,
-        workers=4 if is_production else 1
-    )
+    # Serviço de OCR compartilhado pelos workers (modelo carregado uma única vez)
+    servico_ocr = iniciar_servico()
+    
+    try:
+        # Rodar sem reload quando em produção ou quando há workers múltiplos
+        uvicorn.run(
+            "app:app",
+            host=host,
+            port=port,
+            log_level="info",
+            reload=not is_production,
+            reload_dirs=["."] if not is_production else None,
+            workers=4 if is_production else 1
+        )
+    finally:
+        if servico_ocr is not None:
+            parar_servico(servico_ocr)
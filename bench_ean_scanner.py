@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Micro-benchmark do extract_ean13: 13 regex por chamada (cópia da versão
+anterior) x varredura única (iter_ean13).
+
+Mede chamadas linha a linha e por token, como fazem TXTProcessor, PDFProcessor
+e ImageProcessor, e confere que as duas versões devolvem o mesmo EAN.
+
+Uso:
+    python bench_ean_scanner.py [arquivo.txt|arquivo.pdf ...]
+
+Sem arquivos, usa texto sintético nos layouts de pedido TXT e PDF.
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+from src.utils.validators import extract_ean13, is_valid_ean13
+
+
+# ===== VERSÃO ANTERIOR (13 padrões por chamada) =====
+
+def extract_ean13_legado(text: str) -> str | None:
+    if not text:
+        return None
+
+    variacoes = [
+        r'Código\s+de\s+Barras\s*:?\s*(\d{13})',
+        r'Codigo\s+de\s+Barras\s*:?\s*(\d{13})',
+        r'Código\s+Barras\s*:?\s*(\d{13})',
+        r'Codigo\s+Barras\s*:?\s*(\d{13})',
+        r'CodBarra\s*:?\s*(\d{13})',
+        r'Cod\s+Barra\s*:?\s*(\d{13})',
+        r'Ref\.?\s*:?\s*(\d{13})',
+        r'Referência\s*:?\s*(\d{13})',
+        r'Referencia\s*:?\s*(\d{13})',
+        r'EAN\s*:?\s*(\d{13})',
+        r'Barras\s*:?\s*(\d{13})',
+        r':(\d{13})\s',
+        r'(?:^|\s)(\d{13})(?:\s|$)',
+    ]
+
+    for pattern in variacoes:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            ean = match.group(1)
+            if is_valid_ean13(ean):
+                return ean
+
+    return None
+
+
+# ===== TEXTO =====
+
+def _ean(n: int) -> str:
+    base = f"789{n:09d}"
+    soma = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(base))
+    return base + str((10 - soma % 10) % 10)
+
+
+def texto_sintetico(linhas: int = 20_000, seed: int = 42) -> str:
+    """Pedidos nos layouts comuns: TXT Winthor (colunas) e PDF (rótulos por item)."""
+    rnd = random.Random(seed)
+    descricoes = ['SABONETE 90G', 'SHAMPOO 350ML (12)', 'ABS SYM PROT x6', 'CREME DENTAL [3]', 'LENCO 50 UN']
+    saida = []
+    for i in range(linhas):
+        sorteio = rnd.random()
+        if sorteio < 0.15:
+            saida.append(rnd.choice([
+                'Número Pedido: 085786', 'CNPJ: 11.222.333/0001-81', 'COD. BARRAS    DESCRICAO     QTDE   PRECO',
+                'Página 1 de 3', 'Total do pedido: R$ 1.234,56', '',
+            ]))
+        elif sorteio < 0.55:
+            saida.append(f"0{_ean(i)}    {rnd.choice(descricoes)}     {rnd.randint(1, 40)}    {rnd.randint(1, 99)},{rnd.randint(10, 99)}")
+        elif sorteio < 0.85:
+            rotulo = rnd.choice(['Código de Barras:', 'EAN:', 'Ref.', 'CodBarra', 'Barras:'])
+            saida.append(f"{i} {rnd.choice(descricoes)} {rotulo} {_ean(i)} Qtde: {rnd.randint(1, 40)} Preço: {rnd.randint(1, 99)},90")
+        else:
+            saida.append(f"{rnd.choice(descricoes)} UN {rnd.randint(1, 40)} {rnd.randint(1, 99)},{rnd.randint(10, 99)} CX12")
+    return '\n'.join(saida)
+
+
+def ler_texto(caminho: str) -> str:
+    """Texto do arquivo como os processadores o veem (TXT em UTF-8, PDF via pdfplumber)."""
+    with open(caminho, 'rb') as f:
+        conteudo = f.read()
+    if caminho.lower().endswith('.pdf'):
+        import pdfplumber
+        from io import BytesIO
+        with pdfplumber.open(BytesIO(conteudo)) as pdf:
+            return '\n'.join(pagina.extract_text() or '' for pagina in pdf.pages)
+    return conteudo.decode('utf-8', errors='ignore')
+
+
+# ===== MEDIÇÃO =====
+
+def medir(funcao, entradas: list[str], repeticoes: int = 3) -> tuple[float, list]:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = [funcao(entrada) for entrada in entradas]
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    if len(sys.argv) > 1:
+        fontes = [(os.path.basename(caminho), ler_texto(caminho)) for caminho in sys.argv[1:]]
+    else:
+        fontes = [('sintético (TXT/PDF)', texto_sintetico())]
+
+    for nome, texto in fontes:
+        linhas = texto.splitlines()
+        tokens = texto.split()
+        print(f"{nome}: {len(linhas)} linhas, {len(tokens)} tokens")
+
+        for rotulo, entradas in (('por linha', linhas), ('por token', tokens)):
+            tempo_legado, esperado = medir(extract_ean13_legado, entradas)
+            tempo_novo, obtido = medir(extract_ean13, entradas)
+            assert obtido == esperado, 'resultados diferentes'
+            encontrados = sum(1 for ean in obtido if ean)
+            print(f"  {rotulo:<10} {encontrados:>6} EANs   13 regex: {tempo_legado:7.3f} s   "
+                  f"varredura única: {tempo_novo:7.3f} s   speedup: {tempo_legado / tempo_novo:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
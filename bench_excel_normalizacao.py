@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Benchmark da normalização do ExcelProcessor: implementação linha a linha
+(cópia da versão anterior) x operações de coluna (_normalizar_dados).
+
+Gera planilhas sintéticas já mapeadas (CNPJ, EAN, DESCRICAO, QTDE, PREÇO),
+confere que as duas versões produzem o mesmo DataFrame e mede o tempo.
+
+Uso:
+    python bench_excel_normalizacao.py [linhas]
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.processing.excel_processor import ExcelProcessor
+from src.utils.validators import normalizar_preco, extract_multiplicador_fardos
+
+
+# ===== VERSÃO ANTERIOR (linha a linha) =====
+
+def normalizar_legado(df: pd.DataFrame) -> pd.DataFrame:
+    # Preenchimento de valores vazios
+    # CODCLI fica em branco se não houver valor na coluna "Código"
+    if 'CNPJ' in df.columns:
+        df['CNPJ'] = df['CNPJ'].fillna('').astype(str)
+    if 'EAN' in df.columns:
+        # Converter EAN para string, removendo .0 de floats
+        df['EAN'] = df['EAN'].fillna('')
+        df['EAN'] = df['EAN'].apply(lambda x: str(int(x)) if isinstance(x, float) and x != '' else str(x))
+    if 'QTDE' in df.columns:
+        # Converter para número, usando 0 para valores inválidos
+        try:
+            df['QTDE'] = pd.to_numeric(df['QTDE'], errors='coerce').fillna(0).astype(int)
+        except Exception as e:
+            print(f"[WARN] Erro ao converter QTDE para int: {e}. Tentando conversão linha-a-linha...")
+            df['QTDE'] = df['QTDE'].apply(lambda x: int(float(str(x).replace(',', '.'))) if pd.notna(x) and str(x).strip() != '' else 0)
+
+    # Procurar por coluna PREÇO (com ou sem acento)
+    preco_col = None
+    for col in df.columns:
+        if col.upper() == 'PREÇO' or col.upper() == 'PREÇO':
+            preco_col = col
+            break
+
+    if preco_col:
+        # Converter PREÇO para float usando função normalizar_preco
+        if preco_col != 'PREÇO':
+            df = df.rename(columns={preco_col: 'PREÇO'})
+        try:
+            df['PREÇO'] = df['PREÇO'].apply(normalizar_preco)
+        except Exception as e:
+            print(f"[WARN] Erro ao normalizar PREÇO: {e}. Tentando pd.to_numeric...")
+            df['PREÇO'] = pd.to_numeric(df['PREÇO'], errors='coerce').fillna(0.0)
+
+    # Aplicar multiplicador de fardos ANTES de limpar descrição
+    # Passo 1: Extrair multiplicadores e aplicar na quantidade
+    if 'DESCRICAO' in df.columns and 'QTDE' in df.columns:
+        def aplicar_fardos(row):
+            desc = row['DESCRICAO'] if 'DESCRICAO' in row.index else ''
+            qtde = row['QTDE'] if 'QTDE' in row.index else 0
+
+            if pd.isna(desc) or desc == '':
+                return int(qtde) if qtde else 0
+
+            try:
+                qtde = int(float(str(qtde).replace(',', '.'))) if qtde else 0
+                _, multiplicador = extract_multiplicador_fardos(str(desc))
+                return int(qtde * multiplicador)
+            except:
+                return int(qtde) if qtde else 0
+
+        df['QTDE'] = df.apply(aplicar_fardos, axis=1)
+
+    # Passo 2: Limpar descrição removendo os multiplicadores
+    if 'DESCRICAO' in df.columns:
+        def limpar_descricao(desc):
+            if pd.isna(desc) or desc == '':
+                return desc
+            desc_limpa, _ = extract_multiplicador_fardos(str(desc))
+            return desc_limpa.strip()
+
+        df['DESCRICAO'] = df['DESCRICAO'].fillna('').apply(limpar_descricao)
+
+    # Filtrar linhas inválidas (cabeçalhos, linhas vazias, etc) após normalização
+    df_antes_filtro = df.copy()
+    df = _filtrar_linhas_validas_legado(df)
+
+    # Se a filtragem deixou o DF vazio, e temos dados antes, tenta estratégia menos rigorosa
+    if df.empty and not df_antes_filtro.empty:
+        print("[WARN] Filtragem eliminou todos os dados! Tentando sem filtro...")
+        df = df_antes_filtro
+    return df
+
+
+def _filtrar_linhas_validas_legado(df: pd.DataFrame, strict: bool = True) -> pd.DataFrame:
+    """Remove linhas que são cabeçalhos ou não têm dados válidos"""
+    if df is None or df.empty:
+        return df
+
+    # Se não há colunas de dados úteis mapeadas, usar filtro bem menos restritivo
+    relevant_cols = [col for col in ['EAN', 'DESCRICAO', 'QTDE', 'PREÇO'] if col in df.columns]
+    if not relevant_cols or not strict:
+        # Filtro minimalista: remover linhas onde todos os valores são NaN/vazio
+        df_filtrado = df.dropna(how='all').reset_index(drop=True)
+        return df_filtrado
+
+    # Função para verificar se EAN é válido
+    def ean_valido(ean):
+        if pd.isna(ean) or ean == '' or ean == 0:
+            return False
+        ean_str = str(ean).strip().replace('.', '').replace('-', '')
+        # EAN deve ter 13 ou 14 dígitos
+        return len(ean_str) in [13, 14] and ean_str.isdigit()
+
+    # Função para verificar se a linha tem dados válidos
+    def linha_tem_dados(row):
+        # CRITÉRIO PRINCIPAL: Se tem EAN válido, sempre manter
+        if 'EAN' in df.columns:
+            try:
+                if ean_valido(row['EAN']):
+                    return True
+            except:
+                pass
+
+        # CRITÉRIO SECUNDÁRIO: Se tem DESCRICAO com conteúdo válido e não é cabeçalho
+        if 'DESCRICAO' in df.columns:
+            try:
+                desc = str(row['DESCRICAO']).strip().lower()
+                # Rejeitar se for claramente um cabeçalho
+                header_keywords = [
+                    'produto', 'descrição', 'descricao', 'desc',
+                    'qtde', 'quantidade', 'código', 'codigos', 'codigo',
+                    'barras', 'código de barras',
+                    'preço', 'preco', 'valor', 'valor unitário',
+                    'total', 'subtotal', 'desconto', 'frete',
+                    'ean', 'ean13', 'cód', 'cod', 'ref',
+                    'unidade', 'embalagem', 'fabricante'
+                ]
+
+                # Se contém MAIS de 2 palavras-chave de cabeçalho, é cabeçalho
+                matches = sum(1 for kw in header_keywords if kw in desc)
+                if matches >= 2 or desc in ['', 'nan', 'none']:
+                    return False
+
+                # Se tem descrição não-vazia de tamanho razoável, pode ser válido
+                if desc and len(desc) > 2:
+                    return True
+            except:
+                pass
+
+        # CRITÉRIO TERCIÁRIO: Qualquer linha com QTDE válida ou PREÇO válido é mantida
+        has_valid_qtde = False
+        has_valid_preco = False
+
+        if 'QTDE' in df.columns:
+            try:
+                qtde = row['QTDE']
+                if pd.notna(qtde) and isinstance(qtde, (int, float)) and qtde > 0:
+                    has_valid_qtde = True
+            except:
+                pass
+
+        if 'PREÇO' in df.columns:
+            try:
+                preco = row['PREÇO']
+                if pd.notna(preco) and isinstance(preco, (int, float)) and preco > 0:
+                    has_valid_preco = True
+            except:
+                pass
+
+        return has_valid_qtde or has_valid_preco
+
+    # Filtrar linhas que têm dados válidos
+    df_filtrado = df[df.apply(linha_tem_dados, axis=1)].reset_index(drop=True)
+
+    return df_filtrado
+
+
+# ===== DADOS SINTÉTICOS =====
+
+def gerar_planilha(linhas: int, seed: int = 42) -> pd.DataFrame:
+    """DataFrame no formato que chega à normalização (após mapeamento de colunas)."""
+    rnd = random.Random(seed)
+    sufixos = ['', '', '', ' (12)', ' [6]', ' X24', ' 12UN', ' 3 unidades', ' CX C/12']
+    precos = ['3,99', 'R$ 1.234,50', '12.5', 'R$3,00', '', 'abc', '0', ' 7,25 ']
+
+    eans, descs, qtdes, valores = [], [], [], []
+    for i in range(linhas):
+        sorteio = rnd.random()
+        if sorteio < 0.02:
+            # Cabeçalho repetido / linha de subtotal
+            eans.append(np.nan); descs.append('Código de barras Produto'); qtdes.append('Qtde'); valores.append('Preço')
+            continue
+        if sorteio < 0.04:
+            eans.append(np.nan); descs.append(np.nan); qtdes.append(np.nan); valores.append(np.nan)
+            continue
+        eans.append(float(7890000000000 + rnd.randrange(10 ** 9)) if rnd.random() > 0.05 else np.nan)
+        descs.append(f"PRODUTO {i}{rnd.choice(sufixos)}")
+        qtdes.append(rnd.choice([rnd.randint(1, 50), str(rnd.randint(1, 50)), np.nan]))
+        valores.append(rnd.choice(precos) if rnd.random() < 0.5 else round(rnd.uniform(0, 100), 2))
+
+    return pd.DataFrame({
+        'CNPJ': '12345678000190',
+        'EAN': eans,
+        'DESCRICAO': descs,
+        'QTDE': qtdes,
+        'PREÇO': valores,
+    })
+
+
+def medir(funcao, df: pd.DataFrame, repeticoes: int) -> tuple[float, pd.DataFrame]:
+    tempos = []
+    for _ in range(repeticoes):
+        copia = df.copy()
+        inicio = time.perf_counter()
+        resultado = funcao(copia)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    df = gerar_planilha(linhas)
+    processor = ExcelProcessor()
+
+    tempo_legado, esperado = medir(normalizar_legado, df, 3)
+    tempo_novo, obtido = medir(processor._normalizar_dados, df, 3)
+
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+    print(f"Normalização de {linhas} linhas ({len(obtido)} mantidas, resultados idênticos)")
+    print(f"  linha a linha:     {tempo_legado:8.3f} s")
+    print(f"  operações coluna:  {tempo_novo:8.3f} s")
+    print(f"  speedup:           {tempo_legado / tempo_novo:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Benchmark do LabotratProcessor: tentativas de `pd.read_excel` por nome de
+aba + `df.iloc[idx]` a cada linha (código anterior, extraído do git para uma
+pasta temporária) x aba escolhida pelo índice da pasta de trabalho e linhas
+lidas de colunas inteiras.
+
+Gera uma pasta de trabalho no formato completo (cabeçalho na linha 19, CNPJ na
+linha 5) com uma aba de resumo antes da "TABELA VENDA 2025.2", mede
+`process()` (e só a extração das linhas, sobre a aba já lida) em um processo
+novo para cada árvore e confere que os DataFrames resultantes são iguais. Um segundo arquivo, com a aba "TABELA VENDA 2026.1",
+mostra a aba do ano seguinte sendo encontrada pelo padrão.
+
+Uso:
+    python bench_labotrat.py [linhas] [repeticoes]
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Executado em um processo novo (cwd = raiz da árvore medida) para cada caso
+_SCRIPT = r'''
+import json, logging, os, sys, time
+sys.path.insert(0, os.getcwd())
+from src.processing.labotrat_processor import LabotratProcessor
+
+caminho, repeticoes, resultado, pickle_df = sys.argv[1:5]
+logging.disable(logging.CRITICAL)
+processor = LabotratProcessor()
+conteudo = open(caminho, 'rb').read()
+nome = os.path.basename(caminho)
+
+tempos = []
+for _ in range(int(repeticoes)):
+    inicio = time.perf_counter()
+    df = processor.process(conteudo, nome)
+    tempos.append(time.perf_counter() - inicio)
+
+# Só a extração das linhas, sobre a aba já lida
+import pandas as pd
+bruto = pd.read_excel(caminho, sheet_name=-1, header=None)
+extracao = []
+for _ in range(int(repeticoes)):
+    inicio = time.perf_counter()
+    processor._extrair_dados(bruto.copy())
+    extracao.append(time.perf_counter() - inicio)
+
+if df is not None:
+    df.to_pickle(pickle_df)
+with open(resultado, 'w') as f:
+    json.dump({'tempos': tempos, 'extracao': extracao, 'itens': 0 if df is None else len(df),
+               'cnpj': None if df is None else str(df['CNPJ'].iloc[0])}, f)
+'''
+
+
+# ===== DADOS =====
+
+def _ean13(n: int) -> str:
+    base = f"789{n:09d}"
+    soma = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(base))
+    return base + str((10 - soma % 10) % 10)
+
+
+def xlsx_labotrat(linhas: int, aba: str, seed: int = 42) -> bytes:
+    """Pasta de trabalho Labotrat: aba de resumo (primeira) e a tabela de venda."""
+    from io import BytesIO
+    from openpyxl import Workbook
+
+    rnd = random.Random(seed)
+    wb = Workbook(write_only=True)
+
+    resumo = wb.create_sheet('Resumo')
+    resumo.append(['Resumo do pedido'])
+    resumo.append(['Total', linhas])
+
+    ws = wb.create_sheet(aba)
+    for i in range(18):
+        if i == 4:
+            ws.append([None] * 12 + ['CNPJ:', '11.222.333/0001-81'])
+        else:
+            ws.append([f'Cabeçalho {i}'] + [None] * 13)
+    ws.append([None, 'Código', 'EAN 13', 'Linha', 'Qt. Cx.', 'Descrição', 'Qtde.',
+               'Pço. Tabela', '% Desc.', 'Pço. Desc.', 'Subtotal', None, None, None])
+    for k in range(1, linhas + 1):
+        if k % 50 == 1:
+            ws.append([None, None, None, f'Linha {k // 50}', None, f'Linha {k // 50}'] + [None] * 8)
+            continue
+        preco = round(rnd.uniform(1, 99), 2)
+        qtde = rnd.randint(0, 24)
+        ws.append([None, k, _ean13(k), 'DERMO', 12, f'PRODUTO {k} 200ML', qtde,
+                   preco, 0.1, round(preco * 0.9, 2), round(preco * 0.9 * qtde, 2), None, None, None])
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+# ===== VERSÃO ANTERIOR (read_excel por aba, iloc por linha) =====
+
+def _ref_anterior() -> str:
+    """Commit anterior à introdução de LABOTRAT_ABA_VENDA (ou HEAD, se ainda não existe)."""
+    commit = subprocess.run(
+        ['git', 'log', '-S', 'LABOTRAT_ABA_VENDA', '--format=%H', '--', 'src/utils/patterns.py'],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    ).stdout.strip().splitlines()
+    return f"{commit[-1]}^" if commit else 'HEAD'
+
+
+def extrair_arvore_anterior(destino: str):
+    arquivo = subprocess.run(['git', 'archive', _ref_anterior(), 'src'],
+                             cwd=BASE_DIR, capture_output=True, check=True).stdout
+    subprocess.run(['tar', '-x', '-C', destino], input=arquivo, check=True)
+
+
+# ===== MEDIÇÃO =====
+
+def medir(raiz: str, caminho: str, repeticoes: int, pasta: str, modo: str) -> dict:
+    resultado = os.path.join(pasta, f'{modo}.json')
+    pickle_df = os.path.join(pasta, f'{modo}.pkl')
+    ambiente = dict(os.environ, AGILIZA_LOG_NIVEL='ERROR')
+    subprocess.run([sys.executable, '-c', _SCRIPT, caminho, str(repeticoes), resultado, pickle_df],
+                   cwd=raiz, check=True, env=ambiente)
+    with open(resultado) as f:
+        dados = json.load(f)
+    dados['pickle'] = pickle_df
+    return dados
+
+
+def main():
+    import statistics
+    import pandas as pd
+
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as pasta:
+        anterior = os.path.join(pasta, 'anterior')
+        os.makedirs(anterior)
+        extrair_arvore_anterior(anterior)
+
+        caminho = os.path.join(pasta, 'pedido_labotrat.xlsx')
+        with open(caminho, 'wb') as f:
+            f.write(xlsx_labotrat(linhas, 'TABELA VENDA 2025.2'))
+
+        resultados = {
+            'anterior': medir(anterior, caminho, repeticoes, pasta, 'anterior'),
+            'atual': medir(BASE_DIR, caminho, repeticoes, pasta, 'atual'),
+        }
+        esperado = pd.read_pickle(resultados['anterior']['pickle'])
+        obtido = pd.read_pickle(resultados['atual']['pickle'])
+        pd.testing.assert_frame_equal(obtido, esperado)
+
+        print(f"Labotrat formato completo: {linhas} linhas ({len(obtido)} itens), "
+              f"{repeticoes} repetições (mediana); DataFrames iguais")
+        print(f"{'':<10}{'process (ms)':>14}{'extração (ms)':>15}")
+        medianas = {}
+        for modo, r in resultados.items():
+            medianas[modo] = (statistics.median(r['tempos']), statistics.median(r['extracao']))
+            print(f"{modo:<10}{medianas[modo][0] * 1000:>14.1f}{medianas[modo][1] * 1000:>15.1f}")
+        print(f"{'speedup':<10}{medianas['anterior'][0] / medianas['atual'][0]:>13.1f}x"
+              f"{medianas['anterior'][1] / medianas['atual'][1]:>14.1f}x")
+
+        # Aba do ano seguinte: antes caía na primeira aba (resumo)
+        caminho = os.path.join(pasta, 'pedido_labotrat_2026.xlsx')
+        with open(caminho, 'wb') as f:
+            f.write(xlsx_labotrat(linhas, 'TABELA VENDA 2026.1'))
+        print("\nAba 'TABELA VENDA 2026.1':")
+        for modo, raiz in (('anterior', anterior), ('atual', BASE_DIR)):
+            r = medir(raiz, caminho, 1, pasta, f'{modo}-2026')
+            print(f"  {modo:<10}{r['itens']:>8} itens (CNPJ {r['cnpj']})")
+
+
+if __name__ == '__main__':
+    main()
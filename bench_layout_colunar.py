@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Benchmark da extração das planilhas de fornecedores: laço iterrows de cada
+processador (código anterior, extraído do git para uma pasta temporária) x
+motor de layouts por colunas (layout_engine.LayoutPlanilha.extrair).
+
+Gera planilhas sintéticas já lidas (DataFrame com as colunas do fornecedor,
+CNPJ na primeira linha e algumas linhas vazias/sem EAN), mede
+`_extrair_dados` em um processo novo para cada árvore e confere que os
+DataFrames resultantes são iguais. Casos: Kimberly (busca nome a nome, CNPJ
+em coluna), Cotefacil (busca bidirecional, EAN com 13+ dígitos, preço como
+texto) e DSG Farma (sem multiplicador de fardos).
+
+Uso:
+    python bench_layout_colunar.py [linhas] [repeticoes]
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Executado em um processo novo (cwd = raiz da árvore medida) para cada caso
+_SCRIPT = r'''
+import importlib, json, logging, os, sys, time
+sys.path.insert(0, os.getcwd())
+import pandas as pd
+
+modulo, classe, entrada, repeticoes, resultado, pickle_df = sys.argv[1:7]
+logging.disable(logging.CRITICAL)
+processor = getattr(importlib.import_module(modulo), classe)()
+df = pd.read_pickle(entrada)
+
+tempos = []
+for _ in range(int(repeticoes)):
+    copia = df.copy()
+    inicio = time.perf_counter()
+    saida = processor._extrair_dados(copia)
+    tempos.append(time.perf_counter() - inicio)
+
+saida.to_pickle(pickle_df)
+with open(resultado, 'w') as f:
+    json.dump({'tempos': tempos}, f)
+'''
+
+# caso: (módulo, classe, colunas ean/descricao/qtde/preco, preço como texto)
+CASOS = {
+    'kimberly': ('src.processing', 'KimberlyProcessor',
+                 ('CodBarra', 'DescricaoProduto', 'QtPedido', 'PRECO'), False),
+    'cotefacil': ('src.processing', 'CotefacilProcessor',
+                  ('EAN', 'Produto', 'Qtde. Ped.', 'Valor Un. (R$)'), True),
+    'dsgfarma': ('src.processing', 'DSGFarmaProcessor',
+                 ('Cod. Barras', 'Descrição', 'QUANTIDADE.', 'PREÇO UNIT.'), False),
+}
+
+
+# ===== DADOS =====
+
+def _ean13(n: int) -> str:
+    base = f"789{n:09d}"
+    soma = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(base))
+    return base + str((10 - soma % 10) % 10)
+
+
+def planilha_sintetica(caso: str, linhas: int, seed: int = 42):
+    """DataFrame como sai do read_excel, no layout do fornecedor."""
+    import pandas as pd
+
+    rnd = random.Random(seed)
+    col_ean, col_desc, col_qtde, col_preco = CASOS[caso][2]
+    preco_texto = CASOS[caso][3]
+    descricoes = ['SABONETE 90G', 'SHAMPOO 350ML CX C/12', 'CREME DENTAL 3UN', 'FRALDA G (24)', 'LENCO [6]']
+
+    eans, descs, qtdes, precos = [], [], [], []
+    for k in range(1, linhas + 1):
+        sorteio = rnd.random()
+        if sorteio < 0.02:
+            eans.append(None); descs.append(None); qtdes.append(None); precos.append(None)
+            continue
+        eans.append(_ean13(k) if sorteio > 0.04 else 'TOTAL')
+        descs.append(f"{rnd.choice(descricoes)} {k}")
+        qtdes.append(rnd.randint(1, 40))
+        precos.append(f"{rnd.randint(1, 99)},{rnd.randint(10, 99)}" if preco_texto else round(rnd.uniform(1, 99), 2))
+    eans[0] = 'CNPJ: 11.222.333/0001-81'
+
+    df = pd.DataFrame({col_ean: eans, col_desc: descs, col_qtde: qtdes, col_preco: precos})
+    if caso == 'kimberly':
+        df.insert(0, 'CnpjFilial', '11222333000181')
+    return df
+
+
+# ===== VERSÃO ANTERIOR (iterrows) =====
+
+def _ref_anterior() -> str:
+    """Commit anterior à introdução de layouts/kimberly.json (ou HEAD, se ainda não existe)."""
+    commit = subprocess.run(
+        ['git', 'log', '--diff-filter=A', '--format=%H', '--', 'src/processing/layouts/kimberly.json'],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    ).stdout.strip().splitlines()
+    return f"{commit[-1]}^" if commit else 'HEAD'
+
+
+def extrair_arvore_anterior(destino: str):
+    arquivo = subprocess.run(['git', 'archive', _ref_anterior(), 'src'],
+                             cwd=BASE_DIR, capture_output=True, check=True).stdout
+    subprocess.run(['tar', '-x', '-C', destino], input=arquivo, check=True)
+
+
+# ===== MEDIÇÃO =====
+
+def medir(raiz: str, caso: str, entrada: str, repeticoes: int, pasta: str, modo: str) -> dict:
+    modulo, classe = CASOS[caso][:2]
+    resultado = os.path.join(pasta, f'{caso}-{modo}.json')
+    pickle_df = os.path.join(pasta, f'{caso}-{modo}.pkl')
+    ambiente = dict(os.environ, AGILIZA_LOG_NIVEL='ERROR')
+    subprocess.run([sys.executable, '-c', _SCRIPT, modulo, classe, entrada, str(repeticoes), resultado, pickle_df],
+                   cwd=raiz, check=True, env=ambiente)
+    with open(resultado) as f:
+        dados = json.load(f)
+    dados['pickle'] = pickle_df
+    return dados
+
+
+def comparar(caso: str, linhas: int, repeticoes: int, anterior: str, pasta: str):
+    import statistics
+    import pandas as pd
+
+    entrada = os.path.join(pasta, f'{caso}.pkl')
+    planilha_sintetica(caso, linhas).to_pickle(entrada)
+
+    resultados = {
+        'iterrows': medir(anterior, caso, entrada, repeticoes, pasta, 'iterrows'),
+        'colunas': medir(BASE_DIR, caso, entrada, repeticoes, pasta, 'colunas'),
+    }
+    esperado = pd.read_pickle(resultados['iterrows']['pickle'])
+    obtido = pd.read_pickle(resultados['colunas']['pickle'])
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+    medianas = {modo: statistics.median(r['tempos']) for modo, r in resultados.items()}
+    print(f"\n{caso}: {linhas} linhas ({len(obtido)} itens), {repeticoes} repetições (mediana); DataFrames iguais")
+    for modo, mediana in medianas.items():
+        print(f"  {modo:<10}{mediana * 1000:>10.1f} ms{linhas / mediana:>12.0f} linhas/s")
+    print(f"  speedup:  {medianas['iterrows'] / medianas['colunas']:>10.1f}x")
+
+
+def main():
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as pasta:
+        anterior = os.path.join(pasta, 'anterior')
+        os.makedirs(anterior)
+        extrair_arvore_anterior(anterior)
+        for caso in CASOS:
+            comparar(caso, linhas, repeticoes, anterior, pasta)
+
+
+if __name__ == '__main__':
+    main()
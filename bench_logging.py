@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Benchmark do custo dos logs no caminho de processamento de um arquivo.
+
+Compara o código anterior (prints incondicionais: dtypes, head(3) e listas de
+colunas a cada arquivo, detalhes a cada linha), extraído do git para uma pasta
+temporária, com o atual em INFO (debug desligado: os dumps nem são montados)
+e em DEBUG. Cada modo roda em um processo novo, com a saída padrão
+redirecionada para um arquivo, como nos workers uvicorn; mede-se
+`processar_arquivo` repetido sobre o mesmo arquivo (cache desligado) e
+confere-se que os DataFrames resultantes são iguais. Casos:
+
+- TXT Winthor sintético (processador genérico de TXT);
+- planilha Prudence com o mesmo número de itens (rastreio por linha).
+
+Uso:
+    python bench_logging.py [linhas] [repeticoes]
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Executado em um processo novo (cwd = raiz da árvore medida) para cada modo
+_SCRIPT = r'''
+import asyncio, json, os, sys, time
+sys.path.insert(0, os.getcwd())
+from src.processing.pipeline import processar_arquivo
+
+caminho, repeticoes, resultado, pickle_df = sys.argv[1], int(sys.argv[2]), sys.argv[3], sys.argv[4]
+nome = os.path.basename(caminho)
+conteudo = open(caminho, 'rb').read()
+
+async def medir():
+    df, _, erro = await processar_arquivo(nome, conteudo, 'planilha')
+    assert erro is None, erro
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        await processar_arquivo(nome, conteudo, 'planilha')
+        tempos.append(time.perf_counter() - inicio)
+    return df, tempos
+
+df, tempos = asyncio.run(medir())
+df.to_pickle(pickle_df)
+sys.stdout.flush()
+with open(resultado, 'w') as f:
+    json.dump({'tempos': tempos}, f)
+'''
+
+
+# ===== DADOS =====
+
+def _ean13(n: int) -> str:
+    base = f"789{n:09d}"
+    soma = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(base))
+    return base + str((10 - soma % 10) % 10)
+
+
+def txt_sintetico(linhas: int, pedidos: int = 5, seed: int = 42) -> bytes:
+    """Pedido Winthor em TXT com `linhas` itens divididos em alguns pedidos."""
+    rnd = random.Random(seed)
+    descricoes = ['SABONETE 90G', 'SHAMPOO 350ML', 'CREME DENTAL 3UN', 'LENCO UMEDECIDO 50 UN']
+    saida = ['WINTHOR - Sistema', '']
+    por_pedido = max(1, linhas // pedidos)
+    k = 0
+    for p in range(pedidos):
+        saida.append(f"Número Pedido: {1000 + p}")
+        saida.append("CNPJ Filial: 11.222.333/0001-81")
+        saida.append("COD. BARRAS    DESCRICAO     QTDE   PRECO")
+        for _ in range(por_pedido):
+            k += 1
+            saida.append(f"{_ean13(k)}    {rnd.choice(descricoes)} {k}                 "
+                         f"{rnd.randint(1, 40)}            {rnd.randint(1, 99)},{rnd.randint(10, 99)}")
+    return ("\n".join(saida) + "\n").encode('utf-8')
+
+
+def xlsx_prudence_sintetico(linhas: int, seed: int = 42) -> bytes:
+    """Planilha no layout Prudence (Código barras, Mercadoria, Compra, Custo)."""
+    from io import BytesIO
+    import pandas as pd
+
+    rnd = random.Random(seed)
+    descricoes = ['SABONETE 90G', 'SHAMPOO 350ML', 'CREME DENTAL 3UN', 'LENCO UMEDECIDO 50 UN']
+    df = pd.DataFrame({
+        'Código barras': [_ean13(k) for k in range(1, linhas + 1)],
+        'Mercadoria': [f"{rnd.choice(descricoes)} {k}" for k in range(1, linhas + 1)],
+        'Compra': [rnd.randint(1, 40) for _ in range(linhas)],
+        'Custo': [f"{rnd.randint(1, 99)},{rnd.randint(10, 99)}" for _ in range(linhas)],
+    })
+    buffer = BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+# ===== VERSÃO ANTERIOR (prints) =====
+
+def _ref_anterior() -> str:
+    """Commit anterior à introdução de src/utils/logging_config.py (ou HEAD, se ainda não existe)."""
+    commit = subprocess.run(
+        ['git', 'log', '--diff-filter=A', '--format=%H', '--', 'src/utils/logging_config.py'],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    ).stdout.strip().splitlines()
+    return f"{commit[-1]}^" if commit else 'HEAD'
+
+
+def extrair_arvore_anterior(destino: str):
+    arquivo = subprocess.run(['git', 'archive', _ref_anterior(), 'src'],
+                             cwd=BASE_DIR, capture_output=True, check=True).stdout
+    subprocess.run(['tar', '-x', '-C', destino], input=arquivo, check=True)
+
+
+# ===== MEDIÇÃO =====
+
+def medir(raiz: str, caminho: str, repeticoes: int, pasta: str, modo: str, nivel: str = 'INFO') -> dict:
+    ambiente = dict(os.environ, AGILIZA_CACHE_ATIVO='0', AGILIZA_LOG_NIVEL=nivel, AGILIZA_LOG_FORMATO='texto')
+    resultado = os.path.join(pasta, f'{modo}.json')
+    pickle_df = os.path.join(pasta, f'{modo}.pkl')
+    log = os.path.join(pasta, f'{modo}.log')
+    with open(log, 'wb') as saida:
+        subprocess.run([sys.executable, '-c', _SCRIPT, caminho, str(repeticoes), resultado, pickle_df],
+                       cwd=raiz, stdout=saida, stderr=subprocess.STDOUT, check=True, env=ambiente)
+    with open(resultado) as f:
+        dados = json.load(f)
+    dados['pickle'] = pickle_df
+    dados['log_kb'] = os.path.getsize(log) / 1024 / (repeticoes + 1)
+    return dados
+
+
+def comparar(caso: str, caminho: str, itens: int, repeticoes: int, anterior: str, pasta: str):
+    import statistics
+    import pandas as pd
+
+    resultados = {
+        'print': medir(anterior, caminho, repeticoes, pasta, f'{caso}-print'),
+        'INFO': medir(BASE_DIR, caminho, repeticoes, pasta, f'{caso}-INFO', 'INFO'),
+        'DEBUG': medir(BASE_DIR, caminho, repeticoes, pasta, f'{caso}-DEBUG', 'DEBUG'),
+    }
+    esperado = pd.read_pickle(resultados['print']['pickle'])
+    for modo in ('INFO', 'DEBUG'):
+        pd.testing.assert_frame_equal(pd.read_pickle(resultados[modo]['pickle']), esperado)
+
+    print(f"\n{os.path.basename(caminho)}: {itens} itens, {repeticoes} repetições por modo (mediana); DataFrames iguais")
+    print(f"{'modo':<8}{'tempo (ms)':>12}{'linhas/s':>12}{'log/arquivo (KB)':>18}")
+    medianas = {}
+    for modo, r in resultados.items():
+        medianas[modo] = statistics.median(r['tempos'])
+        print(f"{modo:<8}{medianas[modo] * 1000:>12.1f}{itens / medianas[modo]:>12.0f}{r['log_kb']:>18.1f}")
+    print(f"ganho INFO x print: {medianas['print'] / medianas['INFO']:.2f}x")
+
+
+def main():
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as pasta:
+        anterior = os.path.join(pasta, 'anterior')
+        os.makedirs(anterior)
+        extrair_arvore_anterior(anterior)
+
+        casos = {
+            'txt': ('pedido_bench.txt', txt_sintetico(linhas)),
+            'prudence': ('pedido_prudence.xlsx', xlsx_prudence_sintetico(linhas)),
+        }
+        for caso, (nome, conteudo) in casos.items():
+            caminho = os.path.join(pasta, nome)
+            with open(caminho, 'wb') as f:
+                f.write(conteudo)
+            comparar(caso, caminho, linhas, repeticoes, anterior, pasta)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Benchmark de memória na leitura de PDFs grandes (RSS ao longo das páginas).
+
+Compara o laço antigo (`for pagina in pdf.pages`, que deixa o cache de layout
+de cada página vivo até o PDF ser fechado) com `iterar_paginas`, que libera as
+páginas fora da janela, e roda o PDFProcessor completo (sem processos
+paralelos) sobre o mesmo arquivo. Cada modo roda em um processo novo.
+
+Uso:
+    python bench_pdf_memoria.py [paginas] [itens_por_pagina]
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from io import BytesIO
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Executado em um processo novo para cada modo
+_SCRIPT = r'''
+import json, os, sys
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except OSError:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+modo, caminho = sys.argv[1], sys.argv[2]
+from io import BytesIO
+import pdfplumber
+from src.processing.pdf_paginas import iterar_paginas
+from src.processing.pdf_processor import PDFProcessor
+
+with open(caminho, 'rb') as f:
+    conteudo = f.read()
+
+amostras = []
+base = rss_mb()
+if modo == 'processador':
+    original = PDFProcessor._processar_pagina
+    def medido(self, layout, num_pagina, total_paginas):
+        produtos = original(self, layout, num_pagina, total_paginas)
+        amostras.append(rss_mb() - base)
+        return produtos
+    PDFProcessor._processar_pagina = medido
+    PDFProcessor().process(conteudo, 'bench.pdf')
+else:
+    with pdfplumber.open(BytesIO(conteudo)) as pdf:
+        paginas = enumerate(pdf.pages) if modo == 'pdf.pages' else iterar_paginas(pdf)
+        for _, pagina in paginas:
+            pagina.extract_text()
+            pagina.extract_tables()
+            amostras.append(rss_mb() - base)
+print(json.dumps(amostras))
+'''
+
+
+# ===== PDF SINTÉTICO =====
+
+def _ean(n: int) -> str:
+    base = f"789{n:09d}"
+    soma = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(base))
+    return base + str((10 - soma % 10) % 10)
+
+
+def _escapar(texto: str) -> str:
+    return texto.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def pdf_sintetico(paginas: int, itens: int, seed: int = 42) -> bytes:
+    """PDF de pedido com texto simples (Helvetica), uma linha por item."""
+    rnd = random.Random(seed)
+    objetos = []
+
+    def adicionar(conteudo):
+        objetos.append(conteudo)
+        return len(objetos)
+
+    fonte = adicionar(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    raiz = adicionar(None)
+    filhos = []
+    item = 0
+    for num in range(paginas):
+        linhas = [f"Pedido: {5000 + num}", "CNPJ: 11.222.333/0001-81", "EAN   DESCRICAO   QTDE   PRECO"]
+        for _ in range(itens):
+            item += 1
+            linhas.append(f"{_ean(item)} PRODUTO TESTE {item} {rnd.randint(1, 30)} "
+                          f"{rnd.randint(1, 99)},{rnd.randint(10, 99)}")
+        operacoes = ["BT", "/F1 9 Tf", "11 TL", "30 800 Td"]
+        operacoes += [f"({_escapar(linha)}) Tj T*" for linha in linhas]
+        operacoes.append("ET")
+        stream = "\n".join(operacoes).encode('latin-1', 'replace')
+        conteudo = adicionar(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        filhos.append(adicionar(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (raiz, fonte, conteudo)
+        ))
+    objetos[raiz - 1] = (b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % f for f in filhos)
+                         + b"] /Count %d >>" % len(filhos))
+    catalogo = adicionar(b"<< /Type /Catalog /Pages %d 0 R >>" % raiz)
+
+    saida = BytesIO()
+    saida.write(b"%PDF-1.4\n")
+    posicoes = []
+    for num, objeto in enumerate(objetos, 1):
+        posicoes.append(saida.tell())
+        saida.write(b"%d 0 obj\n" % num + objeto + b"\nendobj\n")
+    xref = saida.tell()
+    saida.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1))
+    for posicao in posicoes:
+        saida.write(b"%010d 00000 n \n" % posicao)
+    saida.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                % (len(objetos) + 1, catalogo, xref))
+    return saida.getvalue()
+
+
+# ===== MEDIÇÃO =====
+
+def medir(modo: str, caminho: str) -> list[float]:
+    ambiente = dict(os.environ, AGILIZA_PDF_PARALELO_PROCESSOS='1', AGILIZA_CACHE_ATIVO='0')
+    saida = subprocess.run(
+        [sys.executable, '-c', _SCRIPT, modo, caminho],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True, env=ambiente,
+    ).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def main():
+    paginas = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    itens = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as arquivo:
+        arquivo.write(pdf_sintetico(paginas, itens))
+        caminho = arquivo.name
+
+    try:
+        print(f"PDF sintético: {paginas} páginas, {itens} itens por página "
+              f"({os.path.getsize(caminho) / 1024:.0f} KB)")
+        print("RSS acima do início (MB) depois de N páginas\n")
+        marcos = sorted({max(1, paginas * q // 4) for q in (1, 2, 3, 4)})
+        print(f"{'modo':<14}" + ''.join(f"{n:>10}" for n in marcos) + f"{'pico':>10}")
+        for modo in ('pdf.pages', 'iterar_paginas', 'processador'):
+            amostras = medir(modo, caminho)
+            valores = ''.join(f"{amostras[n - 1]:>10.1f}" for n in marcos if n <= len(amostras))
+            print(f"{modo:<14}{valores}{max(amostras):>10.1f}")
+    finally:
+        os.unlink(caminho)
+
+
+if __name__ == '__main__':
+    main()
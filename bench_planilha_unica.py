@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Benchmark da leitura das planilhas com metadados acima da tabela (Cotefacil,
+BioMax Farma e Crescer): dois `pd.read_excel` por arquivo (código anterior,
+extraído do git para uma pasta temporária) x uma única abertura da pasta de
+trabalho (`Planilha.linhas` para o CNPJ + `Planilha.dataframe(header=N)`).
+
+Gera um .xlsx sintético no layout de cada fornecedor, mede `process()` em um
+processo novo para cada árvore e confere que os DataFrames resultantes são
+iguais.
+
+Uso:
+    python bench_planilha_unica.py [linhas] [repeticoes]
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Executado em um processo novo (cwd = raiz da árvore medida) para cada caso
+_SCRIPT = r'''
+import importlib, json, logging, os, sys, time
+sys.path.insert(0, os.getcwd())
+
+modulo, classe, caminho, repeticoes, resultado, pickle_df = sys.argv[1:7]
+logging.disable(logging.CRITICAL)
+processor = getattr(importlib.import_module(modulo), classe)()
+conteudo = open(caminho, 'rb').read()
+nome = os.path.basename(caminho)
+
+tempos = []
+for _ in range(int(repeticoes)):
+    inicio = time.perf_counter()
+    df = processor.process(conteudo, nome)
+    tempos.append(time.perf_counter() - inicio)
+
+df.to_pickle(pickle_df)
+with open(resultado, 'w') as f:
+    json.dump({'tempos': tempos}, f)
+'''
+
+# caso: (módulo, classe, linhas de metadados acima do cabeçalho, colunas)
+CASOS = {
+    'cotefacil': ('src.processing', 'CotefacilProcessor', 2,
+                  ('EAN', 'Produto', 'Qtde. Ped.', 'Valor Un. (R$)')),
+    'biomaxfarma': ('src.processing', 'BioMaxFarmaProcessor', 1,
+                    ('EAN', 'Produto', 'Qtde. Ped.', 'Valor Un. (R$)')),
+    'crescer': ('src.processing', 'CrescerProcessor', 11,
+                ('Cód. Barra', 'Descrição', 'Qtd.', 'Unitário')),
+}
+
+
+# ===== DADOS =====
+
+def _ean13(n: int) -> str:
+    base = f"789{n:09d}"
+    soma = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(base))
+    return base + str((10 - soma % 10) % 10)
+
+
+def xlsx_sintetico(caso: str, linhas: int, seed: int = 42) -> bytes:
+    """Planilha do fornecedor: metadados (CNPJ) nas primeiras linhas e a tabela abaixo."""
+    from io import BytesIO
+    from openpyxl import Workbook
+
+    rnd = random.Random(seed)
+    metadados, colunas = CASOS[caso][2], CASOS[caso][3]
+    descricoes = ['SABONETE 90G', 'SHAMPOO 350ML CX C/12', 'CREME DENTAL 3UN', 'FRALDA G (24)']
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for i in range(metadados):
+        if caso == 'crescer':
+            ws.append(['Pedido', 1234, None, '11222333/0001-81'] if i == 6 else [f'Linha {i}'])
+        else:
+            ws.append(['Fornecedor', 'CNPJ: 11.222.333/0001-81'] if i == 0 else [])
+    ws.append(list(colunas))
+    for k in range(1, linhas + 1):
+        ws.append([_ean13(k), f"{rnd.choice(descricoes)} {k}", rnd.randint(1, 40),
+                   f"{rnd.randint(1, 99)},{rnd.randint(10, 99)}"])
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+# ===== VERSÃO ANTERIOR (dois read_excel) =====
+
+def _ref_anterior() -> str:
+    """Commit anterior à introdução de Planilha.linhas (ou HEAD, se ainda não existe)."""
+    commit = subprocess.run(
+        ['git', 'log', '-S', 'def linhas(self, quantidade', '--format=%H', '--', 'src/processing/workbook.py'],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    ).stdout.strip().splitlines()
+    return f"{commit[-1]}^" if commit else 'HEAD'
+
+
+def extrair_arvore_anterior(destino: str):
+    arquivo = subprocess.run(['git', 'archive', _ref_anterior(), 'src'],
+                             cwd=BASE_DIR, capture_output=True, check=True).stdout
+    subprocess.run(['tar', '-x', '-C', destino], input=arquivo, check=True)
+
+
+# ===== MEDIÇÃO =====
+
+def medir(raiz: str, caso: str, caminho: str, repeticoes: int, pasta: str, modo: str) -> dict:
+    modulo, classe = CASOS[caso][:2]
+    resultado = os.path.join(pasta, f'{caso}-{modo}.json')
+    pickle_df = os.path.join(pasta, f'{caso}-{modo}.pkl')
+    ambiente = dict(os.environ, AGILIZA_LOG_NIVEL='ERROR')
+    subprocess.run([sys.executable, '-c', _SCRIPT, modulo, classe, caminho, str(repeticoes), resultado, pickle_df],
+                   cwd=raiz, check=True, env=ambiente)
+    with open(resultado) as f:
+        dados = json.load(f)
+    dados['pickle'] = pickle_df
+    return dados
+
+
+def comparar(caso: str, linhas: int, repeticoes: int, anterior: str, pasta: str):
+    import statistics
+    import pandas as pd
+
+    caminho = os.path.join(pasta, f'pedido_{caso}.xlsx')
+    with open(caminho, 'wb') as f:
+        f.write(xlsx_sintetico(caso, linhas))
+
+    resultados = {
+        'read_excel x2': medir(anterior, caso, caminho, repeticoes, pasta, 'anterior'),
+        'planilha': medir(BASE_DIR, caso, caminho, repeticoes, pasta, 'planilha'),
+    }
+    esperado = pd.read_pickle(resultados['read_excel x2']['pickle'])
+    obtido = pd.read_pickle(resultados['planilha']['pickle'])
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+    medianas = {modo: statistics.median(r['tempos']) for modo, r in resultados.items()}
+    print(f"\n{caso}: {linhas} linhas ({len(obtido)} itens), {repeticoes} repetições (mediana); DataFrames iguais")
+    for modo, mediana in medianas.items():
+        print(f"  {modo:<15}{mediana * 1000:>10.1f} ms")
+    print(f"  ganho:         {medianas['read_excel x2'] / medianas['planilha']:>10.2f}x")
+
+
+def main():
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as pasta:
+        anterior = os.path.join(pasta, 'anterior')
+        os.makedirs(anterior)
+        extrair_arvore_anterior(anterior)
+        for caso in CASOS:
+            comparar(caso, linhas, repeticoes, anterior, pasta)
+
+
+if __name__ == '__main__':
+    main()
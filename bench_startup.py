@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Benchmark de inicialização do worker: tempo de import do app e memória (RSS).
+
+Compara o registro lazy atual com o comportamento antigo (factory importando
+todos os processadores, e o EasyOCR/torch, no topo do módulo).
+
+Uso:
+    python bench_startup.py [repeticoes]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Executado em um processo novo para cada medição
+_SCRIPT = r'''
+import json, sys, time
+inicio = time.perf_counter()
+import app
+if sys.argv[1] == 'eager':
+    import importlib.util
+    from src.processing.factory import PROCESSOR_CLASSES, get_processor_class
+    for nome in PROCESSOR_CLASSES:
+        get_processor_class(nome)
+    if importlib.util.find_spec('easyocr') is not None:
+        import easyocr
+tempo = time.perf_counter() - inicio
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+except ImportError:
+    rss_mb = None
+print(json.dumps({'tempo': tempo, 'rss_mb': rss_mb, 'modulos': len(sys.modules)}))
+'''
+
+
+def medir(modo: str) -> dict:
+    saida = subprocess.run(
+        [sys.executable, '-c', _SCRIPT, modo],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"Inicialização do worker ({repeticoes} repetições, mediana)\n")
+    print(f"{'modo':<10}{'import (s)':>12}{'RSS (MB)':>12}{'módulos':>10}")
+
+    for modo in ('eager', 'lazy'):
+        medidas = [medir(modo) for _ in range(repeticoes)]
+        tempo = statistics.median(m['tempo'] for m in medidas)
+        rss = [m['rss_mb'] for m in medidas if m['rss_mb'] is not None]
+        rss_txt = f"{statistics.median(rss):.1f}" if rss else 'n/d'
+        modulos = medidas[-1]['modulos']
+        print(f"{modo:<10}{tempo:>12.3f}{rss_txt:>12}{modulos:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Benchmark do TXTProcessor em exportações Winthor grandes: texto decodificado
+inteiro + lista de linhas + sequência de upper()/regex por linha (código
+anterior, extraído do git para uma pasta temporária) x tokenizador de
+txt_linhas (fluxo de bytes, um upper() por linha, EAN e posição levados aos
+extratores).
+
+Gera um TXT Winthor sintético (cabeçalhos, vários pedidos/filiais, linhas de
+produto e linhas de ruído como separadores e totais), mede `process()` em um
+processo novo para cada árvore, confere que os DataFrames resultantes são
+iguais e mede o pico de memória alocada (tracemalloc) em uma execução à parte.
+
+Uso:
+    python bench_txt_tokenizador.py [linhas] [repeticoes]
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Executado em um processo novo (cwd = raiz da árvore medida) para cada modo
+_SCRIPT = r'''
+import json, logging, os, sys, time, tracemalloc
+sys.path.insert(0, os.getcwd())
+from src.processing.txt_processor import TXTProcessor
+
+caminho, repeticoes, resultado, pickle_df = sys.argv[1:5]
+logging.disable(logging.CRITICAL)
+conteudo = open(caminho, 'rb').read()
+nome = os.path.basename(caminho)
+
+tempos = []
+for _ in range(int(repeticoes)):
+    inicio = time.perf_counter()
+    df = TXTProcessor().process(conteudo, nome)
+    tempos.append(time.perf_counter() - inicio)
+
+tracemalloc.start()
+TXTProcessor().process(conteudo, nome)
+pico = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+
+df.to_pickle(pickle_df)
+with open(resultado, 'w') as f:
+    json.dump({'tempos': tempos, 'pico': pico}, f)
+'''
+
+
+# ===== DADOS =====
+
+def _ean13(n: int) -> str:
+    base = f"789{n:09d}"
+    soma = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(base))
+    return base + str((10 - soma % 10) % 10)
+
+
+def txt_winthor(linhas: int, itens_por_pedido: int = 400, seed: int = 42) -> bytes:
+    """Exportação Winthor com `linhas` linhas: pedidos por filial, produtos e ruído."""
+    rnd = random.Random(seed)
+    descricoes = ['SABONETE 90G', 'SHAMPOO 350ML', 'CREME DENTAL 3UN', 'FRALDA G (24)',
+                  'LENCO UMEDECIDO 50 UN', 'ABS SYM PROT DIARIO 15UN C/PERF']
+    saida = ['WINTHOR - Sistema de Gestão', 'Relatório de pedidos de compra', '']
+    pedido = 0
+    while len(saida) < linhas:
+        pedido += 1
+        saida.append(f"Número Pedido: {50000 + pedido}    Dt. Emissão: 08/01/2026")
+        saida.append(f"CNPJ Filial: 11.222.333/{pedido % 9000 + 1:04d}-81")
+        saida.append("COD. BARRAS    DESCRICAO                         LABORATORIO    QTDE   PRECO")
+        saida.append("-" * 80)
+        for _ in range(itens_por_pedido):
+            k = rnd.randrange(1, 10 ** 6)
+            ean = _ean13(k)
+            if rnd.random() < 0.3:
+                ean = '0' + ean
+            saida.append(f"{ean}    {rnd.choice(descricoes)} {k % 100:<20} LAB {k % 7}      "
+                         f"{rnd.randint(1, 40):>4}   {rnd.randint(1, 99)},{rnd.randint(10, 99)}")
+            if rnd.random() < 0.05:
+                saida.append(f"   Observação: entrega parcial {rnd.randint(1, 30)}/01")
+        saida.append("-" * 80)
+        saida.append(f"Total do pedido: {itens_por_pedido} itens")
+        saida.append("")
+    return ("\n".join(saida[:linhas]) + "\n").encode('utf-8')
+
+
+# ===== VERSÃO ANTERIOR (lista de linhas) =====
+
+def _ref_anterior() -> str:
+    """Commit anterior à introdução de src/processing/txt_linhas.py (ou HEAD, se ainda não existe)."""
+    commit = subprocess.run(
+        ['git', 'log', '--diff-filter=A', '--format=%H', '--', 'src/processing/txt_linhas.py'],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    ).stdout.strip().splitlines()
+    return f"{commit[-1]}^" if commit else 'HEAD'
+
+
+def extrair_arvore_anterior(destino: str):
+    arquivo = subprocess.run(['git', 'archive', _ref_anterior(), 'src'],
+                             cwd=BASE_DIR, capture_output=True, check=True).stdout
+    subprocess.run(['tar', '-x', '-C', destino], input=arquivo, check=True)
+
+
+# ===== MEDIÇÃO =====
+
+def medir(raiz: str, caminho: str, repeticoes: int, pasta: str, modo: str) -> dict:
+    resultado = os.path.join(pasta, f'{modo}.json')
+    pickle_df = os.path.join(pasta, f'{modo}.pkl')
+    ambiente = dict(os.environ, AGILIZA_LOG_NIVEL='ERROR')
+    subprocess.run([sys.executable, '-c', _SCRIPT, caminho, str(repeticoes), resultado, pickle_df],
+                   cwd=raiz, check=True, env=ambiente)
+    with open(resultado) as f:
+        dados = json.load(f)
+    dados['pickle'] = pickle_df
+    return dados
+
+
+def main():
+    import statistics
+    import pandas as pd
+
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as pasta:
+        anterior = os.path.join(pasta, 'anterior')
+        os.makedirs(anterior)
+        extrair_arvore_anterior(anterior)
+
+        conteudo = txt_winthor(linhas)
+        caminho = os.path.join(pasta, 'pedido_winthor.txt')
+        with open(caminho, 'wb') as f:
+            f.write(conteudo)
+
+        resultados = {
+            'lista de linhas': medir(anterior, caminho, repeticoes, pasta, 'anterior'),
+            'tokenizador': medir(BASE_DIR, caminho, repeticoes, pasta, 'tokenizador'),
+        }
+        esperado = pd.read_pickle(resultados['lista de linhas']['pickle'])
+        obtido = pd.read_pickle(resultados['tokenizador']['pickle'])
+        pd.testing.assert_frame_equal(obtido, esperado)
+
+        print(f"TXT Winthor: {linhas} linhas ({len(conteudo) / 1024 / 1024:.1f} MB, {len(obtido)} itens), "
+              f"{repeticoes} repetições (mediana); DataFrames iguais")
+        print(f"{'modo':<18}{'tempo (ms)':>12}{'linhas/s':>12}{'pico (MB)':>12}")
+        medianas = {}
+        for modo, r in resultados.items():
+            medianas[modo] = statistics.median(r['tempos'])
+            print(f"{modo:<18}{medianas[modo] * 1000:>12.1f}{linhas / medianas[modo]:>12.0f}"
+                  f"{r['pico'] / 1024 / 1024:>12.1f}")
+        print(f"speedup: {medianas['lista de linhas'] / medianas['tokenizador']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Benchmark da geração do .xlsx de saída: `to_excel` em memória x escrita em fluxo.
+
+O caminho anterior (cópia abaixo) monta a pasta de trabalho inteira com o
+openpyxl, copia o buffer com `getvalue()` e embrulha o resultado em outro
+BytesIO para a StreamingResponse. O novo (`ExcelGenerator.generate_stream`)
+escreve as linhas direto no ZIP e entrega os bytes em blocos. Cada medição
+roda em um processo novo (tempo e pico de RSS acima do DataFrame já montado),
+e as duas planilhas são relidas com `pd.read_excel` e comparadas.
+
+Uso:
+    python bench_xlsx_saida.py [linhas ...]
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Executado em um processo novo para cada medição
+_SCRIPT = r'''
+import json, os, sys, threading, time
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+def amostrar(picos, parar):
+    # ru_maxrss também contaria o pico da montagem do DataFrame; amostra o RSS atual
+    while not parar.is_set():
+        picos.append(rss_mb())
+        time.sleep(0.005)
+
+modo, linhas, destino = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+sys.path.insert(0, os.getcwd())
+from bench_xlsx_saida import dataframe_sintetico, gerar_legado
+from src.processing.excel_generator import ExcelGenerator
+
+df = dataframe_sintetico(linhas)
+base = rss_mb()
+picos, parar = [base], threading.Event()
+amostrador = threading.Thread(target=amostrar, args=(picos, parar), daemon=True)
+amostrador.start()
+saida = open(destino, 'wb') if destino else None
+inicio = time.perf_counter()
+tamanho = 0
+if modo == 'to_excel':
+    corpo = gerar_legado(df).read()
+    tamanho = len(corpo)
+    if saida:
+        saida.write(corpo)
+else:
+    # Cada bloco é enviado (aqui: contado/gravado) e descartado, como na StreamingResponse
+    for bloco in ExcelGenerator.generate_stream(df):
+        tamanho += len(bloco)
+        if saida:
+            saida.write(bloco)
+tempo = time.perf_counter() - inicio
+parar.set()
+amostrador.join()
+pico = max(picos) - base
+if saida:
+    saida.close()
+print(json.dumps({'tempo': tempo, 'pico': pico, 'tamanho': tamanho}))
+'''
+
+
+# ===== VERSÃO ANTERIOR (to_excel em memória) =====
+
+def gerar_legado(dataframe):
+    """ExcelGenerator.generate + BytesIO da rota /upload, como era antes."""
+    from io import BytesIO
+    buffer = BytesIO()
+    dataframe.to_excel(buffer, sheet_name='Pedido', index=False)
+    buffer.seek(0)
+    return BytesIO(buffer.getvalue())
+
+
+# ===== DADOS =====
+
+def dataframe_sintetico(linhas: int, seed: int = 42):
+    """Resultado combinado com as colunas de saída dos processadores."""
+    import numpy as np
+    import pandas as pd
+
+    rnd = np.random.default_rng(seed)
+    descricoes = np.array(['SABONETE 90G', 'SHAMPOO 350ML', 'CREME DENTAL 3UN', 'LENCO UMEDECIDO 50 UN'])
+    precos = np.round(rnd.uniform(1, 99, linhas), 2)
+    precos[rnd.random(linhas) < 0.05] = np.nan
+    return pd.DataFrame({
+        'CNPJ': '11.222.333/0001-81',
+        'Pedido de compra': rnd.integers(1000, 9999, linhas).astype(str),
+        'EAN': (7890000000000 + np.arange(linhas)).astype(str),
+        'DESCRICAO': descricoes[rnd.integers(0, len(descricoes), linhas)],
+        'QTDE': rnd.integers(1, 40, linhas),
+        'PRECO': precos,
+    })
+
+
+# ===== MEDIÇÃO =====
+
+def medir(modo: str, linhas: int, destino: str = '') -> dict:
+    ambiente = dict(os.environ, AGILIZA_XLSX_STREAMING='1')
+    saida = subprocess.run(
+        [sys.executable, '-c', _SCRIPT, modo, str(linhas), destino],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True, env=ambiente,
+    ).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def conferir(linhas: int = 10_000):
+    """Relê as duas planilhas e confere que o conteúdo é o mesmo."""
+    import tempfile
+    import pandas as pd
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminhos = {modo: os.path.join(pasta, f'{modo}.xlsx') for modo in ('to_excel', 'fluxo')}
+        for modo, caminho in caminhos.items():
+            medir(modo, linhas, caminho)
+        esperado = pd.read_excel(caminhos['to_excel'], dtype=str)
+        obtido = pd.read_excel(caminhos['fluxo'], dtype=str)
+    pd.testing.assert_frame_equal(obtido, esperado)
+    print(f"Conferência ({linhas} linhas): planilhas iguais")
+
+
+def main():
+    tamanhos = [int(n) for n in sys.argv[1:]] or [10_000, 100_000, 500_000]
+
+    conferir(min(tamanhos))
+    print(f"\n{'linhas':>8}  {'modo':<9}{'tempo (s)':>11}{'pico RSS (MB)':>15}{'tamanho (KB)':>14}")
+    for linhas in tamanhos:
+        resultados = {modo: medir(modo, linhas) for modo in ('to_excel', 'fluxo')}
+        for modo, r in resultados.items():
+            print(f"{linhas:>8}  {modo:<9}{r['tempo']:>11.2f}{r['pico']:>15.1f}{r['tamanho'] / 1024:>14.0f}")
+        print(f"{'':>8}  speedup: {resultados['to_excel']['tempo'] / resultados['fluxo']['tempo']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
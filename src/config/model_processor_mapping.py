@@ -1,5 +1,7 @@
 """Mapeamento de modelos/fornecedores para processadores específicos."""
 
+from src.processing.layout_engine import modelos_de_layouts
+
 # Mapeia modelos para processadores e suas extensões de arquivo esperadas
 MODEL_PROCESSOR_MAPPING = {
     # === FORNECEDORES ESPECÍFICOS ===
@@ -112,6 +114,11 @@ MODEL_PROCESSOR_MAPPING = {
     }
 }
 
+# Fornecedores descritos em src/processing/layouts/*.json (campo "modelos");
+# os já mapeados acima mantêm a configuração daqui
+for _modelo, _config in modelos_de_layouts().items():
+    MODEL_PROCESSOR_MAPPING.setdefault(_modelo, _config)
+
 # Mapeamento reverso: extensão → modelo padrão quando não identificado
 EXTENSION_DEFAULT_MODEL = {
     'xlsx': 'GENERIC_EXCEL',
@@ -0,0 +1,123 @@
+"""Configurações de execução da aplicação (sobrescrevíveis por variáveis de ambiente)."""
+
+import os
+
+
+def _env_int(nome: str, padrao: int) -> int:
+    """Lê um inteiro do ambiente, usando o padrão se ausente ou inválido."""
+    try:
+        return int(os.getenv(nome, padrao))
+    except (TypeError, ValueError):
+        return padrao
+
+
+# ===== EXECUTOR DE PROCESSADORES =====
+# Threads para parsers leves (TXT)
+EXECUTOR_MAX_THREADS = _env_int('AGILIZA_EXECUTOR_THREADS', 8)
+
+# Processos para parsers CPU-bound (PDF, OCR, planilhas)
+EXECUTOR_MAX_PROCESSOS = _env_int('AGILIZA_EXECUTOR_PROCESSOS', max(1, (os.cpu_count() or 2) // 2))
+
+# Máximo de execuções simultâneas por tipo de processador (por worker uvicorn).
+# Lotes costumam trazer dezenas de arquivos do mesmo tipo, então o padrão
+# acompanha o número de núcleos
+EXECUTOR_LIMITE_POR_PROCESSADOR = _env_int('AGILIZA_LIMITE_POR_PROCESSADOR', max(2, os.cpu_count() or 2))
+
+# Extensões cujo processamento é CPU-bound e vai para o process pool
+# (openpyxl/xlrd são Python puro e não escalam em threads por causa do GIL)
+EXTENSOES_PROCESS_POOL = {'pdf', 'jpg', 'jpeg', 'png', 'bmp', 'xlsx', 'xls'}
+
+
+# ===== PDF EM PARALELO =====
+# PDFs com pelo menos esse número de páginas têm as páginas divididas entre
+# processos (0 desativa); abaixo disso o custo de abrir o PDF em cada processo
+# não compensa
+PDF_PARALELO_MIN_PAGINAS = _env_int('AGILIZA_PDF_PARALELO_MIN_PAGINAS', 16)
+
+# Processos por worker de PDF que extraem as páginas. Cada processo do executor
+# pode abrir o seu pool ao mesmo tempo, então o padrão divide os núcleos entre
+# eles (executor x páginas ~ núcleos) em vez de multiplicar
+PDF_PARALELO_PROCESSOS = _env_int('AGILIZA_PDF_PARALELO_PROCESSOS',
+                                  max(1, (os.cpu_count() or 2) // max(1, EXECUTOR_MAX_PROCESSOS)))
+
+# Páginas de PDF com o layout extraído mantido em memória ao mesmo tempo
+# (as anteriores têm o cache liberado; ver pdf_paginas.py)
+PDF_JANELA_PAGINAS = _env_int('AGILIZA_PDF_JANELA_PAGINAS', 2)
+
+
+# ===== SAÍDA EXCEL =====
+# Gera o .xlsx em fluxo, linha a linha, direto no corpo da resposta/arquivo do job
+# (ver xlsx_stream.py); desligado volta ao `to_excel` do pandas em memória
+XLSX_STREAMING = os.getenv('AGILIZA_XLSX_STREAMING', '1') not in ('0', 'false', 'False', '')
+
+# Linhas da planilha escritas entre um bloco de bytes enviado e o próximo
+XLSX_LINHAS_POR_BLOCO = _env_int('AGILIZA_XLSX_LINHAS_POR_BLOCO', 5000)
+
+
+# ===== JOBS ASSÍNCRONOS =====
+# Raiz do projeto (para caminhos relativos de dados)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Diretório com o banco SQLite da fila e os arquivos de entrada/resultado
+JOBS_DIR = os.getenv('AGILIZA_JOBS_DIR', os.path.join(BASE_DIR, 'data', 'jobs'))
+
+# Jobs processados simultaneamente por worker uvicorn
+JOBS_CONCORRENTES = _env_int('AGILIZA_JOBS_CONCORRENTES', 1)
+
+# Intervalo (segundos) entre consultas à fila quando ociosa
+JOBS_INTERVALO_POLL = _env_int('AGILIZA_JOBS_INTERVALO_POLL', 1)
+
+# Tempo (horas) que jobs finalizados e seus arquivos ficam disponíveis
+JOBS_RETENCAO_HORAS = _env_int('AGILIZA_JOBS_RETENCAO_HORAS', 24)
+
+# Jobs "processando" sem heartbeat há mais que isso (segundos) voltam para a fila
+JOBS_TIMEOUT_HEARTBEAT = _env_int('AGILIZA_JOBS_TIMEOUT_HEARTBEAT', 120)
+
+
+# ===== CACHE DE RESULTADOS =====
+# Cache em disco dos DataFrames extraídos, compartilhado entre workers
+CACHE_ATIVO = os.getenv('AGILIZA_CACHE_ATIVO', '1') not in ('0', 'false', 'False', '')
+CACHE_DIR = os.getenv('AGILIZA_CACHE_DIR', os.path.join(BASE_DIR, 'data', 'cache'))
+CACHE_MAX_MB = _env_int('AGILIZA_CACHE_MAX_MB', 512)
+CACHE_TTL_HORAS = _env_int('AGILIZA_CACHE_TTL_HORAS', 24)
+# Resultados sem dados (processador rodou e não extraiu nada) valem bem menos
+CACHE_TTL_SEM_DADOS_MINUTOS = _env_int('AGILIZA_CACHE_TTL_SEM_DADOS_MINUTOS', 10)
+
+
+# ===== MÉTRICAS =====
+# Histogramas de tempo por etapa, processador e extensão em GET /api/metrics
+# (formato Prometheus), somados entre os workers por um SQLite neste diretório
+METRICAS_ATIVO = os.getenv('AGILIZA_METRICAS', '1') not in ('0', 'false', 'False', '')
+METRICAS_DIR = os.getenv('AGILIZA_METRICAS_DIR', os.path.join(BASE_DIR, 'data', 'metricas'))
+
+
+# ===== SERVIÇO DE OCR =====
+# Processos dedicados com o modelo EasyOCR carregado e aquecido, compartilhados
+# por todos os workers uvicorn (iniciado pelo app.py ou via
+# `python -m src.processing.ocr_service`)
+OCR_SERVICO_ATIVO = os.getenv('AGILIZA_OCR_SERVICO', '1') not in ('0', 'false', 'False', '')
+OCR_SERVICO_HOST = os.getenv('AGILIZA_OCR_HOST', '127.0.0.1')
+OCR_SERVICO_PORTA = _env_int('AGILIZA_OCR_PORTA', 5010)
+OCR_SERVICO_PROCESSOS = _env_int('AGILIZA_OCR_PROCESSOS', 2)
+
+# Chave de autenticação da conexão local. Sem AGILIZA_OCR_CHAVE, o app.py gera
+# uma chave aleatória ao iniciar o serviço e a repassa aos workers pelo ambiente
+OCR_SERVICO_CHAVE = os.getenv('AGILIZA_OCR_CHAVE', '')
+
+# Tempo máximo (segundos) de espera por uma resposta do serviço
+OCR_SERVICO_TIMEOUT = _env_int('AGILIZA_OCR_TIMEOUT', 120)
+
+
+# ===== DIAGNÓSTICO =====
+# Contadores de chamadas/acertos/tempo por regex dos parsers (src/utils/patterns.py),
+# consultáveis em GET /api/regex/stats. Desligado por padrão (custo por chamada)
+REGEX_ESTATISTICAS = os.getenv('AGILIZA_REGEX_STATS', '0') not in ('0', 'false', 'False', '')
+
+
+# ===== LOGS =====
+# Nível mínimo registrado (DEBUG, INFO, WARNING, ERROR). Em DEBUG saem os
+# detalhes por página/linha e os dumps de DataFrame dos processadores
+LOG_NIVEL = os.getenv('AGILIZA_LOG_NIVEL', 'INFO').upper()
+
+# Formato das linhas: 'texto' (legível) ou 'json' (um objeto por linha, para coletores)
+LOG_FORMATO = os.getenv('AGILIZA_LOG_FORMATO', 'texto').lower()
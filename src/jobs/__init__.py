@@ -0,0 +1 @@
+"""Fila persistente de jobs de conversão (SQLite + diretório de resultados)."""
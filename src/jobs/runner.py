@@ -0,0 +1,178 @@
+"""Execução dos jobs enfileirados em segundo plano.
+
+Cada worker uvicorn roda um JobRunner que reivindica jobs pendentes no
+JobStore e os processa com o mesmo pipeline do /api/upload.
+"""
+
+import asyncio
+import os
+import time
+
+from src.config.settings import (
+    JOBS_CONCORRENTES,
+    JOBS_INTERVALO_POLL,
+    JOBS_RETENCAO_HORAS,
+    JOBS_TIMEOUT_HEARTBEAT,
+)
+from src.jobs.store import JobStore, job_store, STATUS_PROCESSANDO, STATUS_CONCLUIDO, STATUS_ERRO
+from src.processing.excel_generator import ExcelGenerator
+from src.processing.pipeline import processar_arquivo, combinar_resultados, nome_arquivo_saida
+from src.utils.metricas import metricas
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+# Intervalo (segundos) entre rotinas de manutenção (órfãos e expirados)
+_INTERVALO_MANUTENCAO = 60
+
+
+class JobRunner:
+    """Consome a fila de jobs do JobStore dentro do event loop do worker."""
+
+    def __init__(self, store: JobStore = job_store, concorrentes: int = JOBS_CONCORRENTES):
+        self.store = store
+        self.concorrentes = max(1, concorrentes)
+        self._tarefas = []
+        self._ultima_manutencao = 0.0
+
+    def iniciar(self):
+        """Inicia os loops de consumo (chamado no startup da aplicação)."""
+        if self._tarefas:
+            return
+        loop = asyncio.get_running_loop()
+        self._tarefas = [loop.create_task(self._loop()) for _ in range(self.concorrentes)]
+        logger.info("[JOBS] Runner iniciado (pid %s, %s job(s) simultâneo(s))", os.getpid(), self.concorrentes)
+
+    async def parar(self):
+        """Cancela os loops de consumo (chamado no shutdown da aplicação)."""
+        for tarefa in self._tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, return_exceptions=True)
+        self._tarefas = []
+
+    async def _loop(self):
+        while True:
+            try:
+                job = await asyncio.to_thread(self.store.reivindicar_proximo)
+                if job is None:
+                    await self._manutencao()
+                    await asyncio.sleep(JOBS_INTERVALO_POLL)
+                    continue
+                await self._executar_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("[JOBS] Erro no loop de jobs: %s", e)
+                await asyncio.sleep(JOBS_INTERVALO_POLL)
+
+    async def _manutencao(self):
+        """Recoloca jobs órfãos na fila e apaga jobs expirados."""
+        agora = time.time()
+        if agora - self._ultima_manutencao < _INTERVALO_MANUTENCAO:
+            return
+        self._ultima_manutencao = agora
+
+        recuperados = await asyncio.to_thread(self.store.recuperar_orfaos, JOBS_TIMEOUT_HEARTBEAT)
+        if recuperados:
+            logger.info("[JOBS] %s job(s) órfão(s) devolvido(s) à fila", recuperados)
+        removidos = await asyncio.to_thread(self.store.remover_expirados, JOBS_RETENCAO_HORAS)
+        if removidos:
+            logger.info("[JOBS] %s job(s) expirado(s) removido(s)", removidos)
+
+    async def _heartbeat(self, job_id: str):
+        """Renova o heartbeat do job enquanto ele roda; uma falha (ex: banco travado) não o interrompe."""
+        while True:
+            await asyncio.sleep(max(1, JOBS_TIMEOUT_HEARTBEAT // 4))
+            try:
+                await asyncio.to_thread(self.store.registrar_heartbeat, job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("[JOBS] Falha ao registrar heartbeat do job %s: %s", job_id, e)
+
+    async def _executar_job(self, job: dict):
+        job_id = job['id']
+        logger.info("[JOBS] Iniciando job %s", job_id)
+        heartbeat = asyncio.get_running_loop().create_task(self._heartbeat(job_id))
+
+        try:
+            arquivos = await asyncio.to_thread(self.store.listar_arquivos, job_id)
+            resultados = await asyncio.gather(
+                *(self._processar_arquivo_job(job_id, job['modelo'], arquivo) for arquivo in arquivos)
+            )
+
+            all_dataframes = []
+            errors = []
+            for dataframe, _, erro in resultados:
+                if erro:
+                    errors.append(erro)
+                else:
+                    all_dataframes.append(dataframe)
+
+            if not all_dataframes:
+                error_msg = 'Nenhum arquivo foi processado com sucesso'
+                if errors:
+                    error_msg += ': ' + '; '.join(errors)
+                await asyncio.to_thread(self.store.falhar_job, job_id, error_msg)
+                logger.warning("[JOBS] Job %s falhou: %s", job_id, error_msg)
+                return
+
+            avisos = 'Arquivos não processados: ' + '; '.join(errors) if errors else None
+
+            with metricas.medir('agiliza_etapa_segundos', etapa='concat'):
+                combined_df = combinar_resultados(all_dataframes)
+            with metricas.medir('agiliza_etapa_segundos', etapa='exportacao', extensao='xlsx'):
+                await asyncio.to_thread(self._gravar_resultado, job_id, combined_df)
+
+            await asyncio.to_thread(self.store.concluir_job, job_id, nome_arquivo_saida(), avisos)
+            logger.info("[JOBS] Job %s concluído: %s linhas", job_id, len(combined_df))
+
+        except Exception as e:
+            logger.warning("[JOBS] Job %s falhou: %s", job_id, e)
+            await asyncio.to_thread(self.store.falhar_job, job_id, str(e))
+        finally:
+            heartbeat.cancel()
+            await asyncio.to_thread(metricas.gravar)
+
+    async def _processar_arquivo_job(self, job_id: str, modelo: str, arquivo: dict) -> tuple:
+        """Processa um arquivo do job registrando progresso no store."""
+        ordem, nome = arquivo['ordem'], arquivo['nome']
+        await asyncio.to_thread(self.store.atualizar_arquivo, job_id, ordem, status=STATUS_PROCESSANDO)
+
+        inicio = time.perf_counter()
+        try:
+            caminho = self.store.caminho_entrada(job_id, ordem, nome)
+            file_content = await asyncio.to_thread(_ler_arquivo, caminho)
+        except Exception as e:
+            resultado = (None, None, f'{nome}: {str(e)}')
+        else:
+            resultado = await processar_arquivo(nome, file_content, modelo)
+        tempo = time.perf_counter() - inicio
+
+        dataframe, info, erro = resultado
+        await asyncio.to_thread(
+            self.store.atualizar_arquivo, job_id, ordem,
+            status=STATUS_ERRO if erro else STATUS_CONCLUIDO,
+            modelo=info['modelo'] if info else None,
+            processador=info['processador'] if info else None,
+            linhas=len(dataframe) if dataframe is not None else 0,
+            tempo=round(tempo, 3),
+            erro=erro,
+        )
+        return resultado
+
+    def _gravar_resultado(self, job_id: str, dataframe):
+        """Grava a planilha de forma atômica (arquivo temporário + rename), em blocos."""
+        caminho = self.store.caminho_resultado(job_id)
+        temporario = caminho + '.tmp'
+        ExcelGenerator.save(dataframe, temporario)
+        os.replace(temporario, caminho)
+
+
+def _ler_arquivo(caminho: str) -> bytes:
+    with open(caminho, 'rb') as f:
+        return f.read()
+
+
+# Runner do worker atual
+job_runner = JobRunner()
@@ -0,0 +1,287 @@
+"""Persistência da fila de jobs em SQLite, com arquivos em disco.
+
+O banco fica em JOBS_DIR e é compartilhado pelos workers uvicorn; a
+reivindicação de um job usa transação IMMEDIATE, então cada job é
+processado por um único worker.
+"""
+
+import os
+import re
+import shutil
+import sqlite3
+import time
+import uuid
+
+from src.config.settings import JOBS_DIR
+
+# Status possíveis de um job e de seus arquivos
+STATUS_PENDENTE = 'pendente'
+STATUS_PROCESSANDO = 'processando'
+STATUS_CONCLUIDO = 'concluido'
+STATUS_ERRO = 'erro'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    modelo TEXT NOT NULL,
+    criado_em REAL NOT NULL,
+    iniciado_em REAL,
+    concluido_em REAL,
+    worker_pid INTEGER,
+    heartbeat REAL,
+    nome_resultado TEXT,
+    avisos TEXT,
+    erro TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, criado_em);
+CREATE TABLE IF NOT EXISTS job_arquivos (
+    job_id TEXT NOT NULL,
+    ordem INTEGER NOT NULL,
+    nome TEXT NOT NULL,
+    status TEXT NOT NULL,
+    modelo TEXT,
+    processador TEXT,
+    linhas INTEGER,
+    tempo REAL,
+    erro TEXT,
+    PRIMARY KEY (job_id, ordem)
+);
+"""
+
+
+class JobStore:
+    """Fila de jobs persistida em SQLite + diretório de arquivos."""
+
+    def __init__(self, base_dir: str = JOBS_DIR):
+        self.base_dir = base_dir
+        self.db_path = os.path.join(base_dir, 'jobs.db')
+        self._inicializado = False
+
+    def _conectar(self) -> sqlite3.Connection:
+        if not self._inicializado:
+            os.makedirs(self.base_dir, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._inicializado:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            self._inicializado = True
+        return conn
+
+    def _dir_job(self, job_id: str) -> str:
+        return os.path.join(self.base_dir, job_id)
+
+    def caminho_entrada(self, job_id: str, ordem: int, nome: str) -> str:
+        """Caminho em disco do arquivo de entrada de um job."""
+        nome_seguro = re.sub(r'[^\w.\-]', '_', os.path.basename(nome))
+        return os.path.join(self._dir_job(job_id), 'entrada', f"{ordem:03d}_{nome_seguro}")
+
+    def caminho_resultado(self, job_id: str) -> str:
+        """Caminho em disco da planilha gerada por um job."""
+        return os.path.join(self._dir_job(job_id), 'resultado.xlsx')
+
+    def criar_job(self, modelo: str, arquivos: list[tuple[str, bytes]]) -> str:
+        """
+        Grava os arquivos de entrada e enfileira um novo job.
+
+        Args:
+            modelo: Modelo de negócio ('winthor' ou 'planilha')
+            arquivos: Lista de (nome do arquivo, conteúdo) na ordem do upload
+
+        Returns:
+            ID do job criado
+        """
+        job_id = uuid.uuid4().hex
+        os.makedirs(os.path.join(self._dir_job(job_id), 'entrada'), exist_ok=True)
+
+        for ordem, (nome, conteudo) in enumerate(arquivos):
+            with open(self.caminho_entrada(job_id, ordem, nome), 'wb') as f:
+                f.write(conteudo)
+
+        conn = self._conectar()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(
+                'INSERT INTO job_arquivos (job_id, ordem, nome, status) VALUES (?, ?, ?, ?)',
+                [(job_id, ordem, nome, STATUS_PENDENTE) for ordem, (nome, _) in enumerate(arquivos)]
+            )
+            conn.execute(
+                'INSERT INTO jobs (id, status, modelo, criado_em) VALUES (?, ?, ?, ?)',
+                (job_id, STATUS_PENDENTE, modelo, time.time())
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            shutil.rmtree(self._dir_job(job_id), ignore_errors=True)
+            raise
+        finally:
+            conn.close()
+
+        return job_id
+
+    def reivindicar_proximo(self) -> dict | None:
+        """Marca o job pendente mais antigo como em processamento por este worker."""
+        conn = self._conectar()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT * FROM jobs WHERE status = ? ORDER BY criado_em LIMIT 1',
+                (STATUS_PENDENTE,)
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            agora = time.time()
+            conn.execute(
+                'UPDATE jobs SET status = ?, iniciado_em = ?, heartbeat = ?, worker_pid = ? WHERE id = ?',
+                (STATUS_PROCESSANDO, agora, agora, os.getpid(), row['id'])
+            )
+            conn.execute('COMMIT')
+            return dict(row)
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def listar_arquivos(self, job_id: str) -> list[dict]:
+        """Arquivos do job, na ordem do upload."""
+        conn = self._conectar()
+        try:
+            rows = conn.execute(
+                'SELECT * FROM job_arquivos WHERE job_id = ? ORDER BY ordem', (job_id,)
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def atualizar_arquivo(self, job_id: str, ordem: int, **campos):
+        """Atualiza status/progresso de um arquivo do job."""
+        if not campos:
+            return
+        colunas = ', '.join(f"{coluna} = ?" for coluna in campos)
+        conn = self._conectar()
+        try:
+            conn.execute(
+                f'UPDATE job_arquivos SET {colunas} WHERE job_id = ? AND ordem = ?',
+                (*campos.values(), job_id, ordem)
+            )
+        finally:
+            conn.close()
+
+    def concluir_job(self, job_id: str, nome_resultado: str, avisos: str | None = None):
+        """Marca o job como concluído (resultado já gravado em disco)."""
+        conn = self._conectar()
+        try:
+            conn.execute(
+                'UPDATE jobs SET status = ?, concluido_em = ?, nome_resultado = ?, avisos = ? WHERE id = ?',
+                (STATUS_CONCLUIDO, time.time(), nome_resultado, avisos, job_id)
+            )
+        finally:
+            conn.close()
+
+    def falhar_job(self, job_id: str, erro: str):
+        """Marca o job como falho."""
+        conn = self._conectar()
+        try:
+            conn.execute(
+                'UPDATE jobs SET status = ?, concluido_em = ?, erro = ? WHERE id = ?',
+                (STATUS_ERRO, time.time(), erro, job_id)
+            )
+        finally:
+            conn.close()
+
+    def obter_job(self, job_id: str) -> dict | None:
+        """Retorna o job com a lista de arquivos, ou None se não existir."""
+        conn = self._conectar()
+        try:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                return None
+            job = dict(row)
+            job['arquivos'] = [
+                dict(r) for r in conn.execute(
+                    'SELECT * FROM job_arquivos WHERE job_id = ? ORDER BY ordem', (job_id,)
+                ).fetchall()
+            ]
+            return job
+        finally:
+            conn.close()
+
+    def registrar_heartbeat(self, job_id: str):
+        """Sinaliza que o worker dono do job continua vivo."""
+        conn = self._conectar()
+        try:
+            conn.execute('UPDATE jobs SET heartbeat = ? WHERE id = ?', (time.time(), job_id))
+        finally:
+            conn.close()
+
+    def recuperar_orfaos(self, timeout_segundos: int) -> int:
+        """
+        Devolve para a fila jobs cujo worker parou de enviar heartbeat
+        (ex: worker reiniciado no meio do processamento).
+
+        Returns:
+            Quantidade de jobs recolocados na fila
+        """
+        limite = time.time() - timeout_segundos
+        conn = self._conectar()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute(
+                'SELECT id FROM jobs WHERE status = ? AND heartbeat < ?', (STATUS_PROCESSANDO, limite)
+            ).fetchall()
+            orfaos = [row['id'] for row in rows]
+            for job_id in orfaos:
+                conn.execute(
+                    'UPDATE jobs SET status = ?, iniciado_em = NULL, heartbeat = NULL, worker_pid = NULL '
+                    'WHERE id = ?',
+                    (STATUS_PENDENTE, job_id)
+                )
+                conn.execute(
+                    'UPDATE job_arquivos SET status = ?, processador = NULL, linhas = NULL, '
+                    'tempo = NULL, erro = NULL WHERE job_id = ?',
+                    (STATUS_PENDENTE, job_id)
+                )
+            conn.execute('COMMIT')
+            return len(orfaos)
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def remover_expirados(self, retencao_horas: int) -> int:
+        """
+        Remove jobs finalizados há mais de `retencao_horas` e seus arquivos.
+
+        Returns:
+            Quantidade de jobs removidos
+        """
+        limite = time.time() - retencao_horas * 3600
+        conn = self._conectar()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute(
+                'SELECT id FROM jobs WHERE status IN (?, ?) AND concluido_em < ?',
+                (STATUS_CONCLUIDO, STATUS_ERRO, limite)
+            ).fetchall()
+            ids = [row['id'] for row in rows]
+            for job_id in ids:
+                conn.execute('DELETE FROM job_arquivos WHERE job_id = ?', (job_id,))
+                conn.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+        for job_id in ids:
+            shutil.rmtree(self._dir_job(job_id), ignore_errors=True)
+        return len(ids)
+
+
+# Store compartilhado pelas rotas e pelo runner
+job_store = JobStore()
@@ -1,18 +1,42 @@
-"""Imports para processadores de arquivo."""
+"""Imports para processadores de arquivo.
+
+As classes são importadas sob demanda (PEP 562) para que importar o pacote
+não carregue todos os processadores e suas dependências. Fornecedores descritos
+só por especificação (layouts/*.json) são o LayoutProcessor ligado ao layout.
+"""
+
+import importlib
 
 from .base import FileProcessor
-from .biomaxfarma_processor import BioMaxFarmaProcessor
-from .cotefacil_processor import CotefacilProcessor
-from .crescer_processor import CrescerProcessor
-from .dsgfarma_processor import DSGFarmaProcessor
-from .oceanica_processor import OceanicaProcessor
-from .kimberly_processor import KimberlyProcessor
-from .loreal_processor import LorealProcessor
-from .natusfarma_processor import NatusFarmaProcessor
-from .poupaminas_processor import PoupaminasProcessor
-from .prudence_processor import PrudenceProcessor
-from .unilever_processor import UnileverProcessor
-from .siage_processor import SiageProcessor
+
+_MODULOS = {
+    'CrescerProcessor': '.crescer_processor',
+    'DSGFarmaProcessor': '.dsgfarma_processor',
+    'LayoutProcessor': '.layout_processor',
+    'PoupaminasProcessor': '.poupaminas_processor',
+    'PrudenceProcessor': '.prudence_processor',
+}
+
+_LAYOUTS = {
+    'BioMaxFarmaProcessor': 'biomaxfarma',
+    'CotefacilProcessor': 'cotefacil',
+    'OceanicaProcessor': 'oceanica',
+    'KimberlyProcessor': 'kimberly',
+    'LorealProcessor': 'loreal',
+    'NatusFarmaProcessor': 'natusfarma',
+    'UnileverProcessor': 'unilever',
+    'SiageProcessor': 'siage',
+}
+
+
+def __getattr__(nome):
+    if nome in _MODULOS:
+        return getattr(importlib.import_module(_MODULOS[nome], __name__), nome)
+    if nome in _LAYOUTS:
+        modulo = importlib.import_module('.layout_processor', __name__)
+        return modulo.LayoutProcessor.para_layout(_LAYOUTS[nome])
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
 
 __all__ = [
     'FileProcessor',
@@ -20,6 +44,7 @@ __all__ = [
     'CotefacilProcessor',
     'CrescerProcessor',
     'DSGFarmaProcessor',
+    'LayoutProcessor',
     'OceanicaProcessor',
     'KimberlyProcessor',
     'LorealProcessor',
@@ -3,10 +3,22 @@
 from abc import ABC, abstractmethod
 import pandas as pd
 
+from src.processing.documento import DocumentoCarregado
+
 
 class FileProcessor(ABC):
     """Interface para processadores de arquivo."""
 
+    # Versão da saída do processador. Incrementar sempre que a extração mudar,
+    # pois ela faz parte da chave do cache de resultados
+    VERSION = '1'
+
+    # Marcado quando o processamento falha (exceção tratada, OCR indisponível),
+    # o que é diferente de ler o arquivo e não achar dados: o pipeline não guarda
+    # esse resultado no cache. As instâncias são por thread/processo (ver
+    # executor._obter_instancia), e o executor zera o status antes de cada arquivo
+    falhou = False
+
     @abstractmethod
     def process(self, file_content: bytes, filename: str = None) -> pd.DataFrame | None:
         """
@@ -20,3 +32,12 @@ class FileProcessor(ABC):
             DataFrame com dados processados ou None se erro
         """
         pass
+
+    def processar_documento(self, documento: DocumentoCarregado) -> pd.DataFrame | None:
+        """
+        Processa um upload já carregado, reaproveitando o que outro processador leu.
+
+        Processadores que leem PDF/planilha/TXT pelo documento sobrescrevem este
+        método (e o process() passa a criar o documento); o padrão relê os bytes.
+        """
+        return self.process(documento.conteudo, documento.nome)
@@ -0,0 +1,208 @@
+"""Cache em disco dos DataFrames extraídos pelos processadores.
+
+A chave é o SHA-256 do conteúdo + extensão + nome e versão do processador,
+então reenviar o mesmo arquivo (ex: para reexportar com model=planilha)
+pula a extração. O índice fica em SQLite no diretório do cache e é
+compartilhado pelos workers uvicorn; a remoção é LRU por tamanho e TTL.
+Resultados sem dados valem só por CACHE_TTL_SEM_DADOS_MINUTOS, e falhas dos
+processadores não são guardadas (ver pipeline.executar_com_cache).
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+import uuid
+
+import pandas as pd
+
+from src.config.settings import (
+    CACHE_ATIVO, CACHE_DIR, CACHE_MAX_MB, CACHE_TTL_HORAS, CACHE_TTL_SEM_DADOS_MINUTOS,
+)
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entradas (
+    chave TEXT PRIMARY KEY,
+    tamanho INTEGER NOT NULL,
+    criado_em REAL NOT NULL,
+    acessado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entradas_acesso ON entradas (acessado_em);
+"""
+
+# Marca resultados vazios (processador retornou None ou DataFrame vazio), para
+# o fallback não precisar rodar o processador especializado de novo enquanto
+# valem (ttl_sem_dados)
+_SEM_DADOS = '__sem_dados__'
+
+
+def hash_conteudo(file_content: bytes) -> str:
+    """SHA-256 do conteúdo do arquivo."""
+    return hashlib.sha256(file_content).hexdigest()
+
+
+class ResultCache:
+    """Cache LRU em disco de DataFrames por conteúdo + processador."""
+
+    def __init__(self, base_dir: str = CACHE_DIR, max_mb: int = CACHE_MAX_MB,
+                 ttl_horas: int = CACHE_TTL_HORAS, ativo: bool = CACHE_ATIVO,
+                 ttl_sem_dados_minutos: int = CACHE_TTL_SEM_DADOS_MINUTOS):
+        self.base_dir = base_dir
+        self.max_bytes = max_mb * 1024 * 1024
+        self.ttl_segundos = ttl_horas * 3600
+        self.ttl_sem_dados_segundos = ttl_sem_dados_minutos * 60
+        self.ativo = ativo
+        self.db_path = os.path.join(base_dir, 'index.db')
+        self._inicializado = False
+
+    def _conectar(self) -> sqlite3.Connection:
+        if not self._inicializado:
+            os.makedirs(self.base_dir, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        if not self._inicializado:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            self._inicializado = True
+        return conn
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.base_dir, f"{chave}.pkl")
+
+    @staticmethod
+    def montar_chave(conteudo_hash: str, file_ext: str, processor_type: str, versao: str) -> str:
+        """Chave do cache: hash do conteúdo + extensão + processador + versão."""
+        base = f"{conteudo_hash}:{file_ext}:{processor_type}:{versao}"
+        return hashlib.sha256(base.encode('utf-8')).hexdigest()
+
+    def obter(self, chave: str) -> tuple[bool, pd.DataFrame | None]:
+        """
+        Busca um resultado no cache.
+
+        Returns:
+            Tuple (encontrado, dataframe) - dataframe pode ser None quando o
+            processador não extraiu dados
+        """
+        if not self.ativo:
+            return False, None
+
+        try:
+            conn = self._conectar()
+            try:
+                row = conn.execute(
+                    'SELECT criado_em FROM entradas WHERE chave = ?', (chave,)
+                ).fetchone()
+                if row is None:
+                    return False, None
+
+                agora = time.time()
+                if agora - row[0] > self.ttl_segundos:
+                    self._remover(conn, [chave])
+                    return False, None
+
+                try:
+                    with open(self._caminho(chave), 'rb') as f:
+                        valor = pickle.load(f)
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    self._remover(conn, [chave])
+                    return False, None
+
+                sem_dados = isinstance(valor, str) and valor == _SEM_DADOS
+                if sem_dados and agora - row[0] > self.ttl_sem_dados_segundos:
+                    self._remover(conn, [chave])
+                    return False, None
+
+                conn.execute('UPDATE entradas SET acessado_em = ? WHERE chave = ?', (agora, chave))
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning("[CACHE] Erro ao ler cache: %s", e)
+            return False, None
+
+        return True, None if sem_dados else valor
+
+    def guardar(self, chave: str, dataframe: pd.DataFrame | None):
+        """
+        Grava o resultado de um processador e aplica a política de remoção.
+
+        None ou DataFrame vazio vira uma entrada sem dados, com TTL curto.
+        Só deve receber resultados de execuções sem falha.
+        """
+        if not self.ativo:
+            return
+
+        try:
+            os.makedirs(self.base_dir, exist_ok=True)
+            caminho = self._caminho(chave)
+            temporario = f"{caminho}.{uuid.uuid4().hex}.tmp"
+            with open(temporario, 'wb') as f:
+                pickle.dump(_SEM_DADOS if dataframe is None or dataframe.empty else dataframe, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, caminho)
+
+            agora = time.time()
+            conn = self._conectar()
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO entradas (chave, tamanho, criado_em, acessado_em) VALUES (?, ?, ?, ?)',
+                    (chave, os.path.getsize(caminho), agora, agora)
+                )
+                self._aplicar_limites(conn)
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning("[CACHE] Erro ao gravar cache: %s", e)
+
+    def _aplicar_limites(self, conn: sqlite3.Connection):
+        """Remove entradas expiradas e, se preciso, as menos usadas até caber no limite."""
+        limite_ttl = time.time() - self.ttl_segundos
+        expiradas = [row[0] for row in conn.execute(
+            'SELECT chave FROM entradas WHERE criado_em < ?', (limite_ttl,)
+        )]
+        self._remover(conn, expiradas)
+
+        total = conn.execute('SELECT COALESCE(SUM(tamanho), 0) FROM entradas').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        remover = []
+        for chave, tamanho in conn.execute('SELECT chave, tamanho FROM entradas ORDER BY acessado_em'):
+            if total <= self.max_bytes:
+                break
+            remover.append(chave)
+            total -= tamanho
+        self._remover(conn, remover)
+
+    def _remover(self, conn: sqlite3.Connection, chaves: list[str]):
+        for chave in chaves:
+            conn.execute('DELETE FROM entradas WHERE chave = ?', (chave,))
+            try:
+                os.remove(self._caminho(chave))
+            except OSError:
+                pass
+
+    def status(self) -> dict:
+        """Quantidade de entradas e ocupação do cache."""
+        if not self.ativo:
+            return {'ativo': False}
+        conn = self._conectar()
+        try:
+            entradas, total = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM entradas'
+            ).fetchone()
+        finally:
+            conn.close()
+        return {
+            'ativo': True,
+            'entradas': entradas,
+            'tamanho_mb': round(total / (1024 * 1024), 2),
+            'max_mb': round(self.max_bytes / (1024 * 1024), 2),
+            'ttl_horas': self.ttl_segundos / 3600,
+            'ttl_sem_dados_minutos': self.ttl_sem_dados_segundos / 60,
+        }
+
+
+# Cache compartilhado pelo pipeline
+result_cache = ResultCache()
@@ -0,0 +1,106 @@
+"""Upload carregado uma vez e compartilhado entre processadores.
+
+Quando o processador especializado não extrai nada, o pipeline tenta o
+genérico do mesmo tipo de arquivo. Antes, cada tentativa recebia os bytes e
+abria o PDF, a pasta de trabalho ou decodificava o TXT de novo. O
+`DocumentoCarregado` guarda o que já foi lido (texto e tabelas de cada
+página, grades das abas, texto decodificado) e é passado às duas tentativas
+dentro do mesmo worker (ver executor.executar_processadores).
+"""
+
+from functools import cached_property
+from io import BytesIO
+
+from src.processing.pdf_paginas import LayoutPagina, iterar_layouts, texto_documento
+from src.processing.workbook import Planilha
+
+
+class DocumentoCarregado:
+    """Conteúdo de um upload com PDF, planilha e texto abertos sob demanda e em cache."""
+
+    def __init__(self, conteudo: bytes, nome: str | None = None):
+        """
+        Args:
+            conteudo: Conteúdo do arquivo em bytes
+            nome: Nome do arquivo (a extensão decide o formato)
+        """
+        self.conteudo = conteudo
+        self.nome = nome
+        self.ext = nome.rsplit('.', 1)[1].lower() if nome and '.' in nome else None
+        self._pdf = None
+        self._layouts = {}
+        self._planilhas = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    # ===== TXT =====
+
+    @cached_property
+    def texto(self) -> str:
+        """Conteúdo decodificado como UTF-8 (bytes inválidos ignorados)."""
+        return self.conteudo.decode('utf-8', errors='ignore')
+
+    def fluxo(self) -> BytesIO:
+        """Conteúdo como fluxo de bytes, para ler o TXT linha a linha (ver txt_linhas.py)."""
+        return BytesIO(self.conteudo)
+
+    # ===== PDF =====
+
+    @property
+    def pdf(self):
+        """PDF aberto com pdfplumber (aberto na primeira chamada)."""
+        if self._pdf is None:
+            import pdfplumber
+            self._pdf = pdfplumber.open(BytesIO(self.conteudo))
+        return self._pdf
+
+    @property
+    def total_paginas(self) -> int:
+        return len(self.pdf.pages)
+
+    def layout(self, num_pagina: int) -> LayoutPagina:
+        """Layout de uma página avulsa (ex: a primeira, para o número do pedido)."""
+        if num_pagina not in self._layouts:
+            self._layouts[num_pagina] = LayoutPagina(self.pdf.pages[num_pagina])
+        return self._layouts[num_pagina]
+
+    def layouts(self, inicio: int = 0, fim: int | None = None):
+        """Percorre os layouts das páginas [inicio, fim), reaproveitando o que já foi extraído."""
+        return iterar_layouts(self.pdf, inicio, fim, layouts=self._layouts)
+
+    @property
+    def texto_pdf(self) -> str:
+        """Texto de todas as páginas do PDF (ver pdf_paginas.texto_documento)."""
+        return texto_documento(self.pdf, layouts=self._layouts)
+
+    # ===== EXCEL =====
+
+    def planilha(self, engine: str | None = None) -> Planilha:
+        """
+        Pasta de trabalho aberta uma vez por engine.
+
+        Args:
+            engine: 'openpyxl', 'xlrd' ou None para detectar pelo conteúdo (e
+                reaproveitar a pasta já aberta, qualquer que seja a engine)
+        """
+        if engine is None and self._planilhas:
+            return next(iter(self._planilhas.values()))
+        if engine not in self._planilhas:
+            planilha = Planilha(self.conteudo, engine=engine)
+            self._planilhas[planilha.engine] = planilha
+            engine = planilha.engine
+        return self._planilhas[engine]
+
+    def fechar(self):
+        """Fecha o PDF e as pastas de trabalho abertas."""
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+        for planilha in self._planilhas.values():
+            planilha.fechar()
+        self._planilhas = {}
+        self._layouts = {}
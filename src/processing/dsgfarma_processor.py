@@ -1,72 +1,32 @@
 """Processador especializado para DSG Farma."""
 
 import pandas as pd
-from io import BytesIO
-from .base import FileProcessor
-from src.utils.validators import extract_cnpj, extract_ean13, normalizar_preco
+from .documento import DocumentoCarregado
+from .layout_engine import obter_layout
+from .layout_processor import LayoutProcessor
+from src.utils.validators import extract_cnpj
+from src.utils.logging_config import obter_logger
 
+logger = obter_logger(__name__)
 
-class DSGFarmaProcessor(FileProcessor):
-    """Processa pedidos DSG Farma."""
+
+class DSGFarmaProcessor(LayoutProcessor):
+    """
+    Processa pedidos DSG Farma.
     
-    def process(self, file_content: bytes, filename: str = None) -> pd.DataFrame:
-        """Processa arquivo DSG Farma e extrai dados estruturados."""
-        print(f"\n[DSGFARMA] Processando: {filename or 'arquivo'}")
-        
-        try:
-            ext = filename.rsplit('.', 1)[1].lower() if filename and '.' in filename else 'xlsx'
-            
-            if ext in ['xlsx', 'xls']:
-                return self._processar_excel(file_content, ext)
-            elif ext == 'pdf':
-                return self._processar_pdf(file_content)
-            elif ext == 'txt':
-                return self._processar_txt(file_content)
-            else:
-                return None
-                
-        except Exception as e:
-            print(f"[DSGFARMA] ERRO: {type(e).__name__}: {str(e)}")
-            return None
+    Planilha e PDF seguem layouts/dsgfarma.json; o TXT traz vários pedidos,
+    cada um com seu CNPJ, e tem leitura própria.
+    """
     
-    def _processar_excel(self, file_content: bytes, ext: str) -> pd.DataFrame | None:
-        """Processa arquivo Excel DSG Farma."""
-        try:
-            engine = 'openpyxl' if ext == 'xlsx' else 'xlrd'
-            df = pd.read_excel(BytesIO(file_content), engine=engine)
-            df.columns = [str(col).strip() for col in df.columns]
-            return self._extrair_dados(df)
-        except Exception as e:
-            print(f"[DSGFARMA] ERRO ao processar Excel: {e}")
-            return None
+    LAYOUT = obter_layout('dsgfarma')
     
-    def _processar_pdf(self, file_content: bytes) -> pd.DataFrame | None:
-        """Processa arquivo PDF DSG Farma."""
-        try:
-            import pdfplumber
-            dados = []
-            
-            with pdfplumber.open(BytesIO(file_content)) as pdf:
-                for pagina in pdf.pages:
-                    texto = pagina.extract_text()
-                    if not texto:
-                        continue
-                    
-                    cnpj = extract_cnpj(texto) or ''
-                    tables = pagina.extract_tables()
-                    for table in tables or []:
-                        produtos = self._extrair_de_tabela(table, cnpj)
-                        dados.extend(produtos)
-            
-            return pd.DataFrame(dados) if dados else None
-        except Exception as e:
-            print(f"[DSGFARMA] ERRO ao processar PDF: {e}")
-            return None
+    # A especificação faz parte da saída: mudar a versão dela invalida o cache
+    VERSION = f'1.{LAYOUT.versao}'
     
-    def _processar_txt(self, file_content: bytes) -> pd.DataFrame | None:
+    def _processar_txt(self, documento: DocumentoCarregado) -> pd.DataFrame | None:
         """Processa arquivo TXT DSG Farma com múltiplos pedidos."""
         try:
-            texto = file_content.decode('utf-8', errors='ignore')
+            texto = documento.texto
             linhas = texto.split('\n')
             
             dados = []
@@ -87,11 +47,11 @@ class DSGFarmaProcessor(FileProcessor):
                     cnpj_encontrado = extract_cnpj(linhas[j])
                     if cnpj_encontrado:
                         cnpj = cnpj_encontrado
-                        print(f"[DSGFARMA TXT] CNPJ do pedido encontrado: {cnpj}")
+                        logger.debug("[DSGFARMA TXT] CNPJ do pedido encontrado: %s", cnpj)
                         break
                 
                 if not cnpj:
-                    print(f"[DSGFARMA TXT] Nenhum CNPJ encontrado para pedido em linha {i}")
+                    logger.warning("[DSGFARMA TXT] Nenhum CNPJ encontrado para pedido em linha %s", i)
                     i += 1
                     continue
                 
@@ -103,7 +63,7 @@ class DSGFarmaProcessor(FileProcessor):
                         break
                 
                 if header_idx < 0:
-                    print(f"[DSGFARMA TXT] Header não encontrado para pedido em linha {i}")
+                    logger.warning("[DSGFARMA TXT] Header não encontrado para pedido em linha %s", i)
                     i += 1
                     continue
                 
@@ -124,163 +84,47 @@ class DSGFarmaProcessor(FileProcessor):
                         dados.append(produto)
                         produtos_pedido += 1
                 
-                print(f"[DSGFARMA TXT] Produtos do pedido {cnpj}: {produtos_pedido}")
+                logger.debug("[DSGFARMA TXT] Produtos do pedido %s: %s", cnpj, produtos_pedido)
                 i = header_idx + 1
             
             if dados:
                 df = pd.DataFrame(dados)
-                print(f"[DSGFARMA TXT] Total de produtos extraídos: {len(df)}")
+                logger.info("[DSGFARMA TXT] Total de produtos extraídos: %s", len(df))
                 return df
             else:
-                print(f"[DSGFARMA TXT] Nenhum dado extraído")
+                logger.warning("[DSGFARMA TXT] Nenhum dado extraído")
                 return None
         except Exception as e:
-            print(f"[DSGFARMA] ERRO ao processar TXT: {type(e).__name__}: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[DSGFARMA] ERRO ao processar TXT: %s: %s", type(e).__name__, str(e))
+            self.falhou = True
             return None
     
-    def _extrair_dados(self, df: pd.DataFrame) -> pd.DataFrame | None:
-        """Extrai dados do DataFrame DSG Farma."""
-        try:
-            if df.empty:
-                return None
-            
-            cnpj = ''
-            for col in df.columns:
-                try:
-                    valor = str(df.iloc[0, list(df.columns).index(col)]).strip()
-                    if cnpj_temp := extract_cnpj(valor):
-                        cnpj = cnpj_temp
-                        break
-                except:
-                    continue
-            
-            col_ean = self._buscar_coluna(df.columns, ['Cod. Barras', 'Código', 'EAN'])
-            col_desc = self._buscar_coluna(df.columns, ['Descrição', 'Produto'])
-            col_qtde = self._buscar_coluna(df.columns, ['QUANTIDADE.', 'Quantidade', 'Qtde'])
-            col_preco = self._buscar_coluna(df.columns, ['PREÇO UNIT.', 'Preço', 'Custo'])
-            
-            if not all([col_ean, col_desc, col_qtde]):
-                return None
-            
-            dados = []
-            for _, row in df.iterrows():
-                ean = extract_ean13(str(row[col_ean]).strip()) or str(row[col_ean]).strip()
-                desc = str(row[col_desc]).strip() if col_desc else ''
-                
-                try:
-                    qtde = int(float(str(row[col_qtde]).replace(',', '.')))
-                except:
-                    continue
-                
-                if not ean or not desc or qtde <= 0:
-                    continue
-                
-                preco = normalizar_preco(row[col_preco]) if col_preco else 0.0
-                
-                dados.append({
-                    'CNPJ': cnpj,
-                    'EAN': ean,
-                    'DESCRICAO': desc.strip(),
-                    'QTDE': qtde,
-                    'PREÇO': preco if preco > 0 else None
-                })
-            
-            return pd.DataFrame(dados) if dados else None
-        except Exception as e:
-            print(f"[DSGFARMA] ERRO ao extrair dados: {e}")
-            return None
-    
-    def _extrair_de_tabela(self, table: list, cnpj: str) -> list:
-        """Extrai dados de tabelas PDF."""
-        dados = []
-        for row in table:
-            if not row or len(row) < 3:
-                continue
-            try:
-                ean = extract_ean13(str(row[0]).strip()) or str(row[0]).strip()
-                desc = str(row[1]).strip() if row[1] else ''
-                qtde = int(float(str(row[2]).replace(',', '.')))
-                
-                if not ean or not desc or qtde <= 0:
-                    continue
-                
-                preco = normalizar_preco(row[3]) if len(row) > 3 else 0.0
-                
-                dados.append({
-                    'CNPJ': cnpj,
-                    'EAN': ean,
-                    'DESCRICAO': desc.strip(),
-                    'QTDE': qtde,
-                    'PREÇO': preco if preco > 0 else None
-                })
-            except:
-                continue
-        return dados
-    
     def _extrair_linha_produto(self, linha: str, cnpj: str) -> dict | None:
-        """Extrai produto de uma linha TXT."""
+        """Extrai produto de uma linha TXT (EAN no início, descrição, quantidade e preço)."""
+        regex = self.LAYOUT.regex
+        
+        # Extrair EAN do início da linha (pode ser 13 ou 14 dígitos)
+        match_ean = regex['ean_inicio'].match(linha)
+        if not match_ean:
+            return None
+        
+        ean = match_ean.group(1)
+        linha_limpa = linha[match_ean.end():].strip()
+        
+        # Descrição, múltiplos espaços, quantidade inteira e preço com vírgula
+        match = regex['item'].match(linha_limpa) or regex['item_espacado'].search(linha_limpa)
+        if not match:
+            return None
+        
+        desc = match.group(1).strip()
+        qtde = int(match.group(2))
+        
         try:
-            import re
-            
-            # Extrair EAN do início da linha (pode ser 13 ou 14 dígitos)
-            match_ean = re.match(r'^(\d{13,14})\s+', linha)
-            if not match_ean:
-                return None
-            
-            ean = match_ean.group(1)
-            
-            # Remover o EAN da linha para prosseguir
-            linha_limpa = linha[match_ean.end():].strip()
-            
-            # A estrutura é: DESCRIÇÃO (texto), QUANTIDADE (número inteiro com múltiplos espaços), PREÇO (número decimal com vírgula)
-            # Procurar por: descrição, seguida por múltiplos espaços, número inteiro, espaços, número decimal com vírgula
-            pattern = r'^(.+?)\s{2,}(\d+)\s+([0-9,]+)'
-            match = re.match(pattern, linha_limpa)
-            
-            if not match:
-                # Tentar padrão alternativo com mais espaços
-                pattern = r'(.+?)\s{3,}(\d{1,3})\s+([0-9,]+)'
-                match = re.search(pattern, linha_limpa)
-                if not match:
-                    return None
-            
-            desc = match.group(1).strip()
-            qtde_str = match.group(2).strip()
-            preco_str = match.group(3).strip()
-            
-            try:
-                qtde = int(qtde_str)
-            except:
-                return None
-            
-            try:
-                preco = float(preco_str.replace(',', '.'))
-            except:
-                preco = 0.0
-            
-            if qtde <= 0 or not desc:
-                return None
-            
-            return {
-                'CNPJ': cnpj,
-                'EAN': ean,
-                'DESCRICAO': desc.strip(),
-                'QTDE': qtde,
-                'PREÇO': preco if preco > 0 else None
-            }
-        except Exception as e:
+            preco = float(match.group(3).replace(',', '.'))
+        except ValueError:
+            preco = 0.0
+        
+        if qtde <= 0 or not desc:
             return None
-    
-    def _buscar_coluna(self, colunas, nomes_possiveis: list) -> str | None:
-        """Busca coluna por nomes possíveis."""
-        colunas_lower = {col.lower().strip(): col for col in colunas}
-        for nome in nomes_possiveis:
-            nome_lower = nome.lower().strip()
-            if nome_lower in colunas_lower:
-                return colunas_lower[nome_lower]
-            for col_lower, col_real in colunas_lower.items():
-                if nome_lower in col_lower:
-                    return col_real
-        return None
+        
+        return self.LAYOUT.txt.item(cnpj, ean, desc, qtde, preco)
@@ -3,6 +3,9 @@
 from io import BytesIO
 import pandas as pd
 
+from src.config.settings import XLSX_STREAMING, XLSX_LINHAS_POR_BLOCO
+from .xlsx_stream import gerar_xlsx
+
 
 class ExcelGenerator:
     """Gera arquivos Excel a partir de DataFrames."""
@@ -26,6 +29,41 @@ class ExcelGenerator:
         buffer.seek(0)
         return buffer.getvalue()
 
+    @staticmethod
+    def generate_stream(dataframe: pd.DataFrame, linhas_por_bloco: int = XLSX_LINHAS_POR_BLOCO):
+        """
+        Gera o arquivo Excel em blocos, sem montar a planilha inteira em memória.
+
+        Com AGILIZA_XLSX_STREAMING=0 entrega o resultado de `generate` em um bloco só.
+
+        Args:
+            dataframe: DataFrame com os dados
+            linhas_por_bloco: Linhas escritas por bloco entregue
+
+        Returns:
+            Iterador de bytes do arquivo Excel (None se o DataFrame estiver vazio)
+        """
+        if dataframe is None or dataframe.empty:
+            return None
+
+        if not XLSX_STREAMING:
+            return iter([ExcelGenerator.generate(dataframe)])
+
+        return gerar_xlsx(dataframe, sheet_name='Pedido', linhas_por_bloco=linhas_por_bloco)
+
+    @staticmethod
+    def save(dataframe: pd.DataFrame, caminho: str):
+        """
+        Grava o arquivo Excel em disco bloco a bloco.
+
+        Args:
+            dataframe: DataFrame com os dados
+            caminho: Caminho do arquivo de saída
+        """
+        with open(caminho, 'wb') as f:
+            for bloco in ExcelGenerator.generate_stream(dataframe) or ():
+                f.write(bloco)
+
     @staticmethod
     def get_filename(dataframe: pd.DataFrame, original_filename: str) -> str:
         """
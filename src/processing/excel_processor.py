@@ -1,11 +1,20 @@
+import re
+import numpy as np
 import pandas as pd
 import unicodedata
-import openpyxl
-import xlrd
-from io import BytesIO
 from pathlib import Path
 from .base import FileProcessor
-from src.utils.validators import normalizar_preco, extract_multiplicador_fardos, map_columns
+from .documento import DocumentoCarregado
+from .workbook import Planilha
+from src.utils.validators import (
+    normalizar_preco,
+    normalizar_preco_serie,
+    extract_multiplicador_fardos_serie,
+    map_columns,
+)
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
 
 
 class ExcelProcessor(FileProcessor):
@@ -21,80 +30,87 @@ class ExcelProcessor(FileProcessor):
         - VILA NOVA: Estrutura limpa com headers definidos
         - VAREJINHO: Estrutura complexa com muitas colunas
         """
-        
-        print(f"\n[EXCEL PROCESSOR] Iniciando processamento de: {filename or 'arquivo sem nome'}")
-        print(f"[EXCEL PROCESSOR] Tamanho do arquivo: {len(file_content)} bytes")
+        with DocumentoCarregado(file_content, filename) as documento:
+            return self.processar_documento(documento)
+
+    def processar_documento(self, documento: DocumentoCarregado) -> pd.DataFrame:
+        """Processa a planilha do upload já carregado (pasta de trabalho aberta uma vez por documento)."""
+        filename = documento.nome
+        logger.info("[EXCEL PROCESSOR] Iniciando processamento de: %s", filename or 'arquivo sem nome')
+        logger.debug("[EXCEL PROCESSOR] Tamanho do arquivo: %s bytes", len(documento.conteudo))
         
         # ===== MÉTODO LEGADO (fallback) =====
-        print(f"[EXCEL PROCESSOR] Tentando método legado (pandas)...")
+        logger.debug("[EXCEL PROCESSOR] Tentando método legado (pandas)...")
         df = None
         
+        # Abre o arquivo uma única vez; todas as estratégias usam as mesmas grades de células
+        try:
+            planilha = documento.planilha()
+            logger.debug("[EXCEL PROCESSOR] OK Pasta de trabalho aberta com %s", planilha.engine)
+        except Exception as e:
+            logger.warning("[EXCEL PROCESSOR] WARN Não foi possível abrir a planilha: %s: %s", type(e).__name__, e)
+            planilha = None
+        
         # Detectar extensão a partir do filename ou do content
-        if not filename:
-            # Tentar com xlsx primeiro, depois xls
+        if planilha is None:
+            pass
+        elif not filename:
             try:
-                print(f"[EXCEL PROCESSOR] Tentando ler com openpyxl...")
-                df = pd.read_excel(BytesIO(file_content), engine='openpyxl')
-                print(f"[EXCEL PROCESSOR] OK Leitura com openpyxl: {df.shape}")
+                df = planilha.dataframe(header=0)
+                logger.debug("[EXCEL PROCESSOR] OK Leitura com %s: %s", planilha.engine, df.shape)
             except Exception as e:
-                print(f"[EXCEL PROCESSOR] WARN openpyxl falhou: {type(e).__name__}")
-                try:
-                    print(f"[EXCEL PROCESSOR] Tentando ler com xlrd...")
-                    df = pd.read_excel(BytesIO(file_content), engine='xlrd')
-                    print(f"[EXCEL PROCESSOR] OK Leitura com xlrd: {df.shape}")
-                except Exception as e2:
-                    print(f"[EXCEL PROCESSOR] WARN xlrd falhou: {type(e2).__name__}")
-                    df = None
+                logger.warning("[EXCEL PROCESSOR] WARN %s falhou: %s", planilha.engine, type(e).__name__)
+                df = None
         else:
             ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else 'xlsx'
-            print(f"[EXCEL PROCESSOR] Extensão detectada: .{ext}")
+            logger.debug("[EXCEL PROCESSOR] Extensão detectada: .%s", ext)
             
             if ext == 'xlsx':
                 try:
-                    print(f"[EXCEL PROCESSOR] Tentando ler XLSX com openpyxl...")
-                    df = pd.read_excel(BytesIO(file_content), engine='openpyxl')
-                    print(f"[EXCEL PROCESSOR] OK Leitura XLSX sucesso: {df.shape}")
+                    logger.debug("[EXCEL PROCESSOR] Tentando ler XLSX...")
+                    df = planilha.dataframe(header=0)
+                    logger.debug("[EXCEL PROCESSOR] OK Leitura XLSX sucesso: %s", df.shape)
                 except Exception as e:
-                    print(f"[EXCEL PROCESSOR] WARN openpyxl falhou: {type(e).__name__}: {e}")
+                    logger.warning("[EXCEL PROCESSOR] WARN leitura XLSX falhou: %s: %s", type(e).__name__, e)
                     df = None
             elif ext == 'xls':
                 # Para .xls, tentar ler TODAS as linhas para detectar múltiplas seções com CNPJ
                 try:
-                    print(f"[EXCEL PROCESSOR] Tentando _processar_xls_com_secoes...")
-                    df = self._processar_xls_com_secoes(BytesIO(file_content))
-                    print(f"[EXCEL PROCESSOR] OK Leitura XLS sucesso: {df.shape if df is not None else None}")
+                    logger.debug("[EXCEL PROCESSOR] Tentando _processar_xls_com_secoes...")
+                    df = self._processar_xls_com_secoes(planilha)
+                    logger.debug("[EXCEL PROCESSOR] OK Leitura XLS sucesso: %s", df.shape if df is not None else None)
                 except Exception as e:
                     # Se falhar, tenta ler como arquivo simples com múltiplos headers
-                    print(f"[EXCEL PROCESSOR] WARN _processar_xls_com_secoes falhou: {type(e).__name__}: {e}")
-                    print(f"[EXCEL PROCESSOR] Tentando _processar_xls_alternativo...")
+                    logger.warning("[EXCEL PROCESSOR] WARN _processar_xls_com_secoes falhou: %s: %s", type(e).__name__, e)
+                    logger.debug("[EXCEL PROCESSOR] Tentando _processar_xls_alternativo...")
                     try:
-                        df = self._processar_xls_alternativo(BytesIO(file_content))
-                        print(f"[EXCEL PROCESSOR] OK Leitura XLS (alternativo) sucesso: {df.shape if df is not None else None}")
+                        df = self._processar_xls_alternativo(planilha)
+                        logger.debug("[EXCEL PROCESSOR] OK Leitura XLS (alternativo) sucesso: %s", df.shape if df is not None else None)
                     except Exception as e2:
-                        print(f"[EXCEL PROCESSOR] WARN _processar_xls_alternativo falhou: {type(e2).__name__}: {e2}")
+                        logger.warning("[EXCEL PROCESSOR] WARN _processar_xls_alternativo falhou: %s: %s", type(e2).__name__, e2)
                         df = None
             else:
-                print(f"[EXCEL PROCESSOR] ERR Formato não suportado: {ext}")
+                logger.error("[EXCEL PROCESSOR] ERR Formato não suportado: %s", ext)
                 raise ValueError(f"Formato não suportado: {ext}")
         
         # Se não houver colunas relevantes, tentar detectar cabeçalho automaticamente
-        if df is None or df.empty or (hasattr(self, '_has_relevant_columns') and not self._has_relevant_columns(df)):
-            print(f"[EXCEL PROCESSOR] Tentando detecção automática de cabeçalho...")
+        if planilha is not None and (df is None or df.empty or not self._has_relevant_columns(df)):
+            logger.debug("[EXCEL PROCESSOR] Tentando detecção automática de cabeçalho...")
             try:
-                df = self._reler_com_cabecalho_detectado(file_content, filename)
+                df = self._reler_com_cabecalho_detectado(planilha)
                 if df is not None and not df.empty:
-                    print(f"[EXCEL PROCESSOR] OK Detecção automática sucesso: {df.shape}")
+                    logger.debug("[EXCEL PROCESSOR] OK Detecção automática sucesso: %s", df.shape)
                 else:
-                    print(f"[EXCEL PROCESSOR] WARN Detecção automática retornou DataFrame vazio")
+                    logger.warning("[EXCEL PROCESSOR] WARN Detecção automática retornou DataFrame vazio")
             except Exception as e:
-                print(f"[EXCEL PROCESSOR] WARN Detecção automática falhou: {type(e).__name__}: {e}")
+                logger.warning("[EXCEL PROCESSOR] WARN Detecção automática falhou: %s: %s", type(e).__name__, e)
         
         # Se ainda assim nenhum dataframe válido, retorna None
         if df is None or df.empty:
-            print(f"[EXCEL PROCESSOR] ERR ERRO: Não foi possível extrair dados do arquivo")
+            logger.error("[EXCEL PROCESSOR] ERR ERRO: Não foi possível extrair dados do arquivo")
             return None
         
-        print(f"[EXCEL PROCESSOR] OK DataFrame extraído: {df.shape[0]} linhas, {df.shape[1]} colunas")
+        logger.debug("[EXCEL PROCESSOR] OK DataFrame extraído: %s linhas, %s colunas", df.shape[0], df.shape[1])
 
         # Mapear colunas para padrão Agiliza
         df = self._normalize_columns(df)
@@ -137,67 +153,72 @@ class ExcelProcessor(FileProcessor):
         order = [col for col in order if col in df.columns]
         df = df[order]
         
+        df = self._normalizar_dados(df)
+        
+        # Colunas TOTAL removidas conforme requisição
+        can_compute_total = 'QTDE' in df.columns and 'PREÇO' in df.columns
+
+        if can_compute_total:
+            # Garantir que QTDE e PREÇO são numéricos
+            try:
+                df['QTDE'] = pd.to_numeric(df['QTDE'], errors='coerce').fillna(0).astype(int)
+                df['PREÇO'] = pd.to_numeric(df['PREÇO'], errors='coerce').fillna(0.0)
+            except Exception as e:
+                logger.warning("[WARN] Erro ao garantir tipos numéricos para QTDE/PREÇO: %s", e)
+        else:
+            # Sem preço, zera total se não existir
+            if not has_total:
+                df['TOTAL'] = 0.0
+        
+        # Reordenar colunas com TOTAL ao final
+        col_order = ['CNPJ', 'EAN', 'DESCRICAO', 'PRECO_UNITARIO', 'QUANTIDADE', 'TOTAL']
+        # Usar nomes reais das colunas (após normalização)
+        col_order_real = [col for col in ['CNPJ', 'EAN', 'DESCRICAO', 'PREÇO', 'QTDE', 'TOTAL'] if col in df.columns]
+        df = df[col_order_real]
+        
+        return df
+
+    def _normalizar_dados(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Normaliza CNPJ, EAN, QTDE, PREÇO e DESCRICAO e remove linhas inválidas.
+        Todas as etapas são operações de coluna (sem apply por linha).
+        """
         # Preenchimento de valores vazios
         # CODCLI fica em branco se não houver valor na coluna "Código"
         if 'CNPJ' in df.columns:
             df['CNPJ'] = df['CNPJ'].fillna('').astype(str)
         if 'EAN' in df.columns:
             # Converter EAN para string, removendo .0 de floats
-            df['EAN'] = df['EAN'].fillna('')
-            df['EAN'] = df['EAN'].apply(lambda x: str(int(x)) if isinstance(x, float) and x != '' else str(x))
+            df['EAN'] = self._ean_para_texto(df['EAN'])
         if 'QTDE' in df.columns:
             # Converter para número, usando 0 para valores inválidos
             try:
                 df['QTDE'] = pd.to_numeric(df['QTDE'], errors='coerce').fillna(0).astype(int)
             except Exception as e:
-                print(f"[WARN] Erro ao converter QTDE para int: {e}. Tentando conversão linha-a-linha...")
+                logger.warning("[WARN] Erro ao converter QTDE para int: %s. Tentando conversão linha-a-linha...", e)
                 df['QTDE'] = df['QTDE'].apply(lambda x: int(float(str(x).replace(',', '.'))) if pd.notna(x) and str(x).strip() != '' else 0)
         
-        # Procurar por coluna PREÇO (com ou sem acento)
-        preco_col = None
-        for col in df.columns:
-            if col.upper() == 'PREÇO' or col.upper() == 'PREÇO':
-                preco_col = col
-                break
-        
-        if preco_col:
-            # Converter PREÇO para float usando função normalizar_preco
-            if preco_col != 'PREÇO':
-                df = df.rename(columns={preco_col: 'PREÇO'})
+        if 'PREÇO' in df.columns:
+            # Converter PREÇO para float com as regras de normalizar_preco
             try:
-                df['PREÇO'] = df['PREÇO'].apply(normalizar_preco)
+                df['PREÇO'] = normalizar_preco_serie(df['PREÇO'])
             except Exception as e:
-                print(f"[WARN] Erro ao normalizar PREÇO: {e}. Tentando pd.to_numeric...")
+                logger.warning("[WARN] Erro ao normalizar PREÇO: %s. Tentando pd.to_numeric...", e)
                 df['PREÇO'] = pd.to_numeric(df['PREÇO'], errors='coerce').fillna(0.0)
         
-        # Aplicar multiplicador de fardos ANTES de limpar descrição
-        # Passo 1: Extrair multiplicadores e aplicar na quantidade
-        if 'DESCRICAO' in df.columns and 'QTDE' in df.columns:
-            def aplicar_fardos(row):
-                desc = row['DESCRICAO'] if 'DESCRICAO' in row.index else ''
-                qtde = row['QTDE'] if 'QTDE' in row.index else 0
-                
-                if pd.isna(desc) or desc == '':
-                    return int(qtde) if qtde else 0
-                
-                try:
-                    qtde = int(float(str(qtde).replace(',', '.'))) if qtde else 0
-                    _, multiplicador = extract_multiplicador_fardos(str(desc))
-                    return int(qtde * multiplicador)
-                except:
-                    return int(qtde) if qtde else 0
-            
-            df['QTDE'] = df.apply(aplicar_fardos, axis=1)
-        
-        # Passo 2: Limpar descrição removendo os multiplicadores
+        # Multiplicador de fardos: extraído uma vez por descrição, aplicado na
+        # quantidade e removido da descrição
         if 'DESCRICAO' in df.columns:
-            def limpar_descricao(desc):
-                if pd.isna(desc) or desc == '':
-                    return desc
-                desc_limpa, _ = extract_multiplicador_fardos(str(desc))
-                return desc_limpa.strip()
+            desc = df['DESCRICAO']
+            com_texto = desc.notna() & (desc != '')
+            desc_limpa, multiplicador = extract_multiplicador_fardos_serie(desc[com_texto].astype(str))
             
-            df['DESCRICAO'] = df['DESCRICAO'].fillna('').apply(limpar_descricao)
+            if 'QTDE' in df.columns:
+                df['QTDE'] = self._aplicar_fardos(df['QTDE'], multiplicador.reindex(df.index, fill_value=1))
+            
+            descricoes = pd.Series('', index=df.index)
+            descricoes[com_texto] = desc_limpa.str.strip()
+            df['DESCRICAO'] = descricoes
 
         # Filtrar linhas inválidas (cabeçalhos, linhas vazias, etc) após normalização
         df_antes_filtro = df.copy()
@@ -205,32 +226,40 @@ class ExcelProcessor(FileProcessor):
         
         # Se a filtragem deixou o DF vazio, e temos dados antes, tenta estratégia menos rigorosa
         if df.empty and not df_antes_filtro.empty:
-            print(f"[WARN] Filtragem eliminou todos os dados! Tentando sem filtro...")
+            logger.warning("[WARN] Filtragem eliminou todos os dados! Tentando sem filtro...")
             df = df_antes_filtro
         
-        # Colunas TOTAL removidas conforme requisição
-        can_compute_total = 'QTDE' in df.columns and 'PREÇO' in df.columns
-
-        if can_compute_total:
-            # Garantir que QTDE e PREÇO são numéricos
-            try:
-                df['QTDE'] = pd.to_numeric(df['QTDE'], errors='coerce').fillna(0).astype(int)
-                df['PREÇO'] = pd.to_numeric(df['PREÇO'], errors='coerce').fillna(0.0)
-            except Exception as e:
-                print(f"[WARN] Erro ao garantir tipos numéricos para QTDE/PREÇO: {e}")
-        else:
-            # Sem preço, zera total se não existir
-            if not has_total:
-                df['TOTAL'] = 0.0
-        
-        # Reordenar colunas com TOTAL ao final
-        col_order = ['CNPJ', 'EAN', 'DESCRICAO', 'PRECO_UNITARIO', 'QUANTIDADE', 'TOTAL']
-        # Usar nomes reais das colunas (após normalização)
-        col_order_real = [col for col in ['CNPJ', 'EAN', 'DESCRICAO', 'PREÇO', 'QTDE', 'TOTAL'] if col in df.columns]
-        df = df[col_order_real]
-        
         return df
-
+    
+    @staticmethod
+    def _ean_para_texto(ean: pd.Series) -> pd.Series:
+        """EAN como texto: floats viram inteiros ('7891234567890.0' -> '7891234567890'), vazios viram ''."""
+        kind = ean.dtype.kind
+        if kind == 'f':
+            nulos = ean.isna()
+            valores = ean[~nulos]
+            if np.isfinite(valores).all() and (valores.abs() < 2 ** 63).all():
+                texto = pd.Series('', index=ean.index)
+                texto[~nulos] = valores.astype('int64').astype(str)
+                return texto
+        elif kind in 'iu':
+            return ean.astype(str)
+        elif pd.api.types.infer_dtype(ean, skipna=True) in ('string', 'empty'):
+            return ean.fillna('').astype(str)
+        
+        # Tipos misturados (ex: números e textos na mesma coluna): elemento a elemento
+        return ean.fillna('').apply(lambda x: str(int(x)) if isinstance(x, float) and x != '' else str(x))
+    
+    @staticmethod
+    def _aplicar_fardos(qtde: pd.Series, multiplicador: pd.Series) -> pd.Series:
+        """QTDE x multiplicador de fardos (inteiros)."""
+        qtde = qtde.astype('int64')
+        maior = int(qtde.abs().max()) * int(multiplicador.max()) if len(qtde) else 0
+        if maior < 2 ** 63 and multiplicador.dtype != object:
+            return qtde * multiplicador
+        # Produto não cabe em int64: inteiros do Python
+        return pd.Series([int(q) * int(m) for q, m in zip(qtde, multiplicador)], index=qtde.index)
+    
     def _process_universal_parsed(self, df: pd.DataFrame, metadados: dict, filename: str = None) -> pd.DataFrame:
         """
         Processa DataFrame já parseado pelo UniversalExcelParser
@@ -254,7 +283,7 @@ class ExcelProcessor(FileProcessor):
             try:
                 df['QTDE'] = pd.to_numeric(df['QTDE'], errors='coerce').fillna(0).astype(int)
             except Exception as e:
-                print(f"[WARN] Erro ao converter QTDE: {e}. Tentando aplicação linha-a-linha...")
+                logger.warning("[WARN] Erro ao converter QTDE: %s. Tentando aplicação linha-a-linha...", e)
                 df['QTDE'] = df['QTDE'].apply(lambda x: int(float(str(x).replace(',', '.'))) if pd.notna(x) and str(x).strip() != '' else 0)
         else:
             df['QTDE'] = 0
@@ -265,7 +294,7 @@ class ExcelProcessor(FileProcessor):
             try:
                 df['PREÇO'] = df['PREÇO'].apply(normalizar_preco)
             except Exception as e:
-                print(f"[WARN] Erro ao converter PREÇO: {e}. Tentando conversão numérica...")
+                logger.warning("[WARN] Erro ao converter PREÇO: %s. Tentando conversão numérica...", e)
                 df['PREÇO'] = pd.to_numeric(df['PREÇO'], errors='coerce').fillna(0.0)
         elif 'CUSTO_UNITARIO' in df.columns:
             try:
@@ -299,7 +328,7 @@ class ExcelProcessor(FileProcessor):
             try:
                 df['TOTAL'] = (df['QTDE'] * df['PREÇO']).round(2)
             except Exception as e:
-                print(f"[WARN] Erro ao calcular TOTAL em _process_universal_parsed: {e}")
+                logger.warning("[WARN] Erro ao calcular TOTAL em _process_universal_parsed: %s", e)
                 df['TOTAL'] = 0.0
         else:
             df['TOTAL'] = 0.0
@@ -331,19 +360,11 @@ class ExcelProcessor(FileProcessor):
         
         return df
 
-    def _reler_com_cabecalho_detectado(self, file_content: bytes | BytesIO, filename: str | None) -> pd.DataFrame:
+    def _reler_com_cabecalho_detectado(self, planilha: Planilha) -> pd.DataFrame:
         """Tenta reler a planilha detectando automaticamente a linha de cabeçalho.
         Procura uma linha que contenha palavras-chave como 'ean', 'barras', 'produto', 'qtde', 'quantidade'.
         """
-        # Escolher engine por extensão
-        ext = None
-        if filename and '.' in filename:
-            ext = filename.rsplit('.', 1)[1].lower()
-
-        engine = 'openpyxl' if ext == 'xlsx' or ext is None else 'xlrd'
-        buffer = file_content if isinstance(file_content, BytesIO) else BytesIO(file_content)
-
-        df_raw = pd.read_excel(buffer, engine=engine, header=None)
+        df_raw = planilha.dataframe(header=None)
         if df_raw is None or df_raw.empty:
             return df_raw
 
@@ -374,18 +395,18 @@ class ExcelProcessor(FileProcessor):
         Mapeia colunas do Excel para o padrão Agiliza usando fuzzy matching.
         Suporta múltiplos formatos de nomes de colunas.
         """
-        print(f"[EXCEL PROCESSOR] Colunas originais: {list(df.columns)}")
+        logger.debug("[EXCEL PROCESSOR] Colunas originais: %s", list(df.columns))
         
         # Usar o novo mapeamento fuzzy
         mapping = map_columns(df)
         
-        print(f"[EXCEL PROCESSOR] Mapeamento fuzzy detectado: {mapping}")
+        logger.debug("[EXCEL PROCESSOR] Mapeamento fuzzy detectado: %s", mapping)
         
         # Renomear colunas de acordo com mapeamento
         if mapping:
             df = df.rename(columns=mapping)
         
-        print(f"[EXCEL PROCESSOR] Colunas após mapeamento: {list(df.columns)}")
+        logger.debug("[EXCEL PROCESSOR] Colunas após mapeamento: %s", list(df.columns))
         return df
     
     def _has_relevant_columns(self, df: pd.DataFrame) -> bool:
@@ -403,11 +424,11 @@ class ExcelProcessor(FileProcessor):
         
         return False
     
-    def _extrair_cnpj_cabecalho(self, file_content: BytesIO, header_row: int) -> str:
+    def _extrair_cnpj_cabecalho(self, planilha: Planilha, header_row: int) -> str:
         """Extrai CNPJ do cabeçalho do arquivo (linhas anteriores ao header)"""
         try:
             # Ler linhas antes do header
-            df_raw = pd.read_excel(file_content, engine='xlrd', header=None)
+            df_raw = planilha.dataframe(header=None)
             
             # Procurar por CNPJ válido nas primeiras linhas (antes do header_row)
             # Verificar linha por linha
@@ -428,7 +449,7 @@ class ExcelProcessor(FileProcessor):
         """Detecta se arquivo tem múltiplos CNPJs em seções e preenche automaticamente"""
         try:
             # Ler arquivo bruto para detectar padrão de seções
-            df_raw = pd.read_excel(file_content, engine='xlrd', header=None)
+            df_raw = planilha.dataframe(header=None)
             
             # Procurar por CNPJs válidos no arquivo
             cnpjs_encontrados = {}  # {row_index: cnpj}
@@ -478,7 +499,7 @@ class ExcelProcessor(FileProcessor):
         except:
             return None
     
-    def _processar_xls_com_secoes(self, file_content: BytesIO) -> pd.DataFrame:
+    def _processar_xls_com_secoes(self, planilha: Planilha) -> pd.DataFrame:
         """
         Processa arquivo .xls que contém múltiplas seções com CNPJs diferentes
         Estrutura esperada:
@@ -490,11 +511,10 @@ class ExcelProcessor(FileProcessor):
         dfs_por_cnpj = []
         
         try:
-            # Ler todas as linhas do arquivo
-            import xlrd
-            file_content.seek(0)
-            book = xlrd.open_workbook(file_contents=file_content.getvalue())
-            sheet = book.sheet_by_index(0)
+            # Ler todas as linhas do arquivo (valores crus do xlrd, sem conversão do pandas)
+            if planilha.engine != 'xlrd':
+                raise ValueError(f"Arquivo não é .xls (lido com {planilha.engine})")
+            sheet = planilha.book.sheet_by_index(0)
             
             # Identificar linhas de CNPJ (começam com número de 11-15 dígitos)
             cnpj_sections = []
@@ -565,44 +585,46 @@ class ExcelProcessor(FileProcessor):
                 return df_result
             else:
                 # Fallback: ler como arquivo normal
-                return pd.read_excel(file_content, engine='xlrd', header=2)
+                return planilha.dataframe(header=2)
         
         except Exception as e:
             # Se algo deu errado, tentar ler como arquivo normal
-            try:
-                return pd.read_excel(file_content, engine='xlrd', header=2)
-            except:
-                raise ValueError(f"Erro ao processar arquivo .xls: {str(e)}")
+            if planilha.engine == 'xlrd':
+                try:
+                    return planilha.dataframe(header=2)
+                except:
+                    pass
+            raise ValueError(f"Erro ao processar arquivo .xls: {str(e)}")
     
-    def _processar_xls_alternativo(self, file_content: BytesIO) -> pd.DataFrame:
+    def _processar_xls_alternativo(self, planilha: Planilha) -> pd.DataFrame:
         """
         Alternativa robusta para processar .xls com múltiplas seções ou estruturas diferentes.
-        Tenta múltiplas estratégias de leitura.
+        Lê a planilha sem cabeçalho e detecta a linha de cabeçalho automaticamente.
         """
         try:
-            file_content.seek(0)
-            
-            # Estratégia 1: Tentar com openpyxl (mais robusto para alguns arquivos)
-            try:
-                df = pd.read_excel(file_content, engine='openpyxl', header=None)
-                if df is not None and not df.empty:
-                    return self._reler_com_cabecalho_detectado(file_content.getvalue(), None)
-            except:
-                pass
-            
-            # Estratégia 2: Ler com xlrd sem tratamento especial de seções
-            file_content.seek(0)
-            df = pd.read_excel(file_content, engine='xlrd', header=None)
+            df = planilha.dataframe(header=None)
             
             if df is None or df.empty:
                 return None
             
             # Detectar cabeçalho automaticamente
-            return self._reler_com_cabecalho_detectado(file_content.getvalue(), None)
+            return self._reler_com_cabecalho_detectado(planilha)
             
         except Exception as e:
             return None
     
+    # Palavras que indicam linha de cabeçalho na coluna de descrição
+    _HEADER_KEYWORDS = [
+        'produto', 'descrição', 'descricao', 'desc',
+        'qtde', 'quantidade', 'código', 'codigos', 'codigo',
+        'barras', 'código de barras',
+        'preço', 'preco', 'valor', 'valor unitário',
+        'total', 'subtotal', 'desconto', 'frete',
+        'ean', 'ean13', 'cód', 'cod', 'ref',
+        'unidade', 'embalagem', 'fabricante'
+    ]
+    _HEADER_KEYWORDS_RE = re.compile('|'.join(re.escape(kw) for kw in _HEADER_KEYWORDS))
+    
     def _filtrar_linhas_validas(self, df: pd.DataFrame, strict: bool = True) -> pd.DataFrame:
         """Remove linhas que são cabeçalhos ou não têm dados válidos"""
         if df is None or df.empty:
@@ -615,73 +637,68 @@ class ExcelProcessor(FileProcessor):
             df_filtrado = df.dropna(how='all').reset_index(drop=True)
             return df_filtrado
         
-        # Função para verificar se EAN é válido
-        def ean_valido(ean):
-            if pd.isna(ean) or ean == '' or ean == 0:
-                return False
-            ean_str = str(ean).strip().replace('.', '').replace('-', '')
-            # EAN deve ter 13 ou 14 dígitos
-            return len(ean_str) in [13, 14] and ean_str.isdigit()
-        
-        # Função para verificar se a linha tem dados válidos
-        def linha_tem_dados(row):
-            # CRITÉRIO PRINCIPAL: Se tem EAN válido, sempre manter
-            if 'EAN' in df.columns:
-                try:
-                    if ean_valido(row['EAN']):
-                        return True
-                except:
-                    pass
-            
-            # CRITÉRIO SECUNDÁRIO: Se tem DESCRICAO com conteúdo válido e não é cabeçalho
-            if 'DESCRICAO' in df.columns:
-                try:
-                    desc = str(row['DESCRICAO']).strip().lower()
-                    # Rejeitar se for claramente um cabeçalho
-                    header_keywords = [
-                        'produto', 'descrição', 'descricao', 'desc',
-                        'qtde', 'quantidade', 'código', 'codigos', 'codigo',
-                        'barras', 'código de barras',
-                        'preço', 'preco', 'valor', 'valor unitário',
-                        'total', 'subtotal', 'desconto', 'frete',
-                        'ean', 'ean13', 'cód', 'cod', 'ref',
-                        'unidade', 'embalagem', 'fabricante'
-                    ]
-                    
-                    # Se contém MAIS de 2 palavras-chave de cabeçalho, é cabeçalho
-                    matches = sum(1 for kw in header_keywords if kw in desc)
-                    if matches >= 2 or desc in ['', 'nan', 'none']:
-                        return False
-                    
-                    # Se tem descrição não-vazia de tamanho razoável, pode ser válido
-                    if desc and len(desc) > 2:
-                        return True
-                except:
-                    pass
-            
-            # CRITÉRIO TERCIÁRIO: Qualquer linha com QTDE válida ou PREÇO válido é mantida
-            has_valid_qtde = False
-            has_valid_preco = False
-            
-            if 'QTDE' in df.columns:
-                try:
-                    qtde = row['QTDE']
-                    if pd.notna(qtde) and isinstance(qtde, (int, float)) and qtde > 0:
-                        has_valid_qtde = True
-                except:
-                    pass
+        # Linha é mantida se tem EAN válido; senão, se a descrição não é cabeçalho e
+        # tem mais de 2 caracteres; senão, se QTDE ou PREÇO é número positivo.
+        # Descrição com cara de cabeçalho descarta a linha (sem olhar QTDE/PREÇO)
+        manter = pd.Series(False, index=df.index)
+        decidido = pd.Series(False, index=df.index)
+        
+        # CRITÉRIO PRINCIPAL: Se tem EAN válido, sempre manter
+        if 'EAN' in df.columns:
+            ean_ok = self._mascara_ean_valido(df['EAN'])
+            manter |= ean_ok
+            decidido |= ean_ok
+        
+        # CRITÉRIO SECUNDÁRIO: Se tem DESCRICAO com conteúdo válido e não é cabeçalho
+        if 'DESCRICAO' in df.columns:
+            pendentes = df.index[~decidido]
+            desc = df.loc[pendentes, 'DESCRICAO'].astype(str).fillna('nan').str.strip().str.lower()
             
-            if 'PREÇO' in df.columns:
-                try:
-                    preco = row['PREÇO']
-                    if pd.notna(preco) and isinstance(preco, (int, float)) and preco > 0:
-                        has_valid_preco = True
-                except:
-                    pass
+            # Se contém 2 ou mais palavras-chave de cabeçalho, é cabeçalho (a contagem
+            # só é feita nas descrições com ao menos uma palavra-chave)
+            matches = pd.Series(0, index=desc.index)
+            alguma = desc.str.contains(self._HEADER_KEYWORDS_RE)
+            if alguma.any():
+                suspeitas = desc[alguma]
+                matches[alguma] = sum(suspeitas.str.contains(kw, regex=False).astype(int) for kw in self._HEADER_KEYWORDS)
+            cabecalho = (matches >= 2) | desc.isin(['', 'nan', 'none'])
             
-            return has_valid_qtde or has_valid_preco
+            # Se tem descrição não-vazia de tamanho razoável, pode ser válido
+            desc_ok = ~cabecalho & (desc.str.len() > 2)
+            manter[pendentes] |= desc_ok
+            decidido[pendentes] |= cabecalho | desc_ok
+        
+        # CRITÉRIO TERCIÁRIO: Qualquer linha com QTDE válida ou PREÇO válido é mantida
+        terciario = pd.Series(False, index=df.index)
+        for col in ['QTDE', 'PREÇO']:
+            if col in df.columns:
+                terciario |= self._mascara_numero_positivo(df[col])
+        manter |= ~decidido & terciario
         
         # Filtrar linhas que têm dados válidos
-        df_filtrado = df[df.apply(linha_tem_dados, axis=1)].reset_index(drop=True)
+        df_filtrado = df[manter].reset_index(drop=True)
         
         return df_filtrado
+    
+    @staticmethod
+    def _mascara_ean_valido(ean: pd.Series) -> pd.Series:
+        """EAN com 13 ou 14 dígitos (ignorando '.' e '-'); vazio/0/NaN é inválido."""
+        vazio = ean.isna()
+        if ean.dtype.kind in 'O' or pd.api.types.is_string_dtype(ean):
+            vazio |= (ean == '')
+            if ean.dtype.kind == 'O':
+                vazio |= (ean == 0)
+        else:
+            vazio |= (ean == 0)
+        texto = ean.astype(str).str.strip().str.replace('.', '', regex=False).str.replace('-', '', regex=False)
+        return (~vazio & texto.str.len().isin([13, 14]) & texto.str.isdigit()).fillna(False).astype(bool)
+    
+    @staticmethod
+    def _mascara_numero_positivo(valores: pd.Series) -> pd.Series:
+        """Valores numéricos (int/float) maiores que zero."""
+        kind = valores.dtype.kind
+        if kind in 'iuf':
+            return valores > 0
+        if kind == 'b':
+            return valores.astype(bool)
+        return valores.map(lambda v: isinstance(v, (int, float)) and pd.notna(v) and v > 0).astype(bool)
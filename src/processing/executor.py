@@ -0,0 +1,219 @@
+"""Executor dos processadores fora do event loop.
+
+Parsers leves (TXT) rodam em um thread pool e os CPU-bound (PDF, OCR e
+planilhas) em um process pool. Cada tipo de processador tem um limite de execuções
+simultâneas e a profundidade das filas pode ser consultada via `status()`.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from src.config.settings import (
+    EXECUTOR_MAX_THREADS,
+    EXECUTOR_MAX_PROCESSOS,
+    EXECUTOR_LIMITE_POR_PROCESSADOR,
+    EXTENSOES_PROCESS_POOL,
+    REGEX_ESTATISTICAS,
+)
+from src.utils import patterns
+from src.utils.metricas import metricas
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+# Instâncias por thread/processo: os processadores guardam estado em self
+# durante o process() (ex: TXTProcessor.is_winthor), então não são compartilhadas
+_local = threading.local()
+
+
+def _obter_instancia(processor_type: str):
+    """Retorna a instância do processador da thread/processo atual."""
+    instancias = getattr(_local, 'instancias', None)
+    if instancias is None:
+        instancias = _local.instancias = {}
+
+    if processor_type not in instancias:
+        from src.processing.factory import get_processor
+        instancias[processor_type] = get_processor(processor_type)
+
+    return instancias[processor_type]
+
+
+def executar_processadores(tipos: list[str], file_content: bytes,
+                           filename: str) -> list[tuple[str, pd.DataFrame | None, bool]]:
+    """
+    Executa os processadores em ordem sobre um único DocumentoCarregado, até
+    um deles extrair dados (chamado dentro do pool).
+
+    O genérico que segue um especializado sem resultado reaproveita o PDF,
+    a pasta de trabalho ou o texto já lidos em vez de reabrir os bytes.
+
+    Returns:
+        Lista (tipo, dataframe, falhou) dos processadores executados, na ordem.
+        `falhou` é o status do processador (FileProcessor.falhou): ele não
+        conseguiu processar (ex: OCR indisponível) em vez de só não encontrar dados
+    """
+    from src.processing.documento import DocumentoCarregado
+
+    resultados = []
+    with DocumentoCarregado(file_content, filename) as documento:
+        for tipo in tipos:
+            if resultados:
+                logger.warning("[ROTEAMENTO] ⚠ %s não extraiu dados, tentando %s "
+                               "com o documento já carregado...", resultados[-1][0], tipo)
+            processor = _obter_instancia(tipo)
+            if processor is None:
+                raise ValueError(f"Processador desconhecido: {tipo}")
+            # Páginas de PDF e chamadas de OCR medidas lá dentro levam os rótulos do processador
+            processor.falhou = False
+            with metricas.contexto(processador=tipo, extensao=documento.ext or ''):
+                with metricas.medir('agiliza_etapa_segundos', etapa='fallback' if resultados else 'parse'):
+                    dataframe = processor.processar_documento(documento)
+            resultados.append((tipo, dataframe, processor.falhou))
+            if dataframe is not None and not dataframe.empty:
+                break
+    return resultados
+
+
+def executar_com_estatisticas(funcao, *args) -> tuple:
+    """Executa a função no worker e devolve também os contadores de regex e as métricas dele."""
+    return funcao(*args), patterns.coletar_estatisticas(), metricas.coletar()
+
+
+class ProcessorExecutor:
+    """Despacha chamadas de processadores para thread pool ou process pool."""
+
+    def __init__(self, max_threads: int = EXECUTOR_MAX_THREADS,
+                 max_processos: int = EXECUTOR_MAX_PROCESSOS,
+                 limite_por_processador: int = EXECUTOR_LIMITE_POR_PROCESSADOR):
+        self.max_threads = max_threads
+        self.max_processos = max_processos
+        self.limite_por_processador = limite_por_processador
+
+        self._thread_pool = None
+        self._process_pool = None
+        self._lock = threading.Lock()
+
+        # Semáforos e contadores por tipo de processador
+        self._semaforos = {}
+        self._aguardando = {}
+        self._executando = {}
+
+    @staticmethod
+    def usa_processos(file_ext: str | None) -> bool:
+        """Indica se a extensão é CPU-bound (PDF/imagem/planilha) e deve ir para processos."""
+        return (file_ext or '').lower() in EXTENSOES_PROCESS_POOL
+
+    def _obter_pool(self, usa_processos: bool):
+        """Cria os pools sob demanda."""
+        with self._lock:
+            if usa_processos:
+                if self._process_pool is None:
+                    self._process_pool = ProcessPoolExecutor(max_workers=self.max_processos)
+                return self._process_pool
+
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.max_threads,
+                    thread_name_prefix='processador'
+                )
+            return self._thread_pool
+
+    def _descartar_process_pool(self):
+        """Descarta um process pool quebrado (ex: worker morto por falta de memória)."""
+        with self._lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
+
+    def _semaforo(self, processor_type: str) -> asyncio.Semaphore:
+        if processor_type not in self._semaforos:
+            self._semaforos[processor_type] = asyncio.Semaphore(self.limite_por_processador)
+        return self._semaforos[processor_type]
+
+    @staticmethod
+    def _ajustar(contadores: dict, processor_type: str, delta: int):
+        contadores[processor_type] = contadores.get(processor_type, 0) + delta
+
+    async def executar_em_sequencia(self, tipos: list[str], file_content: bytes, filename: str,
+                                    file_ext: str | None = None) -> list[tuple[str, pd.DataFrame | None, bool]]:
+        """
+        Executa os processadores em ordem, em uma única chamada ao pool, até um extrair dados.
+
+        Ver `executar_processadores`. A fila e o limite usados são os do primeiro tipo,
+        e o pool (threads ou processos) é escolhido pela extensão.
+
+        Returns:
+            Lista (tipo, dataframe, falhou) dos processadores executados
+        """
+        if file_ext is None and filename and '.' in filename:
+            file_ext = filename.rsplit('.', 1)[1]
+
+        processor_type = tipos[0]
+        semaforo = self._semaforo(processor_type)
+
+        self._ajustar(self._aguardando, processor_type, 1)
+        inicio = time.perf_counter()
+        try:
+            await semaforo.acquire()
+        finally:
+            self._ajustar(self._aguardando, processor_type, -1)
+        metricas.observar('agiliza_etapa_segundos', time.perf_counter() - inicio,
+                          etapa='fila', processador=processor_type, extensao=(file_ext or '').lower())
+
+        self._ajustar(self._executando, processor_type, 1)
+        try:
+            usa_processos = self.usa_processos(file_ext)
+            pool = self._obter_pool(usa_processos)
+            loop = asyncio.get_running_loop()
+            try:
+                if usa_processos and (REGEX_ESTATISTICAS or metricas.ativo):
+                    # Contadores e métricas do worker voltam com o resultado e somam aos deste processo
+                    resultado, contadores, observacoes = await loop.run_in_executor(
+                        pool, executar_com_estatisticas, executar_processadores, tipos, file_content, filename
+                    )
+                    patterns.mesclar_estatisticas(contadores)
+                    metricas.mesclar(observacoes)
+                    return resultado
+                return await loop.run_in_executor(pool, executar_processadores, tipos, file_content, filename)
+            except BrokenProcessPool:
+                self._descartar_process_pool()
+                raise RuntimeError(f"Worker de processamento encerrado inesperadamente ({processor_type})")
+        finally:
+            self._ajustar(self._executando, processor_type, -1)
+            semaforo.release()
+
+    def status(self) -> dict:
+        """Retorna limites configurados e profundidade da fila por processador."""
+        tipos = sorted(set(self._aguardando) | set(self._executando))
+        return {
+            'max_threads': self.max_threads,
+            'max_processos': self.max_processos,
+            'limite_por_processador': self.limite_por_processador,
+            'processadores': {
+                tipo: {
+                    'aguardando': self._aguardando.get(tipo, 0),
+                    'executando': self._executando.get(tipo, 0),
+                }
+                for tipo in tipos
+            },
+        }
+
+    def encerrar(self):
+        """Encerra os pools (chamado no shutdown da aplicação)."""
+        with self._lock:
+            if self._thread_pool is not None:
+                self._thread_pool.shutdown(wait=False, cancel_futures=True)
+                self._thread_pool = None
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
+
+
+# Executor compartilhado pelas rotas (um por worker uvicorn)
+processor_executor = ProcessorExecutor()
@@ -0,0 +1,111 @@
+"""Formatos de saída do resultado combinado (xlsx, csv, parquet, ndjson).
+
+Cada formato gera o arquivo em blocos de linhas, para ser enviado pela
+StreamingResponse à medida que é produzido: CSV e NDJSON são texto por linha
+e dispensam todo o trabalho de ZIP/XML do .xlsx; o Parquet grava um row group
+por bloco (pyarrow, listado em requirements.txt; sem ele o formato é recusado).
+"""
+
+import importlib.util
+
+import pandas as pd
+
+from src.config.settings import XLSX_LINHAS_POR_BLOCO
+from .excel_generator import ExcelGenerator
+from .xlsx_stream import SaidaEmBlocos
+
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+
+def _blocos(dataframe: pd.DataFrame, linhas_por_bloco: int):
+    for inicio in range(0, len(dataframe), linhas_por_bloco):
+        yield inicio, dataframe.iloc[inicio:inicio + linhas_por_bloco]
+
+
+def gerar_excel(dataframe: pd.DataFrame, linhas_por_bloco: int = XLSX_LINHAS_POR_BLOCO):
+    """Planilha .xlsx (aba 'Pedido'), a saída padrão do /api/upload."""
+    yield from ExcelGenerator.generate_stream(dataframe, linhas_por_bloco) or ()
+
+
+def gerar_csv(dataframe: pd.DataFrame, linhas_por_bloco: int = XLSX_LINHAS_POR_BLOCO):
+    """CSV em UTF-8 separado por vírgula, com cabeçalho; NaN sai vazio."""
+    if dataframe.empty:
+        yield dataframe.to_csv(index=False).encode('utf-8')
+        return
+    for inicio, bloco in _blocos(dataframe, linhas_por_bloco):
+        yield bloco.to_csv(index=False, header=inicio == 0).encode('utf-8')
+
+
+def gerar_ndjson(dataframe: pd.DataFrame, linhas_por_bloco: int = XLSX_LINHAS_POR_BLOCO):
+    """Um objeto JSON por linha (colunas como chaves); NaN sai como null."""
+    for _, bloco in _blocos(dataframe, linhas_por_bloco):
+        texto = bloco.to_json(orient='records', lines=True, force_ascii=False)
+        if not texto.endswith('\n'):
+            texto += '\n'
+        yield texto.encode('utf-8')
+
+
+def gerar_parquet(dataframe: pd.DataFrame, linhas_por_bloco: int = XLSX_LINHAS_POR_BLOCO):
+    """Parquet com um row group por bloco de linhas."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Esquema do DataFrame inteiro: um bloco só com NaN não pode mudar o tipo da coluna
+    schema = pa.Schema.from_pandas(dataframe, preserve_index=False)
+    saida = SaidaEmBlocos()
+    with pq.ParquetWriter(saida, schema) as writer:
+        for _, bloco in _blocos(dataframe, linhas_por_bloco):
+            writer.write_table(pa.Table.from_pandas(bloco, schema=schema, preserve_index=False))
+            yield saida.retirar()
+    yield saida.retirar()
+
+
+FORMATOS_SAIDA = {
+    'xlsx': {
+        'extensao': 'xlsx',
+        'media_type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'gerar': gerar_excel,
+    },
+    'csv': {
+        'extensao': 'csv',
+        'media_type': 'text/csv',
+        'gerar': gerar_csv,
+    },
+    'ndjson': {
+        'extensao': 'ndjson',
+        'media_type': 'application/x-ndjson',
+        'gerar': gerar_ndjson,
+    },
+    'parquet': {
+        'extensao': 'parquet',
+        'media_type': 'application/vnd.apache.parquet',
+        'gerar': gerar_parquet,
+    },
+}
+
+
+def formato_saida(nome: str | None) -> dict:
+    """
+    Configuração do formato de saída pedido.
+
+    Args:
+        nome: xlsx, csv, parquet ou ndjson (None/vazio = xlsx)
+
+    Returns:
+        Dicionário com extensao, media_type e gerar
+
+    Raises:
+        ValueError: Formato desconhecido ou sem a dependência instalada
+    """
+    nome = (nome or 'xlsx').strip().lower()
+    if nome not in FORMATOS_SAIDA:
+        raise ValueError(f"Formato de saída inválido: {nome} (use {', '.join(FORMATOS_SAIDA)})")
+    if nome == 'parquet' and not PYARROW_AVAILABLE:
+        raise ValueError("Formato parquet indisponível: instale o pacote pyarrow")
+    return FORMATOS_SAIDA[nome]
+
+
+def gerar_saida(dataframe: pd.DataFrame, nome: str | None = 'xlsx',
+                linhas_por_bloco: int = XLSX_LINHAS_POR_BLOCO):
+    """Bytes do resultado no formato pedido, em blocos."""
+    return formato_saida(nome)['gerar'](dataframe, linhas_por_bloco)
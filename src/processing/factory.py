@@ -1,45 +1,51 @@
 """Factory para selecionar e instanciar processadores."""
 
+import importlib
+
 from .base import FileProcessor
-from .biomaxfarma_processor import BioMaxFarmaProcessor
-from .cotefacil_processor import CotefacilProcessor
-from .crescer_processor import CrescerProcessor
-from .dsgfarma_processor import DSGFarmaProcessor
-from .oceanica_processor import OceanicaProcessor
-from .kimberly_processor import KimberlyProcessor
-from .loreal_processor import LorealProcessor
-from .natusfarma_processor import NatusFarmaProcessor
-from .poupaminas_processor import PoupaminasProcessor
-from .prudence_processor import PrudenceProcessor
-from .unilever_processor import UnileverProcessor
-from .siage_processor import SiageProcessor
-from .labotrat_processor import LabotratProcessor
-from .pdf_processor import PDFProcessor
-from .txt_processor import TXTProcessor
-from .excel_processor import ExcelProcessor
-from .image_processor import ImageProcessor
+from .layout_engine import layouts_sem_processador
 
 
+# Nome -> 'módulo:Classe'. Os módulos só são importados no primeiro uso, então
+# subir a API não carrega pdfplumber/openpyxl/EasyOCR até chegar um arquivo
 PROCESSOR_CLASSES = {
-    'biomaxfarma': BioMaxFarmaProcessor,
-    'cotefacil': CotefacilProcessor,
-    'crescer': CrescerProcessor,
-    'dsgfarma': DSGFarmaProcessor,
-    'oceanica': OceanicaProcessor,
-    'kimberly': KimberlyProcessor,
-    'loreal': LorealProcessor,
-    'natusfarma': NatusFarmaProcessor,
-    'poupaminas': PoupaminasProcessor,
-    'prudence': PrudenceProcessor,
-    'unilever': UnileverProcessor,
-    'siage': SiageProcessor,
-    'labotrat': LabotratProcessor,
-    'pdf': PDFProcessor,
-    'txt': TXTProcessor,
-    'excel': ExcelProcessor,
-    'image': ImageProcessor,
+    'crescer': '.crescer_processor:CrescerProcessor',
+    'dsgfarma': '.dsgfarma_processor:DSGFarmaProcessor',
+    'poupaminas': '.poupaminas_processor:PoupaminasProcessor',
+    'prudence': '.prudence_processor:PrudenceProcessor',
+    'labotrat': '.labotrat_processor:LabotratProcessor',
+    'pdf': '.pdf_processor:PDFProcessor',
+    'txt': '.txt_processor:TXTProcessor',
+    'excel': '.excel_processor:ExcelProcessor',
+    'image': '.image_processor:ImageProcessor',
 }
 
+# Fornecedores descritos só por especificação (layouts/*.json): o LayoutProcessor
+# ligado ao layout de mesmo nome ('módulo:Classe:layout')
+for _layout in layouts_sem_processador():
+    PROCESSOR_CLASSES.setdefault(_layout, f'.layout_processor:LayoutProcessor:{_layout}')
+
+# Classes já importadas
+_classes_carregadas = {}
+
+
+def _importar_classe(caminho: str) -> type[FileProcessor]:
+    """Importa 'módulo:Classe' (ou 'módulo:Classe:layout') relativo a este pacote."""
+    modulo, classe, *layout = caminho.split(':')
+    processor_class = getattr(importlib.import_module(modulo, __package__), classe)
+    return processor_class.para_layout(layout[0]) if layout else processor_class
+
+
+def get_processor_class(processor_name: str) -> type[FileProcessor] | None:
+    """Obtém a classe do processador pelo nome (sem instanciar), importando o módulo no primeiro uso."""
+    nome = processor_name.lower()
+    if nome not in _classes_carregadas:
+        caminho = PROCESSOR_CLASSES.get(nome)
+        if caminho is None:
+            return None
+        _classes_carregadas[nome] = _importar_classe(caminho)
+    return _classes_carregadas[nome]
+
 
 def get_processor(processor_name: str) -> FileProcessor | None:
     """
@@ -51,7 +57,7 @@ def get_processor(processor_name: str) -> FileProcessor | None:
     Returns:
         Instância do processador ou None se não encontrado
     """
-    processor_class = PROCESSOR_CLASSES.get(processor_name.lower())
+    processor_class = get_processor_class(processor_name)
     if processor_class:
         return processor_class()
     return None
@@ -1,6 +1,8 @@
 """Processador de arquivos de Imagem (JPG, PNG, BMP)."""
 
+import importlib.util
 import re
+import time
 from io import BytesIO
 import pandas as pd
 from PIL import Image
@@ -10,14 +12,37 @@ try:
 except ImportError:
     TESSERACT_AVAILABLE = False
 
-try:
-    import easyocr
-    EASYOCR_AVAILABLE = True
-except ImportError:
-    EASYOCR_AVAILABLE = False
+# Só verifica se o EasyOCR está instalado; o import (que carrega torch) fica
+# para o primeiro uso do reader local em _get_reader
+EASYOCR_AVAILABLE = importlib.util.find_spec('easyocr') is not None
 
 from src.processing.base import FileProcessor
+from src.processing.ocr_service import cliente_ocr
+from src.utils.metricas import metricas
 from src.utils.validators import extract_cnpj, is_valid_cnpj, extract_ean13, normalizar_preco, extract_multiplicador_fardos, extract_numero_pedido
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+
+class ResultadoOCR:
+    """Resultado de uma única passada de OCR, reaproveitado por todas as estratégias.
+    
+    Cada item é (bbox, texto, confiança), no formato do EasyOCR. Quando o
+    texto veio do Tesseract não há posições, apenas o texto completo.
+    """
+    
+    def __init__(self, itens: list | None = None, texto: str | None = None, origem: str = ''):
+        self.itens = itens or []
+        self.origem = origem
+        # Mesmo texto que readtext(detail=0) produziria: um item por linha
+        self.texto = texto if texto is not None else '\n'.join(item[1] for item in self.itens)
+        self.linhas = self.texto.split('\n')
+    
+    @property
+    def tem_posicoes(self) -> bool:
+        """Indica se há caixas com coordenadas (EasyOCR)."""
+        return bool(self.itens)
 
 
 class ImageProcessor(FileProcessor):
@@ -33,12 +58,12 @@ class ImageProcessor(FileProcessor):
         
         if cls._reader is None:
             try:
-                print("Inicializando EasyOCR (primeira vez)...")
+                logger.debug("Inicializando EasyOCR (primeira vez)...")
                 import easyocr
                 cls._reader = easyocr.Reader(['pt', 'en'], gpu=False)
-                print("EasyOCR inicializado com sucesso!")
+                logger.debug("EasyOCR inicializado com sucesso!")
             except Exception as e:
-                print(f"Erro ao inicializar EasyOCR: {e}")
+                logger.error("Erro ao inicializar EasyOCR: %s", e)
                 return None
         
         return cls._reader
@@ -48,7 +73,8 @@ class ImageProcessor(FileProcessor):
         try:
             return self._extract_data(file_content)
         except Exception as e:
-            print(f"Erro ao processar imagem: {e}")
+            logger.error("Erro ao processar imagem: %s", e)
+            self.falhou = True
             return None
 
     def _extract_data(self, file_content: bytes) -> pd.DataFrame | None:
@@ -56,50 +82,47 @@ class ImageProcessor(FileProcessor):
         try:
             # Abre imagem
             image = Image.open(BytesIO(file_content))
-            print(f"Imagem aberta: {image.size} pixels, modo {image.mode}")
+            logger.debug("Imagem aberta: %s pixels, modo %s", image.size, image.mode)
             
-            # Tenta extrair com análise de posição (novo método)
-            df = self._extrair_com_posicoes(image)
-            if df is not None and not df.empty:
-                print(f"✓ Sucesso! Extraído com análise de posição: {len(df)} produtos")
-                return df
+            # Uma única passada de OCR alimenta todas as estratégias
+            ocr = self._executar_ocr(image, file_content)
             
-            print("ℹ️ Método com posições retornou vazio, tentando método fallback...")
+            # Tenta extrair com análise de posição (novo método)
+            if ocr.tem_posicoes:
+                df = self._extrair_com_posicoes(ocr)
+                if df is not None and not df.empty:
+                    logger.debug("✓ Sucesso! Extraído com análise de posição: %s produtos", len(df))
+                    return df
+                
+                logger.debug("ℹ️ Método com posições retornou vazio, tentando método fallback...")
             
-            # Fallback: extrai texto simples
-            texto = self._extrair_texto_ocr(image)
+            # Fallback: usa o texto do mesmo resultado de OCR
+            texto = ocr.texto
             
-            print(f"Texto extraído ({len(texto)} caracteres):")
-            if len(texto) > 500:
-                print(f"'{texto[:500]}...'")
-            else:
-                print(f"'{texto}'")
+            logger.debug("Texto extraído (%s caracteres):\n'%s%s'",
+                         len(texto), texto[:500], '...' if len(texto) > 500 else '')
             
             if not texto or texto.strip() == '':
-                print("\n❌ ERRO: Nenhum texto foi extraído da imagem!")
-                print("\nPossíveis causas:")
-                print("  1. A imagem não contém texto legível")
-                print("  2. A imagem está muito pequena (< 200x200 pixels)")
-                print("  3. A imagem tem muito pouco contraste")
-                print("  4. OCR não conseguiu processar (EasyOCR ou Tesseract indisponível)")
+                logger.warning("❌ ERRO: Nenhum texto foi extraído da imagem! Possíveis causas: "
+                               "texto ilegível, imagem muito pequena (< 200x200 pixels), pouco contraste "
+                               "ou OCR indisponível (EasyOCR/Tesseract)")
                 return None
             
             # Processa o texto extraído similar ao TXT
-            resultado = self._processar_texto(texto)
+            resultado = self._processar_texto(ocr)
             
             if resultado is None or resultado.empty:
-                print("\n❌ ERRO: Texto extraído mas nenhum produto foi identificado!")
-                print("Nenhum EAN válido foi encontrado na imagem.")
+                logger.warning("❌ ERRO: Texto extraído mas nenhum produto foi identificado! "
+                               "Nenhum EAN válido foi encontrado na imagem.")
             
             return resultado
             
         except Exception as e:
-            print(f"\n❌ ERRO ao extrair OCR: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ ERRO ao extrair OCR: %s", e)
+            self.falhou = True
             return None
 
-    def _extrair_com_posicoes(self, image: Image.Image) -> pd.DataFrame | None:
+    def _extrair_com_posicoes(self, ocr: ResultadoOCR) -> pd.DataFrame | None:
         """Extrai dados analisando posições X,Y do OCR (método novo).
         
         LAYOUT ESPERADO:
@@ -110,18 +133,12 @@ class ImageProcessor(FileProcessor):
         - Coluna EAN (X ≈ 1080-1206): EAN (13 dígitos)
         """
         try:
-            reader = self._get_reader()
-            if not reader:
-                return None
-            
-            import numpy as np
-            img_array = np.array(image)
-            results = reader.readtext(img_array, detail=2)
+            results = ocr.itens
             
             if not results:
                 return None
             
-            print("\n[METODO COM POSICOES] Analisando layout da imagem...")
+            logger.debug("[METODO COM POSICOES] Analisando layout da imagem...")
             
             # Agrupar por linhas visuais (Y)
             y_grupos = {}
@@ -175,7 +192,7 @@ class ImageProcessor(FileProcessor):
                         break
             
             if cnpj_extraido:
-                print(f"   CNPJ encontrado: {cnpj_extraido}")
+                logger.debug("   CNPJ encontrado: %s", cnpj_extraido)
             
             # Processa cada linha visual - procura por EAN
             dados = []
@@ -194,7 +211,7 @@ class ImageProcessor(FileProcessor):
                 if not ean_item:
                     continue  # Linha sem EAN, pula
                 
-                print(f"\n  [OK] Linha Y={y_linha}: EAN {ean_item['texto']} encontrado")
+                logger.debug("  [OK] Linha Y=%s: EAN %s encontrado", y_linha, ean_item['texto'])
                 
                 # Procura pelos campos nesta MESMA linha
                 desc_item = None
@@ -245,24 +262,24 @@ class ImageProcessor(FileProcessor):
                     preco_str = preco_item['texto'].replace(',', '.')
                     try:
                         preco_unit = float(preco_str)
-                        print(f"     Preco: R$ {preco_unit:.2f}")
+                        logger.debug("     Preco: R$ %.2f", preco_unit)
                     except ValueError:
                         pass
                 
                 if qtd_item:
                     try:
                         qtd = int(qtd_item['texto'])
-                        print(f"     Quantidade: {qtd}")
+                        logger.debug("     Quantidade: %s", qtd)
                     except ValueError:
                         pass
                 
                 if descricao:
-                    print(f"     Descricao: {descricao}")
+                    logger.debug("     Descricao: %s", descricao)
                 
                 # Valida: precisa ter descrição e preço
                 if descricao and preco_unit > 0:
                     valor_total = preco_unit * qtd
-                    print(f"     [VALIDO] QTD={qtd}, PRECO=R${preco_unit:.2f}, TOTAL=R${valor_total:.2f}")
+                    logger.debug("     [VALIDO] QTD=%s, PRECO=R$%.2f, TOTAL=R$%.2f", qtd, preco_unit, valor_total)
                     
                     dados.append({
                         'CNPJ': cnpj_extraido,
@@ -273,74 +290,98 @@ class ImageProcessor(FileProcessor):
                         'VALOR_TOTAL': valor_total
                     })
                 else:
-                    print(f"     [SKIP] DESC='{descricao}', PRECO={preco_unit}")
+                    logger.debug("     [SKIP] DESC='%s', PRECO=%s", descricao, preco_unit)
             
             if dados:
-                print(f"\n[OK] Extração com posições: {len(dados)} produtos!")
+                logger.debug("[OK] Extração com posições: %s produtos!", len(dados))
                 return pd.DataFrame(dados)
             
             return None
             
         except Exception as e:
-            print(f"Erro na extração com posições: {e}")
+            logger.error("Erro na extração com posições: %s", e)
+            self.falhou = True
             return None
 
-    def _extrair_texto_ocr(self, image: Image.Image) -> str:
-        """Extrai texto da imagem via OCR."""
-        # Tenta EasyOCR primeiro (mais fácil de instalar)
-        reader = self._get_reader()
-        if reader:
-            try:
-                # Converte PIL Image para array numpy
-                import numpy as np
-                img_array = np.array(image)
-                
-                # EasyOCR
-                results = reader.readtext(img_array, detail=0)
-                texto = '\n'.join(results)
-                
-                if texto and texto.strip():
-                    print(f"Texto extraído via EasyOCR ({len(texto)} caracteres)")
-                    return texto
-            except Exception as e:
-                print(f"EasyOCR falhou: {e}")
+    def _executar_ocr(self, image: Image.Image, file_content: bytes) -> ResultadoOCR:
+        """Executa o OCR uma única vez (EasyOCR com posições, ou Tesseract como fallback)."""
+        # Serviço de OCR com modelo já carregado; sem ele, usa o reader local
+        inicio = time.perf_counter()
+        itens = cliente_ocr.reconhecer(file_content)
+        origem = 'servico'
+        if itens is None:
+            inicio = time.perf_counter()
+            itens = self._ocr_local(image)
+            origem = 'easyocr'
+        if itens is not None:
+            # Só conta a chamada que de fato rodou o OCR (serviço fora do ar devolve None na hora)
+            metricas.observar('agiliza_ocr_segundos', time.perf_counter() - inicio, origem=origem)
+        
+        if itens:
+            ocr = ResultadoOCR(itens=itens, origem=origem)
+            if ocr.texto and ocr.texto.strip():
+                logger.debug("Texto extraído via EasyOCR (%s caracteres)", len(ocr.texto))
+                return ocr
         
         # Se EasyOCR não funcionar, tenta Pytesseract
+        ocr_rodou = itens is not None
         if TESSERACT_AVAILABLE:
             try:
-                texto = pytesseract.image_to_string(image, lang='por')
+                with metricas.medir('agiliza_ocr_segundos', origem='tesseract'):
+                    texto = pytesseract.image_to_string(image, lang='por')
+                ocr_rodou = True
                 if texto and texto.strip():
-                    print(f"Texto extraído via Pytesseract ({len(texto)} caracteres)")
-                    return texto
+                    logger.debug("Texto extraído via Pytesseract (%s caracteres)", len(texto))
+                    return ResultadoOCR(texto=texto, origem='tesseract')
             except Exception as e:
-                print(f"Pytesseract falhou: {e}")
-        
-        # Se nada funcionar, retorna vazio
-        print("Aviso: Nenhum OCR disponível. Instale: pip install easyocr")
-        return ""
+                logger.warning("Pytesseract falhou: %s", e)
+        
+        # Se nada funcionar, retorna vazio. Sem nenhum OCR é falha (não "sem dados"),
+        # para o resultado vazio não ir para o cache (ver FileProcessor.falhou)
+        if not ocr_rodou:
+            logger.error("Nenhum OCR disponível. Instale: pip install easyocr")
+            self.falhou = True
+        return ResultadoOCR(texto='')
+
+    def _ocr_local(self, image: Image.Image) -> list | None:
+        """Executa o EasyOCR neste processo (quando o serviço de OCR não está no ar)."""
+        reader = self._get_reader()
+        if not reader:
+            return None
+        try:
+            # Converte PIL Image para array numpy
+            import numpy as np
+            img_array = np.array(image)
+            
+            # EasyOCR com caixas e confiança (detail=1)
+            return reader.readtext(img_array, detail=1)
+        except Exception as e:
+            logger.warning("EasyOCR falhou: %s", e)
+            return None
 
-    def _processar_texto(self, texto: str) -> pd.DataFrame | None:
+    def _processar_texto(self, ocr: ResultadoOCR) -> pd.DataFrame | None:
         """Processa o texto extraído e cria DataFrame."""
-        linhas = texto.split('\n')
+        texto = ocr.texto
+        linhas = ocr.linhas
         
         # Tenta extrair número do pedido de todo o texto
         numero_pedido_global = extract_numero_pedido(texto)
         if numero_pedido_global:
-            print(f"[IMAGE PROCESSOR] Número do Pedido detectado: {numero_pedido_global}")
+            logger.debug("[IMAGE PROCESSOR] Número do Pedido detectado: %s", numero_pedido_global)
         
         # Detecta e tenta processar como TABELA estruturada (novo formato)
-        df = self._extrair_tabela_nota_fiscal(linhas)
+        df = self._extrair_tabela_nota_fiscal(ocr)
         if df is not None and not df.empty:
-            print(f"OK! Extraido como tabela de nota fiscal: {len(df)} produtos")
+            logger.debug("OK! Extraido como tabela de nota fiscal: %s produtos", len(df))
             return df
         
         # Tenta extrair como tabela estruturada primeiro (NOVO: combina múltiplas linhas)
-        df = self._extrair_tabela_combinada(linhas)
+        df = self._extrair_tabela_combinada(ocr)
         if df is not None and not df.empty:
             return df
         
         # Tenta abordagem anterior (tabela estruturada simples)
-        df = self._extrair_tabela_estruturada(linhas)
+        df = self._extrair_tabela_estruturada(ocr)
         if df is not None and not df.empty:
             return df
         
@@ -388,7 +429,7 @@ class ImageProcessor(FileProcessor):
         
         return self._criar_dataframe(produtos_por_pedido)
 
-    def _extrair_tabela_nota_fiscal(self, linhas: list) -> pd.DataFrame | None:
+    def _extrair_tabela_nota_fiscal(self, ocr: ResultadoOCR) -> pd.DataFrame | None:
         """Extrai dados de tabela de nota fiscal/recibo estruturada.
         
         LAYOUT:
@@ -401,6 +442,7 @@ class ImageProcessor(FileProcessor):
         
         TOTAL.....: VALOR
         """
+        linhas = ocr.linhas
         
         # Procura pela linha de cabeçalho da tabela
         tabela_inicio = -1
@@ -412,7 +454,7 @@ class ImageProcessor(FileProcessor):
         if tabela_inicio < 0:
             return None  # Não é tabela de nota fiscal
         
-        print(f"\n[TABELA NOTA FISCAL] Cabeçalho encontrado na linha {tabela_inicio}")
+        logger.debug("[TABELA NOTA FISCAL] Cabeçalho encontrado na linha %s", tabela_inicio)
         
         # Extrair CNPJ do cabeçalho
         cnpj_extraido = ''
@@ -420,7 +462,7 @@ class ImageProcessor(FileProcessor):
             cnpj_match = extract_cnpj(linhas[idx])
             if cnpj_match:
                 cnpj_extraido = cnpj_match
-                print(f"   CNPJ: {cnpj_extraido}")
+                logger.debug("   CNPJ: %s", cnpj_extraido)
                 break
         
         # Processar linhas de produtos
@@ -504,7 +546,7 @@ class ImageProcessor(FileProcessor):
             if not descricao or preco <= 0:
                 continue
             
-            print(f"  EAN {ean}: '{descricao[:50]}' QTD={qtde} P=R${preco:.2f}")
+            logger.debug("  EAN %s: '%s' QTD=%s P=R$%.2f", ean, descricao[:50], qtde, preco)
             
             valor_total = preco * qtde
             
@@ -518,10 +560,12 @@ class ImageProcessor(FileProcessor):
             })
         
         if dados:
-            print(f"[OK] {len(dados)} produtos extraídos da tabela!")
+            logger.debug("[OK] %s produtos extraídos da tabela!", len(dados))
             return pd.DataFrame(dados)
         
         return None
+
+    def _extrair_tabela_combinada(self, ocr: ResultadoOCR) -> pd.DataFrame | None:
         """Extrai tabelas onde EAN e descrição podem estar em linhas diferentes.
         
         ESTRUTURA ESPERADA (Imagem com tabela de pedidos):
@@ -538,11 +582,12 @@ class ImageProcessor(FileProcessor):
           2. Preço: primeira linha com decimal (X,YY ou X.YY)
           3. Quantidade: número inteiro (1-9999) entre preço e EAN
         """
+        linhas = ocr.linhas
         dados = []
-        cnpj_extraido = extract_cnpj('\n'.join(linhas))
+        cnpj_extraido = extract_cnpj(ocr.texto)
         
-        print(f"[METODO COMBINADO] Procurando EANs em {len(linhas)} linhas...")
-        print(f"   CNPJ encontrado: {cnpj_extraido}")
+        logger.debug("[METODO COMBINADO] Procurando EANs em %s linhas...", len(linhas))
+        logger.debug("   CNPJ encontrado: %s", cnpj_extraido)
         
         i = 0
         while i < len(linhas):
@@ -552,7 +597,7 @@ class ImageProcessor(FileProcessor):
             ean = extract_ean13(linha)
             
             if ean:
-                print(f"  [OK] Linha {i}: EAN {ean} encontrado")
+                logger.debug("  [OK] Linha %s: EAN %s encontrado", i, ean)
                 
                 descricao = ''
                 qtd = 1
@@ -578,7 +623,7 @@ class ImageProcessor(FileProcessor):
                             if 1 <= qtd_temp <= 9999 and len(numeros_puros[0]) != 13:
                                 qtd = qtd_temp
                                 qtd_encontrada = True
-                                print(f"     Quantidade (linha {j}): {qtd}")
+                                logger.debug("     Quantidade (linha %s): %s", j, qtd)
                                 continue
                     
                     # PRECO: número com decimal (X,YY ou X.YY), EXATAMENTE com 2 casas decimais
@@ -592,7 +637,7 @@ class ImageProcessor(FileProcessor):
                                 if 0.1 <= preco_temp <= 999999:
                                     preco_unit = preco_temp
                                     preco_encontrado = True
-                                    print(f"     Preco (linha {j}): R$ {preco_unit:.2f}")
+                                    logger.debug("     Preco (linha %s): R$ %.2f", j, preco_unit)
                             except ValueError:
                                 pass
                     
@@ -609,7 +654,7 @@ class ImageProcessor(FileProcessor):
                             
                             descricao = prev_line
                             desc_encontrada = True
-                            print(f"     Descricao (linha {j}): {descricao}")
+                            logger.debug("     Descricao (linha %s): %s", j, descricao)
                 
                 # Calcula valor total
                 valor_total = preco_unit * qtd if preco_unit > 0 else 0
@@ -617,8 +662,8 @@ class ImageProcessor(FileProcessor):
                 # Valida: se temos descrição e EAN, adiciona (quantidade e preço são opcionais)
                 # Mas PRECO é mandatório para marcar como válido
                 if descricao and preco_unit > 0:
-                    print(f"     [VALIDO] DESC='{descricao}', QTD={qtd}, PRECO=R${preco_unit:.2f}, TOTAL=R${valor_total:.2f}")
-                    print()
+                    logger.debug("     [VALIDO] DESC='%s', QTD=%s, PRECO=R$%.2f, TOTAL=R$%.2f",
+                                 descricao, qtd, preco_unit, valor_total)
                     
                     dados.append({
                         'CNPJ': cnpj_extraido or '',
@@ -630,31 +675,29 @@ class ImageProcessor(FileProcessor):
                     })
                 elif descricao:
                     # Tem descrição mas sem preço - pode ser caso especial
-                    print(f"     [PARCIAL] Tem descricao mas sem preco: DESC='{descricao}'")
-                    print()
+                    logger.debug("     [PARCIAL] Tem descricao mas sem preco: DESC='%s'", descricao)
                 else:
-                    print(f"     [INVALIDO] Faltam dados: DESC='{descricao}', PRECO={preco_unit}")
-                    print()
+                    logger.debug("     [INVALIDO] Faltam dados: DESC='%s', PRECO=%s", descricao, preco_unit)
             
             i += 1
         
         if dados:
-            print(f"[OK] METODO COMBINADO: {len(dados)} produtos encontrados!")
+            logger.debug("[OK] METODO COMBINADO: %s produtos encontrados!", len(dados))
             return pd.DataFrame(dados)
         
         return None
 
-    def _extrair_tabela_estruturada(self, linhas: list) -> pd.DataFrame | None:
+    def _extrair_tabela_estruturada(self, ocr: ResultadoOCR) -> pd.DataFrame | None:
         """Extrai dados de tabelas estruturadas (como memos de distribuição BAHM)."""
+        linhas = ocr.linhas
         dados = []
         cnpj_extraido = ''
-        print(f"🔍 Procurando tabelas estruturadas em {len(linhas)} linhas...")
+        logger.debug("🔍 Procurando tabelas estruturadas em %s linhas...", len(linhas))
         
         # Primeiro, tenta extrair CNPJ da imagem inteira
-        texto_completo = '\n'.join(linhas)
-        cnpj_extraido = extract_cnpj(texto_completo)
+        cnpj_extraido = extract_cnpj(ocr.texto)
         if cnpj_extraido:
-            print(f"  ✅ CNPJ encontrado: {cnpj_extraido}")
+            logger.debug("  ✅ CNPJ encontrado: %s", cnpj_extraido)
         
         for i, linha in enumerate(linhas):
             linha_original = linha
@@ -666,27 +709,27 @@ class ImageProcessor(FileProcessor):
             ean = extract_ean13(linha)
             
             if ean:
-                print(f"  ✅ Linha {i}: Encontrado EAN {ean}")
-                print(f"     Linha original: '{linha_original}'")
+                logger.debug("  ✅ Linha %s: Encontrado EAN %s", i, ean)
+                logger.debug("     Linha original: '%s'", linha_original)
                 
                 # Extrai quantidade e descrição para essa estrutura
-                descricao, qtd = self._extrair_desc_qtd_bahm(linha, ean)
+                descricao, qtd, preco = self._extrair_desc_qtd_preco_bahm(linha, ean)
                 
-                print(f"     Descrição: '{descricao}'")
-                print(f"     Quantidade: {qtd}")
+                logger.debug("     Descrição: '%s'", descricao)
+                logger.debug("     Quantidade: %s", qtd)
                 
                 dados.append({
                     'CNPJ': cnpj_extraido,
                     'EAN': ean,
                     'DESCRICAO': descricao,
                     'QTDE': qtd,
-                    'PREÇO': 0
+                    'PREÇO': preco
                 })
         
         if dados:
-            print(f"✅ Tabela estruturada: {len(dados)} produtos encontrados!")
+            logger.debug("✅ Tabela estruturada: %s produtos encontrados!", len(dados))
         else:
-            print(f"❌ Nenhuma tabela estruturada encontrada")
+            logger.debug("❌ Nenhuma tabela estruturada encontrada")
         
         return pd.DataFrame(dados) if dados else None
     
@@ -758,7 +801,7 @@ class ImageProcessor(FileProcessor):
                 
                 if idx_fabricante >= 0:
                     fabricante_palavras = partes[idx_fabricante:ultimo_maiuscula_idx + 1]
-                    print(f"     [DESCARTADO] Fabricante: {' '.join(fabricante_palavras)}")
+                    logger.debug("     [DESCARTADO] Fabricante: %s", ' '.join(fabricante_palavras))
             
             # Coleta DESCRIÇÃO
             if idx_fabricante > 0:
@@ -778,7 +821,7 @@ class ImageProcessor(FileProcessor):
             if palavras_desc_filtradas:
                 descricao = ' '.join(palavras_desc_filtradas).strip()[:150]
             
-            print(f"     Descricao: '{descricao}'")
+            logger.debug("     Descricao: '%s'", descricao)
             
             # Extrai PREÇO
             preco = 0.0
@@ -791,7 +834,7 @@ class ImageProcessor(FileProcessor):
                         try:
                             preco_str = p.replace(',', '.')
                             preco = float(preco_str)
-                            print(f"     Valor Un.: R$ {preco:.2f}")
+                            logger.debug("     Valor Un.: R$ %.2f", preco)
                             break
                         except ValueError:
                             continue
@@ -806,7 +849,7 @@ class ImageProcessor(FileProcessor):
             # Limpa parênteses e caracteres especiais
             descricao = linha.replace('(un)', '').replace('[un)', '').replace('[unj', '').strip()
             descricao = ' '.join(descricao.split())[:150]
-            print(f"     [DESC pura] '{descricao}'")
+            logger.debug("     [DESC pura] '%s'", descricao)
             return descricao, 1, 0.0
     
     @staticmethod
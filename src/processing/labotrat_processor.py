@@ -1,48 +1,67 @@
 """Processador especializado para Labotrat."""
 
+import logging
+
 import pandas as pd
-import re
-from io import BytesIO
 from .base import FileProcessor
+from .documento import DocumentoCarregado
+from .layout_engine import valores_das_linhas
+from src.utils.patterns import LABOTRAT_ABA_VENDA, LABOTRAT_CNPJ
 from src.utils.validators import extract_cnpj, extract_ean13, normalizar_preco
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
 
 
 class LabotratProcessor(FileProcessor):
     """Processa pedidos Labotrat."""
     
+    # 2: aba escolhida pelo nome ("TABELA VENDA <versão>", a mais recente)
+    VERSION = '2'
+    
     def process(self, file_content: bytes, filename: str = None) -> pd.DataFrame:
         """Processa arquivo Labotrat e extrai dados estruturados."""
-        print(f"\n[LABOTRAT] Processando: {filename or 'arquivo'}")
+        with DocumentoCarregado(file_content, filename) as documento:
+            return self.processar_documento(documento)
+    
+    def processar_documento(self, documento: DocumentoCarregado) -> pd.DataFrame:
+        """Processa o upload já carregado (apenas Excel)."""
+        logger.info("[LABOTRAT] Processando: %s", documento.nome or 'arquivo')
         
         try:
-            ext = filename.rsplit('.', 1)[1].lower() if filename and '.' in filename else 'xlsx'
+            ext = documento.ext or 'xlsx'
             
             if ext in ['xlsx', 'xls']:
-                return self._processar_excel(file_content, ext)
+                return self._processar_excel(documento, ext)
             else:
-                print(f"[LABOTRAT] Formato não suportado: {ext}")
+                logger.warning("[LABOTRAT] Formato não suportado: %s", ext)
                 return None
                 
         except Exception as e:
-            print(f"[LABOTRAT] ERRO: {type(e).__name__}: {str(e)}")
+            logger.error("[LABOTRAT] ERRO: %s: %s", type(e).__name__, str(e))
+            self.falhou = True
             return None
     
-    def _processar_excel(self, file_content: bytes, ext: str) -> pd.DataFrame | None:
-        """Processa arquivo Excel Labotrat - tenta múltiplas abas."""
+    def _processar_excel(self, documento: DocumentoCarregado, ext: str) -> pd.DataFrame | None:
+        """Processa arquivo Excel Labotrat - lê só a aba do pedido (ou a primeira)."""
         try:
             engine = 'openpyxl' if ext == 'xlsx' else 'xlrd'
+            planilha = documento.planilha(engine)
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[LABOTRAT] Abas: %s", ', '.join(
+                    f"'{nome}' ({linhas}x{colunas})" for nome, linhas, colunas in planilha.indice
+                ))
             
-            # Tentar abas em ordem de preferência
-            sheet_names_priority = [
-                'TABELA VENDA 2025.2',  # Formato completo (andradas, buenos aires, etc)
-                'Tabela Venda',         # Variante
-                0                        # Aba padrão
-            ]
+            # Abas "TABELA VENDA <versão>" (a mais recente primeiro), depois a primeira aba
+            abas = sorted(planilha.abas_por_nome(LABOTRAT_ABA_VENDA), key=self._versao_aba, reverse=True)
+            if planilha.abas and planilha.abas[0] not in abas:
+                abas.append(planilha.abas[0])
             
-            for sheet_to_try in sheet_names_priority:
+            for aba in abas:
                 try:
                     # Ler sem headers para processar a estrutura custom
-                    df = pd.read_excel(BytesIO(file_content), engine=engine, sheet_name=sheet_to_try, header=None)
+                    df = planilha.dataframe(aba, header=None)
                     
                     if df.empty:
                         continue
@@ -52,23 +71,37 @@ class LabotratProcessor(FileProcessor):
                         return result
                     
                 except Exception as e:
-                    # Se a aba não existe, tenta a próxima
-                    if 'not found' not in str(e).lower() and 'does not exist' not in str(e).lower():
-                        print(f"[LABOTRAT] Aviso ao ler aba '{sheet_to_try}': {e}")
+                    logger.warning("[LABOTRAT] Aviso ao ler aba '%s': %s", aba, e)
                     continue
             
-            print("[LABOTRAT] Nenhuma aba válida encontrada")
+            logger.warning("[LABOTRAT] Nenhuma aba válida encontrada")
             return None
             
         except Exception as e:
-            print(f"[LABOTRAT] ERRO ao processar Excel: {e}")
+            logger.error("[LABOTRAT] ERRO ao processar Excel: %s", e)
+            self.falhou = True
             return None
     
+    @staticmethod
+    def _versao_aba(nome: str) -> tuple:
+        """Versão da tabela no nome da aba ('TABELA VENDA 2026.1' -> (2026, 1)); () se não houver."""
+        match = LABOTRAT_ABA_VENDA.fullmatch(nome.strip())
+        if not match or not match.group(1):
+            return ()
+        return tuple(int(parte) for parte in match.group(1).split('.'))
+    
+    @staticmethod
+    def _coluna(df: pd.DataFrame, posicao: int, inicio: int) -> list:
+        """Valores da coluna `posicao` a partir da linha `inicio` (None se a coluna não existe)."""
+        if posicao >= len(df.columns):
+            return [None] * max(len(df) - inicio, 0)
+        return valores_das_linhas(df, posicao).tolist()[inicio:]
+    
     def _extrair_dados(self, df: pd.DataFrame) -> pd.DataFrame | None:
         """Extrai dados do DataFrame Labotrat - detecta formato automaticamente."""
         try:
             if df.empty:
-                print("[LABOTRAT] DataFrame vazio")
+                logger.debug("[LABOTRAT] DataFrame vazio")
                 return None
             
             # Detectar formato baseado no número de colunas
@@ -76,18 +109,19 @@ class LabotratProcessor(FileProcessor):
             
             if num_cols == 2:
                 # Formato SIMPLES: Código do Produto | Quantidade
-                print(f"[LABOTRAT] Detectado formato SIMPLES (2 colunas)")
+                logger.debug("[LABOTRAT] Detectado formato SIMPLES (2 colunas)")
                 return self._processar_formato_simples(df)
             elif num_cols >= 10:
                 # Formato COMPLETO: estrutura complexa com CNPJ, descrição, preço, etc
-                print(f"[LABOTRAT] Detectado formato COMPLETO ({num_cols} colunas)")
+                logger.debug("[LABOTRAT] Detectado formato COMPLETO (%s colunas)", num_cols)
                 return self._processar_formato_completo(df)
             else:
-                print(f"[LABOTRAT] Formato desconhecido: {num_cols} colunas")
+                logger.debug("[LABOTRAT] Formato desconhecido: %s colunas", num_cols)
                 return None
         
         except Exception as e:
-            print(f"[LABOTRAT] ERRO ao extrair dados: {e}")
+            logger.error("[LABOTRAT] ERRO ao extrair dados: %s", e)
+            self.falhou = True
             return None
     
     def _processar_formato_simples(self, df: pd.DataFrame) -> pd.DataFrame | None:
@@ -99,21 +133,22 @@ class LabotratProcessor(FileProcessor):
             dados = []
             
             # Header geralmente está na linha 0
-            header_idx = 0
             data_start_idx = 1
             
+            # Colunas 0 (Código do Produto) e 1 (Quantidade) inteiras, a partir dos dados
+            codigos = self._coluna(df, 0, data_start_idx)
+            quantidades = self._coluna(df, 1, data_start_idx)
+            
             # Processar todas as linhas de dados
-            for idx in range(data_start_idx, len(df)):
+            for idx, codigo_valor, qtde_valor in zip(range(data_start_idx, len(df)), codigos, quantidades):
                 try:
-                    row = df.iloc[idx]
-                    
                     # Coluna 0: Código do Produto
-                    codigo_raw = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else ''
+                    codigo_raw = str(codigo_valor).strip() if pd.notna(codigo_valor) else ''
                     if not codigo_raw or codigo_raw.lower() == 'nan':
                         continue
                     
                     # Coluna 1: Quantidade
-                    qtde_raw = str(row.iloc[1]).strip() if len(row) > 1 and pd.notna(row.iloc[1]) else ''
+                    qtde_raw = str(qtde_valor).strip() if pd.notna(qtde_valor) else ''
                     if not qtde_raw or qtde_raw.lower() in ['nan', '']:
                         continue
                     
@@ -122,7 +157,7 @@ class LabotratProcessor(FileProcessor):
                         qtde_float = float(qtde_raw.replace(',', '.'))
                         qtde = int(qtde_float)
                     except (ValueError, AttributeError):
-                        print(f"[LABOTRAT] AVISO: Quantidade inválida '{qtde_raw}' na linha {idx+1}")
+                        logger.warning("[LABOTRAT] AVISO: Quantidade inválida '%s' na linha %s", qtde_raw, idx+1)
                         continue
                     
                     if qtde <= 0:
@@ -138,19 +173,20 @@ class LabotratProcessor(FileProcessor):
                     })
                     
                 except Exception as e:
-                    print(f"[LABOTRAT] ERRO ao processar linha {idx+1}: {e}")
+                    logger.warning("[LABOTRAT] ERRO ao processar linha %s: %s", idx+1, e)
                     continue
             
             if dados:
                 result_df = pd.DataFrame(dados)
-                print(f"[LABOTRAT] Formato simples: {len(result_df)} itens extraídos (códigos de produto)")
+                logger.info("[LABOTRAT] Formato simples: %s itens extraídos (códigos de produto)", len(result_df))
                 return result_df
             else:
-                print("[LABOTRAT] Nenhum dado extraído do formato simples")
+                logger.warning("[LABOTRAT] Nenhum dado extraído do formato simples")
                 return None
         
         except Exception as e:
-            print(f"[LABOTRAT] ERRO ao processar formato simples: {e}")
+            logger.error("[LABOTRAT] ERRO ao processar formato simples: %s", e)
+            self.falhou = True
             return None
     
     def _processar_formato_completo(self, df: pd.DataFrame) -> pd.DataFrame | None:
@@ -159,16 +195,16 @@ class LabotratProcessor(FileProcessor):
         """
         try:
             if len(df) < 20:
-                print("[LABOTRAT] DataFrame muito pequeno para formato completo (<20 linhas)")
+                logger.debug("[LABOTRAT] DataFrame muito pequeno para formato completo (<20 linhas)")
                 return None
             
             # Extrair CNPJ da linha 5 (índice 4), coluna 13
             cnpj = self._extrair_cnpj(df)
             if not cnpj:
-                print("[LABOTRAT] ⚠️  CNPJ não encontrado, continuando sem CNPJ...")
+                logger.warning("[LABOTRAT] ⚠️  CNPJ não encontrado, continuando sem CNPJ...")
                 cnpj = "N/A"
             else:
-                print(f"[LABOTRAT] CNPJ extraído: {cnpj}")
+                logger.debug("[LABOTRAT] CNPJ extraído: %s", cnpj)
             
             # Indices das colunas (0-based):
             # Col 1: Código
@@ -192,17 +228,22 @@ class LabotratProcessor(FileProcessor):
             
             dados = []
             
+            # Colunas usadas, inteiras, a partir da primeira linha de dados
+            eans = self._coluna(df, col_ean, data_start_idx)
+            descricoes = self._coluna(df, col_desc, data_start_idx)
+            quantidades = self._coluna(df, col_qtde, data_start_idx)
+            precos = self._coluna(df, col_preco, data_start_idx)
+            
             # Processar linhas a partir de data_start_idx
-            for idx in range(data_start_idx, len(df)):
+            linhas = zip(range(data_start_idx, len(df)), eans, descricoes, quantidades, precos)
+            for idx, ean_valor, desc_valor, qtde_valor, preco_valor in linhas:
                 try:
-                    row = df.iloc[idx]
-                    
                     # Extrair EAN
-                    ean_raw = str(row.iloc[col_ean]).strip() if col_ean < len(row) and pd.notna(row.iloc[col_ean]) else ''
+                    ean_raw = str(ean_valor).strip() if pd.notna(ean_valor) else ''
                     ean = extract_ean13(ean_raw) or ean_raw
                     
                     # Extrair DESCRIÇÃO
-                    desc = str(row.iloc[col_desc]).strip() if col_desc < len(row) and pd.notna(row.iloc[col_desc]) else ''
+                    desc = str(desc_valor).strip() if pd.notna(desc_valor) else ''
                     
                     # Ignorar linhas vazias e títulos que começam com "Linha"
                     if not desc or desc.lower().startswith('linha'):
@@ -211,7 +252,7 @@ class LabotratProcessor(FileProcessor):
                     # Extrair e validar QTDE
                     # ⚠️ IMPORTANTE: QTDE é extraída da col 6 e usada SEM MULTIPLICAÇÃO
                     # Não multiplicar por Qt. Cx. (col 4), não multiplicar por nada na descrição
-                    qtde_raw = str(row.iloc[col_qtde]).strip() if col_qtde < len(row) and pd.notna(row.iloc[col_qtde]) else ''
+                    qtde_raw = str(qtde_valor).strip() if pd.notna(qtde_valor) else ''
                     if not qtde_raw or qtde_raw.lower() in ['nan', '', 'qtde', 'qtde.']:
                         continue
                     
@@ -221,7 +262,7 @@ class LabotratProcessor(FileProcessor):
                         try:
                             qtde_float = float(qtde_raw.replace(',', '.'))
                             if qtde_float != int(qtde_float):
-                                print(f"[LABOTRAT] AVISO: QTDE decimal convertida de '{qtde_raw}' para {int(qtde_float)}")
+                                logger.warning("[LABOTRAT] AVISO: QTDE decimal convertida de '%s' para %s", qtde_raw, int(qtde_float))
                             qtde = int(qtde_float)
                         except ValueError:
                             # Se não conseguir converter, pula esta linha (provavelmente é header)
@@ -234,7 +275,7 @@ class LabotratProcessor(FileProcessor):
                         continue
                     
                     # Extrair PREÇO
-                    preco_raw = row.iloc[col_preco] if col_preco < len(row) and pd.notna(row.iloc[col_preco]) else 0.0
+                    preco_raw = preco_valor if pd.notna(preco_valor) else 0.0
                     preco = normalizar_preco(preco_raw) if preco_raw else 0.0
                     
                     # Validar dados mínimos
@@ -250,16 +291,17 @@ class LabotratProcessor(FileProcessor):
                     })
                     
                 except Exception as e:
-                    print(f"[LABOTRAT] ERRO ao processar linha {idx+1}: {e}")
+                    logger.warning("[LABOTRAT] ERRO ao processar linha %s: %s", idx+1, e)
                     continue
             
             result_df = pd.DataFrame(dados) if dados else None
             if result_df is not None:
-                print(f"[LABOTRAT] Formato completo: {len(result_df)} produtos extraídos")
+                logger.info("[LABOTRAT] Formato completo: %s produtos extraídos", len(result_df))
             return result_df
         
         except Exception as e:
-            print(f"[LABOTRAT] ERRO ao processar formato completo: {e}")
+            logger.error("[LABOTRAT] ERRO ao processar formato completo: %s", e)
+            self.falhou = True
             return None
     
     def _extrair_cnpj(self, df: pd.DataFrame) -> str | None:
@@ -275,20 +317,17 @@ class LabotratProcessor(FileProcessor):
             
             row = df.iloc[4]
             
-            # Padrão de CNPJ formatado: xx.xxx.xxx/xxxx-xx
-            cnpj_pattern = r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}'
-            
             # Procurar em todas as colunas da linha 5
             for col_idx, val in enumerate(row):
                 if pd.notna(val):
                     val_str = str(val).strip()
                     # Procurar padrão formatado
-                    match = re.search(cnpj_pattern, val_str)
+                    match = LABOTRAT_CNPJ.search(val_str)
                     if match:
                         cnpj_formatado = match.group(0)
                         # Limpar: remove . / -
                         cnpj_limpo = cnpj_formatado.replace('.', '').replace('/', '').replace('-', '')
-                        print(f"[LABOTRAT] CNPJ extraído (col {col_idx}): {cnpj_formatado} → {cnpj_limpo}")
+                        logger.debug("[LABOTRAT] CNPJ extraído (col %s): %s → %s", col_idx, cnpj_formatado, cnpj_limpo)
                         return cnpj_limpo
             
             # Se não encontrar formatado, tentar com extract_cnpj (que tira formatação)
@@ -296,10 +335,11 @@ class LabotratProcessor(FileProcessor):
                 valor = str(row.iloc[13]).strip() if pd.notna(row.iloc[13]) else ''
                 cnpj = extract_cnpj(valor)
                 if cnpj:
-                    print(f"[LABOTRAT] CNPJ extraído (sem formatação): {cnpj}")
+                    logger.debug("[LABOTRAT] CNPJ extraído (sem formatação): %s", cnpj)
                     return cnpj
             
             return None
         except Exception as e:
-            print(f"[LABOTRAT] ERRO ao extrair CNPJ: {e}")
+            logger.error("[LABOTRAT] ERRO ao extrair CNPJ: %s", e)
+            self.falhou = True
             return None
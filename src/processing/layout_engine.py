@@ -0,0 +1,524 @@
+"""Extração de pedidos descrita por especificação de layout do fornecedor.
+
+Cada fornecedor tem um arquivo em `layouts/<nome>.json` com os nomes de coluna
+aceitos para EAN, descrição, quantidade e preço, onde fica o CNPJ e as regex
+usadas pelo processador dele. A especificação é compilada uma vez por processo
+(`obter_layout`) em resolvedores de coluna, conversores de coluna inteira e
+regex registradas em src/utils/patterns.py, e a extração da planilha roda sobre
+o DataFrame todo de uma vez, no lugar do `iterrows` de cada processador.
+
+O resultado é o mesmo do laço linha a linha que existia nos processadores:
+EAN extraído do texto (ou o texto da célula), linhas sem EAN, sem descrição ou
+com quantidade inválida/<= 0 descartadas, multiplicador de fardos aplicado à
+quantidade e PREÇO None quando zero.
+
+As seções "pdf" e "txt" descrevem da mesma forma as tabelas de PDF (uma linha
+por item: EAN, descrição, quantidade e preço) e as linhas de TXT (EAN, descrição
+e quantidade no último campo): de onde vem o CNPJ, se aplica o multiplicador de
+fardos e o que descartar. Sem a seção valem os padrões, que são as regras
+comuns dos fornecedores.
+
+Fornecedores sem processador próprio (sem "processador" na especificação) são
+atendidos pelo LayoutProcessor; para incluir um basta criar o .json.
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.utils import patterns
+from src.utils.validators import (
+    extract_cnpj,
+    extract_ean13,
+    extract_multiplicador_fardos,
+    extract_multiplicador_fardos_serie,
+    normalizar_preco,
+    normalizar_preco_serie,
+)
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+DIRETORIO_LAYOUTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'layouts')
+
+# Campos da planilha; os três primeiros são obrigatórios
+CAMPOS_PLANILHA = ('ean', 'descricao', 'qtde', 'preco')
+CAMPOS_OBRIGATORIOS = ('ean', 'descricao', 'qtde')
+
+# Modos de busca de coluna pelo nome:
+# - nome_a_nome: para cada nome, correspondência exata e depois parcial
+# - exata_primeiro: exata para todos os nomes, depois parcial para todos
+# - nome_a_nome_bidirecional: como nome_a_nome, aceitando também a coluna
+#   contida no nome procurado
+MODOS_BUSCA = ('nome_a_nome', 'exata_primeiro', 'nome_a_nome_bidirecional')
+
+# Modos de leitura do PDF:
+# - tabelas: cada linha das tabelas de cada página é um item
+# - texto: texto de todas as páginas pelo PDFTextParser
+MODOS_PDF = ('tabelas', 'texto')
+
+# Extensões atendidas quando a especificação não informa
+EXTENSOES_PADRAO = ['xlsx', 'xls', 'txt', 'pdf']
+
+_especificacoes = None
+_compilados = {}
+_lock = threading.Lock()
+
+
+# ===== ESPECIFICAÇÕES =====
+
+def especificacoes() -> dict:
+    """Especificações de `layouts/*.json` por nome (lidas uma vez por processo)."""
+    global _especificacoes
+    if _especificacoes is None:
+        lidas = {}
+        if os.path.isdir(DIRETORIO_LAYOUTS):
+            for arquivo in sorted(os.listdir(DIRETORIO_LAYOUTS)):
+                if not arquivo.endswith('.json'):
+                    continue
+                with open(os.path.join(DIRETORIO_LAYOUTS, arquivo), encoding='utf-8') as f:
+                    spec = json.load(f)
+                nome = str(spec.get('nome') or arquivo[:-len('.json')]).lower()
+                lidas[nome] = spec
+        _especificacoes = lidas
+    return _especificacoes
+
+
+def layouts_sem_processador() -> list[str]:
+    """Layouts atendidos pelo LayoutProcessor (sem processador próprio)."""
+    return [nome for nome, spec in especificacoes().items() if not spec.get('processador')]
+
+
+def modelos_de_layouts() -> dict:
+    """Modelos declarados nas especificações, no formato de MODEL_PROCESSOR_MAPPING."""
+    modelos = {}
+    for nome, spec in especificacoes().items():
+        for modelo in spec.get('modelos', []):
+            modelos[modelo.upper()] = {
+                'processor': spec.get('processador') or nome,
+                'extensions': spec.get('extensoes', EXTENSOES_PADRAO),
+                'description': spec.get('descricao', f'Layout {nome}'),
+            }
+    return modelos
+
+
+def obter_layout(nome: str) -> 'LayoutCompilado | None':
+    """Layout compilado pelo nome (compilado no primeiro uso), ou None se não houver especificação."""
+    nome = nome.lower()
+    if nome not in _compilados:
+        spec = especificacoes().get(nome)
+        if spec is None:
+            return None
+        with _lock:
+            if nome not in _compilados:
+                _compilados[nome] = LayoutCompilado(nome, spec)
+    return _compilados[nome]
+
+
+# ===== CONVERSORES =====
+
+def _ean_ou_texto(texto: str) -> str:
+    """EAN-13 extraído do texto da célula ou o próprio texto."""
+    texto = texto.strip()
+    # Só dígitos: extract_ean13 devolve o próprio texto (13 dígitos) ou nada
+    if texto.isascii() and texto.isdigit():
+        return texto
+    return extract_ean13(texto) or texto
+
+
+def _qtde_ou_none(texto: str) -> int | None:
+    """Quantidade como int(float(...)) com vírgula decimal; None se não converter."""
+    try:
+        return int(float(texto.replace(',', '.')))
+    except (ValueError, OverflowError):
+        return None
+
+
+def _qtdes(valores: pd.Series) -> list:
+    """Quantidades das linhas (None nas inválidas)."""
+    numeros = valores.infer_objects()
+    if numeros.dtype.kind in 'iuf':
+        # Só números: a mesma conversão feita na coluna inteira (exata abaixo de 2**53)
+        numeros = numeros.astype('float64')
+        if (numeros.abs() < 2 ** 53).all():
+            return numeros.astype('int64').tolist()
+    return [_qtde_ou_none(str(valor)) for valor in valores]
+
+
+def _vazio_de_texto(valor) -> bool:
+    """Valores que o pandas trata como ausentes ao inferir uma Series de texto."""
+    return valor is None or valor is pd.NA or (isinstance(valor, float) and valor != valor)
+
+
+def _linhas_de_texto(df: pd.DataFrame, linhas: list) -> list:
+    """Quais das `linhas` o iterrows monta com dtype de texto (só strings e vazios, ao menos uma string)."""
+    resultado = []
+    for linha in linhas:
+        valores = df.iloc[linha].tolist() if df.shape[1] else []
+        resultado.append(
+            any(isinstance(valor, str) for valor in valores)
+            and all(isinstance(valor, str) or _vazio_de_texto(valor) for valor in valores)
+        )
+    return resultado
+
+
+def valores_das_linhas(df: pd.DataFrame, posicao: int) -> pd.Series:
+    """
+    Coluna com os valores que `df.iterrows()` entregaria em cada linha.
+
+    O iterrows monta cada linha com o tipo comum a todas as colunas, então em
+    planilhas só numéricas um inteiro chega como float (ex: '7891...0.0'). Em
+    linhas só de texto o pandas infere dtype de texto e None/NA viram NaN.
+    """
+    serie = df.iloc[:, posicao]
+    comum = df.iloc[:0].to_numpy().dtype
+    if comum != object and serie.dtype != comum:
+        serie = serie.astype(comum)
+    serie = serie.astype(object)
+
+    if comum == object:
+        ausentes = serie.isna().to_numpy().nonzero()[0]
+        linhas = [int(linha) for linha in ausentes if serie.iat[linha] is None or serie.iat[linha] is pd.NA]
+        if linhas:
+            de_texto = [linha for linha, texto in zip(linhas, _linhas_de_texto(df, linhas)) if texto]
+            if de_texto:
+                serie = serie.copy()
+                serie.iloc[de_texto] = np.nan
+    return serie
+
+
+# ===== PLANILHA =====
+
+class LayoutPlanilha:
+    """Regras de extração de planilha compiladas de uma especificação."""
+
+    def __init__(self, nome: str, spec: dict):
+        self.nome = nome
+        colunas = spec.get('colunas') or {}
+        faltando = [campo for campo in CAMPOS_OBRIGATORIOS if not colunas.get(campo)]
+        if faltando:
+            raise ValueError(f"Layout '{nome}': colunas sem nomes possíveis: {', '.join(faltando)}")
+        desconhecidos = set(colunas) - set(CAMPOS_PLANILHA)
+        if desconhecidos:
+            raise ValueError(f"Layout '{nome}': campos desconhecidos: {', '.join(sorted(desconhecidos))}")
+        self.colunas = {campo: tuple(colunas.get(campo) or ()) for campo in CAMPOS_PLANILHA}
+
+        self.busca = spec.get('busca_colunas', 'nome_a_nome')
+        if self.busca not in MODOS_BUSCA:
+            raise ValueError(f"Layout '{nome}': busca_colunas inválida: {self.busca}")
+
+        self.cnpj = spec.get('cnpj') or {}
+        origens = {'coluna', 'linha', 'celula'} & set(self.cnpj)
+        if len(origens) > 1:
+            raise ValueError(f"Layout '{nome}': cnpj deve ter uma única origem (coluna, linha ou celula)")
+        self.cnpj_linhas = int(self.cnpj.get('linhas', 10))
+
+        # Linha dos metadados acima do cabeçalho com o CNPJ, tentada antes da origem acima
+        self.cnpj_metadados = self.cnpj.get('metadados_linha')
+
+        # Linha do cabeçalho da tabela (as de cima são metadados)
+        self.cabecalho = int(spec.get('cabecalho', 0))
+
+        self.multiplicador_fardos = bool(spec.get('multiplicador_fardos', True))
+
+        # Exige EAN só com dígitos e com pelo menos esse tamanho (None aceita qualquer texto)
+        self.ean_min_digitos = spec.get('ean_min_digitos')
+
+        # Normaliza o preço a partir do texto da célula (ex: True vira 'True', preço 0)
+        self.preco_como_texto = bool(spec.get('preco_como_texto', False))
+
+    def buscar_coluna(self, colunas, nomes_possiveis) -> str | None:
+        """Coluna do DataFrame para um dos nomes possíveis (ver MODOS_BUSCA)."""
+        colunas_lower = {str(col).lower().strip(): col for col in colunas}
+        nomes = [nome.lower().strip() for nome in nomes_possiveis]
+
+        if self.busca == 'exata_primeiro':
+            for nome in nomes:
+                if nome in colunas_lower:
+                    return colunas_lower[nome]
+            for nome in nomes:
+                for col_lower, col_real in colunas_lower.items():
+                    if nome and nome in col_lower:
+                        return col_real
+            return None
+
+        bidirecional = self.busca == 'nome_a_nome_bidirecional'
+        for nome in nomes:
+            if nome in colunas_lower:
+                return colunas_lower[nome]
+            for col_lower, col_real in colunas_lower.items():
+                if nome in col_lower or (bidirecional and col_lower in nome):
+                    return col_real
+        return None
+
+    def resolver_colunas(self, colunas) -> dict:
+        """Coluna encontrada (ou None) para cada campo."""
+        return {
+            campo: self.buscar_coluna(colunas, nomes) if nomes else None
+            for campo, nomes in self.colunas.items()
+        }
+
+    def extrair_cnpj(self, df: pd.DataFrame) -> str:
+        """CNPJ do pedido conforme a origem da especificação ('' se não encontrado)."""
+        if 'coluna' in self.cnpj:
+            coluna = self.buscar_coluna(df.columns, self.cnpj['coluna'])
+            if coluna:
+                for valor in df[coluna].head(self.cnpj_linhas):
+                    if cnpj := extract_cnpj(str(valor)):
+                        return cnpj
+        elif 'linha' in self.cnpj:
+            # Primeira célula da linha com um CNPJ
+            linha = int(self.cnpj['linha'])
+            for posicao in range(df.shape[1]):
+                try:
+                    if cnpj := extract_cnpj(str(df.iloc[linha, posicao]).strip()):
+                        return cnpj
+                except IndexError:
+                    break
+        elif 'celula' in self.cnpj:
+            linha, coluna = self.cnpj['celula']
+            try:
+                return extract_cnpj(str(df.iloc[linha, coluna])) or ''
+            except IndexError:
+                pass
+        return ''
+
+    def extrair(self, df: pd.DataFrame, cnpj: str | None = None) -> pd.DataFrame | None:
+        """
+        Extrai os itens do DataFrame de uma vez (colunas inteiras).
+
+        Args:
+            df: Planilha com os nomes de coluna já limpos
+            cnpj: CNPJ já conhecido (senão usa a origem da especificação)
+
+        Returns:
+            DataFrame com CNPJ, EAN, DESCRICAO, QTDE e PREÇO, ou None sem itens
+        """
+        if df.empty:
+            return None
+
+        if cnpj is None:
+            cnpj = self.extrair_cnpj(df)
+
+        colunas = self.resolver_colunas(df.columns)
+        logger.debug("[LAYOUT] %s: colunas %s", self.nome, colunas)
+        if not all(colunas[campo] for campo in CAMPOS_OBRIGATORIOS):
+            logger.warning("[LAYOUT] %s: colunas obrigatórias não encontradas em %s", self.nome, list(df.columns))
+            return None
+
+        # Por posição: com nomes repetidos vale a primeira coluna
+        nomes = list(df.columns)
+        posicoes = {campo: nomes.index(coluna) for campo, coluna in colunas.items() if coluna}
+
+        eans = [_ean_ou_texto(str(v)) for v in valores_das_linhas(df, posicoes['ean'])]
+        descricoes = [str(v).strip() for v in valores_das_linhas(df, posicoes['descricao'])]
+        qtdes = _qtdes(valores_das_linhas(df, posicoes['qtde']))
+
+        validas = [
+            i for i, (ean, desc, qtde) in enumerate(zip(eans, descricoes, qtdes))
+            if ean and desc and qtde is not None and qtde > 0
+        ]
+        if self.ean_min_digitos is not None:
+            validas = [i for i in validas if eans[i].isdigit() and len(eans[i]) >= self.ean_min_digitos]
+        logger.debug("[LAYOUT] %s: %s de %s linhas com item", self.nome, len(validas), len(df))
+        if not validas:
+            return None
+
+        descricoes = pd.Series([descricoes[i] for i in validas], dtype=object)
+        if self.multiplicador_fardos:
+            descricoes, multiplicadores = extract_multiplicador_fardos_serie(descricoes)
+            descricoes = descricoes.str.strip()
+            multiplicadores = multiplicadores.tolist()
+        else:
+            multiplicadores = [1] * len(validas)
+
+        if colunas['preco']:
+            if self.preco_como_texto:
+                valores = valores_das_linhas(df, posicoes['preco'])
+                precos = pd.Series([str(valores.iat[i]).strip() for i in validas], dtype=object)
+            else:
+                precos = df.iloc[validas, posicoes['preco']].reset_index(drop=True)
+            precos = normalizar_preco_serie(precos)
+            precos = [preco if preco > 0 else None for preco in precos.tolist()]
+        else:
+            precos = [None] * len(validas)
+
+        return pd.DataFrame({
+            'CNPJ': [cnpj] * len(validas),
+            'EAN': [eans[i] for i in validas],
+            'DESCRICAO': descricoes.tolist(),
+            'QTDE': [qtdes[i] * mult for i, mult in zip(validas, multiplicadores)],
+            'PREÇO': precos,
+        })
+
+
+# ===== PDF E TXT =====
+
+class _LayoutTexto:
+    """Origem do CNPJ e montagem do item, comuns às seções 'pdf' e 'txt'."""
+
+    def __init__(self, nome: str, secao: str, spec: dict, regex: dict):
+        self.nome = nome
+        cnpj = spec.get('cnpj') or {}
+
+        # Regex da especificação com o CNPJ no grupo 1 (ex: linha 'Filial' da Crescer)
+        self.cnpj_regex = None
+        if cnpj.get('regex'):
+            if cnpj['regex'] not in regex:
+                raise ValueError(f"Layout '{nome}': {secao}.cnpj usa a regex '{cnpj['regex']}', ausente em 'regex'")
+            self.cnpj_regex = regex[cnpj['regex']]
+
+        # Só procura o CNPJ nas primeiras linhas do texto
+        self.cnpj_linhas = cnpj.get('linhas')
+
+        self.multiplicador_fardos = bool(spec.get('multiplicador_fardos', True))
+
+    def extrair_cnpj(self, texto: str) -> str:
+        """CNPJ do texto conforme a origem da especificação ('' se não encontrado)."""
+        if self.cnpj_regex is not None:
+            match = self.cnpj_regex.search(texto)
+            return ''.join(c for c in match.group(1) if c.isdigit()) if match else ''
+        if self.cnpj_linhas:
+            for linha in texto.split('\n')[:int(self.cnpj_linhas)]:
+                if cnpj := extract_cnpj(linha):
+                    return cnpj
+            return ''
+        return extract_cnpj(texto) or ''
+
+    def item(self, cnpj: str, ean: str, desc: str, qtde: int, preco: float | None) -> dict:
+        """Item de saída, com o multiplicador de fardos aplicado se a especificação pedir."""
+        if self.multiplicador_fardos:
+            desc, multiplicador = extract_multiplicador_fardos(desc)
+            desc = desc.strip()
+            qtde *= multiplicador
+        return {
+            'CNPJ': cnpj,
+            'EAN': ean,
+            'DESCRICAO': desc,
+            'QTDE': qtde,
+            'PREÇO': preco if preco and preco > 0 else None,
+        }
+
+
+class LayoutPDF(_LayoutTexto):
+    """Regras de extração de PDF compiladas de uma especificação."""
+
+    def __init__(self, nome: str, spec: dict, regex: dict):
+        super().__init__(nome, 'pdf', spec, regex)
+        self.modo = spec.get('modo', 'tabelas')
+        if self.modo not in MODOS_PDF:
+            raise ValueError(f"Layout '{nome}': pdf.modo inválido: {self.modo}")
+
+        # Exige EAN só com dígitos e com pelo menos esse tamanho (None aceita qualquer texto)
+        self.ean_min_digitos = spec.get('ean_min_digitos')
+
+    def extrair_tabela(self, tabela: list, cnpj: str) -> list:
+        """
+        Itens de uma tabela do PDF (colunas EAN, descrição, quantidade e preço).
+
+        Linhas com menos de três células, sem EAN, sem descrição ou com
+        quantidade inválida/<= 0 são descartadas.
+        """
+        itens = []
+        for row in tabela:
+            if not row or len(row) < 3:
+                continue
+            try:
+                qtde = int(float(str(row[2]).replace(',', '.')))
+            except (ValueError, OverflowError):
+                continue
+            ean = _ean_ou_texto(str(row[0]))
+            desc = str(row[1]).strip() if row[1] else ''
+            if not ean or not desc or qtde <= 0:
+                continue
+            if self.ean_min_digitos is not None and not (ean.isdigit() and len(ean) >= self.ean_min_digitos):
+                continue
+            preco = normalizar_preco(row[3]) if len(row) > 3 else 0.0
+            itens.append(self.item(cnpj, ean, desc, qtde, preco))
+        return itens
+
+
+class LayoutTXT(_LayoutTexto):
+    """Regras de extração de TXT compiladas de uma especificação."""
+
+    def __init__(self, nome: str, spec: dict, regex: dict):
+        super().__init__(nome, 'txt', spec, regex)
+
+        # CNPJ da primeira linha que tiver um; só as linhas seguintes têm itens
+        self.cnpj_primeira_linha = bool((spec.get('cnpj') or {}).get('primeira_linha'))
+
+        # Campos depois da descrição: a quantidade (último) e os que vierem antes dela
+        self.campos_apos_descricao = int(spec.get('campos_apos_descricao', 1))
+        if self.campos_apos_descricao < 1:
+            raise ValueError(f"Layout '{nome}': txt.campos_apos_descricao deve ser ao menos 1")
+
+    def extrair(self, texto: str) -> list:
+        """Itens das linhas do TXT (nenhum sem CNPJ)."""
+        linhas = texto.split('\n')
+        if self.cnpj_primeira_linha:
+            for posicao, linha in enumerate(linhas):
+                if cnpj := extract_cnpj(linha):
+                    linhas = linhas[posicao + 1:]
+                    break
+            else:
+                return []
+        else:
+            cnpj = self.extrair_cnpj(texto)
+            if not cnpj:
+                return []
+        return [item for linha in linhas if (item := self.extrair_linha(linha, cnpj))]
+
+    def extrair_linha(self, linha: str, cnpj: str) -> dict | None:
+        """Item de uma linha 'EAN descrição ... quantidade' (None se não for item)."""
+        ean = extract_ean13(linha)
+        if not ean:
+            return None
+        partes = linha.split()
+        if len(partes) < 3:
+            return None
+        desc = ' '.join(partes[1:-self.campos_apos_descricao])
+        try:
+            qtde = int(partes[-1])
+        except ValueError:
+            return None
+        if qtde <= 0 or not desc:
+            return None
+        return self.item(cnpj, ean, desc, qtde, None)
+
+
+# ===== LAYOUT =====
+
+class LayoutCompilado:
+    """Especificação de um fornecedor compilada: regex registradas e regras de planilha, PDF e TXT."""
+
+    def __init__(self, nome: str, spec: dict):
+        self.nome = nome
+        self.spec = spec
+        self.versao = str(spec.get('versao', '1'))
+        self.descricao = spec.get('descricao', '')
+        self.extensoes = spec.get('extensoes', EXTENSOES_PADRAO)
+
+        # Regex da especificação, registradas como '<layout>.<nome>'
+        self.regex = {}
+        for chave, regra in (spec.get('regex') or {}).items():
+            padrao = regra['padrao'] if isinstance(regra, dict) else regra
+            self.regex[chave] = patterns.registrar(f'{nome}.{chave}', padrao)
+
+        self.planilha = LayoutPlanilha(nome, spec['planilha']) if spec.get('planilha') else None
+        self.pdf = LayoutPDF(nome, spec.get('pdf') or {}, self.regex)
+        self.txt = LayoutTXT(nome, spec.get('txt') or {}, self.regex)
+        logger.debug("[LAYOUT] %s compilado (versão %s, %s regex)", nome, self.versao, len(self.regex))
+
+    def parametro(self, secao: str, chave: str, padrao=None):
+        """Valor de uma seção da especificação (ex: parametro('pdf', 'qtde_intervalo'))."""
+        return (self.spec.get(secao) or {}).get(chave, padrao)
+
+    def extrair_planilha(self, df: pd.DataFrame, cnpj: str | None = None) -> pd.DataFrame | None:
+        """Extrai os itens de uma planilha (ver LayoutPlanilha.extrair)."""
+        if self.planilha is None:
+            logger.warning("[LAYOUT] %s não descreve planilhas", self.nome)
+            return None
+        return self.planilha.extrair(df, cnpj)
@@ -0,0 +1,136 @@
+"""Processador de fornecedores descritos por especificação (layouts/*.json)."""
+
+import pandas as pd
+from .base import FileProcessor
+from .documento import DocumentoCarregado
+from .layout_engine import LayoutCompilado, obter_layout
+from .pdf_text_parser import PDFTextParser
+from src.utils.validators import extract_cnpj
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+
+class LayoutProcessor(FileProcessor):
+    """
+    Processa planilhas, PDFs e TXTs pelas regras de um layout (ver layout_engine.py).
+
+    Cada layout sem processador próprio vira uma subclasse com LAYOUT definido
+    (`para_layout`). Fornecedores com alguma regra que a especificação não
+    descreve herdam desta classe e sobrescrevem só a etapa diferente.
+    """
+
+    LAYOUT: LayoutCompilado | None = None
+
+    _classes = {}
+
+    @classmethod
+    def para_layout(cls, nome: str) -> type['LayoutProcessor']:
+        """Subclasse ligada ao layout `nome` (a versão da especificação entra na chave do cache)."""
+        if nome not in cls._classes:
+            layout = obter_layout(nome)
+            if layout is None:
+                raise ValueError(f"Layout não encontrado: {nome}")
+            classe = f"{nome.title().replace('_', '')}LayoutProcessor"
+            cls._classes[nome] = type(classe, (cls,), {
+                '__module__': cls.__module__, 'LAYOUT': layout, 'VERSION': f'layout.{layout.versao}',
+            })
+        return cls._classes[nome]
+
+    @property
+    def _tag(self) -> str:
+        return self.LAYOUT.nome.upper()
+
+    def process(self, file_content: bytes, filename: str = None) -> pd.DataFrame:
+        """Processa o arquivo pelo layout e extrai dados estruturados."""
+        with DocumentoCarregado(file_content, filename) as documento:
+            return self.processar_documento(documento)
+
+    def processar_documento(self, documento: DocumentoCarregado) -> pd.DataFrame | None:
+        """Processa o upload já carregado (Excel, PDF ou TXT)."""
+        logger.info("[%s] Processando: %s", self._tag, documento.nome or 'arquivo')
+
+        try:
+            ext = documento.ext or 'xlsx'
+
+            if ext in ('xlsx', 'xls'):
+                return self._processar_excel(documento, ext)
+            elif ext == 'pdf':
+                return self._processar_pdf(documento)
+            elif ext == 'txt':
+                return self._processar_txt(documento)
+            else:
+                logger.error("[%s] ERRO: Extensão não suportada: .%s", self._tag, ext)
+                return None
+
+        except Exception as e:
+            logger.error("[%s] ERRO: %s: %s", self._tag, type(e).__name__, str(e))
+            self.falhou = True
+            return None
+
+    def _processar_excel(self, documento: DocumentoCarregado, ext: str) -> pd.DataFrame | None:
+        """Processa a planilha: CNPJ dos metadados (se houver) e tabela a partir do cabeçalho."""
+        try:
+            engine = 'openpyxl' if ext == 'xlsx' else 'xlrd'
+            planilha = documento.planilha(engine)
+            cnpj = self._cnpj_metadados(planilha)
+            logger.debug("[%s] CNPJ dos metadados: %s", self._tag, cnpj)
+
+            df = planilha.dataframe(header=self.LAYOUT.planilha.cabecalho)
+            df.columns = [str(col).strip() for col in df.columns]
+            return self._extrair_dados(df, cnpj)
+        except Exception as e:
+            logger.error("[%s] ERRO ao processar Excel: %s", self._tag, e)
+            self.falhou = True
+            return None
+
+    def _cnpj_metadados(self, planilha) -> str | None:
+        """CNPJ da linha de metadados da especificação (None: usa a origem da tabela)."""
+        linha = self.LAYOUT.planilha.cnpj_metadados
+        if linha is None:
+            return None
+        linha = int(linha)
+        metadados = planilha.linhas(linha + 1)
+        if len(metadados) > linha:
+            for valor in metadados.iloc[linha]:
+                if cnpj := extract_cnpj(str(valor).strip()):
+                    return cnpj
+        return None
+
+    def _extrair_dados(self, df: pd.DataFrame, cnpj: str | None = None) -> pd.DataFrame | None:
+        """Extrai os itens da tabela (regras de layouts/<layout>.json)."""
+        return self.LAYOUT.extrair_planilha(df, cnpj)
+
+    def _processar_pdf(self, documento: DocumentoCarregado) -> pd.DataFrame | None:
+        """Processa o PDF: tabelas de cada página ou texto corrido (pdf.modo)."""
+        regras = self.LAYOUT.pdf
+        try:
+            if regras.modo == 'texto':
+                texto = documento.texto_pdf
+                return PDFTextParser.extract_data_from_text(texto, regras.extrair_cnpj(texto))
+
+            dados = []
+            for _, layout in documento.layouts():
+                texto = layout.texto
+                if not texto:
+                    continue
+
+                cnpj = regras.extrair_cnpj(texto)
+                for tabela in layout.tabelas or []:
+                    dados.extend(regras.extrair_tabela(tabela, cnpj))
+
+            return pd.DataFrame(dados) if dados else None
+        except Exception as e:
+            logger.error("[%s] ERRO ao processar PDF: %s", self._tag, e)
+            self.falhou = True
+            return None
+
+    def _processar_txt(self, documento: DocumentoCarregado) -> pd.DataFrame | None:
+        """Processa o TXT: uma linha por item, com o CNPJ do pedido."""
+        try:
+            dados = self.LAYOUT.txt.extrair(documento.texto)
+            return pd.DataFrame(dados) if dados else None
+        except Exception as e:
+            logger.error("[%s] ERRO ao processar TXT: %s", self._tag, e)
+            self.falhou = True
+            return None
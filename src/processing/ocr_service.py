@@ -0,0 +1,299 @@
+"""Serviço de OCR com processos dedicados e modelo pré-carregado.
+
+O EasyOCR leva alguns segundos para carregar e ocupa bastante memória; sem o
+serviço, cada worker uvicorn (e cada processo do executor) carrega sua própria
+cópia na primeira imagem. O serviço mantém um pool fixo de processos que
+carregam e aquecem o modelo na inicialização e recebem as imagens por uma
+conexão local autenticada (multiprocessing.connection). A conexão desserializa
+o que recebe e aceita o comando de encerrar, então o serviço só sobe com uma
+chave secreta: AGILIZA_OCR_CHAVE ou, pelo app.py, uma chave aleatória gerada
+na inicialização.
+
+Uso:
+    python -m src.processing.ocr_service
+
+O app.py inicia o serviço automaticamente antes do uvicorn. Quando o serviço
+não está no ar, o ImageProcessor volta a usar o reader local.
+"""
+
+import multiprocessing
+import os
+import secrets
+import signal
+import subprocess
+import sys
+import threading
+import time
+from io import BytesIO
+from multiprocessing.connection import Listener, Client
+
+from src.config.settings import (
+    BASE_DIR,
+    OCR_SERVICO_ATIVO,
+    OCR_SERVICO_HOST,
+    OCR_SERVICO_PORTA,
+    OCR_SERVICO_PROCESSOS,
+    OCR_SERVICO_CHAVE,
+    OCR_SERVICO_TIMEOUT,
+)
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+# Reader do processo do pool (carregado no initializer)
+_reader = None
+
+# Antiga chave padrão, pública no repositório: o serviço não sobe com ela
+_CHAVE_PUBLICA = 'agiliza-ocr'
+
+
+def chave_insegura(chave: str) -> bool:
+    """Indica se a chave está vazia ou é a antiga chave padrão pública."""
+    return not chave or chave == _CHAVE_PUBLICA
+
+
+def easyocr_instalado() -> bool:
+    """Indica se o EasyOCR pode ser importado (sem carregar o modelo)."""
+    import importlib.util
+    return importlib.util.find_spec('easyocr') is not None
+
+
+def _inicializar_worker(aquecidos):
+    """Carrega o modelo e faz uma leitura de aquecimento (initializer do pool)."""
+    global _reader
+    try:
+        import easyocr
+        import numpy as np
+        _reader = easyocr.Reader(['pt', 'en'], gpu=False)
+        _reader.readtext(np.full((64, 256, 3), 255, dtype=np.uint8), detail=1)
+        with aquecidos.get_lock():
+            aquecidos.value += 1
+    except Exception as e:
+        logger.error("[OCR] Erro ao carregar EasyOCR no worker: %s", e)
+        _reader = None
+
+
+def _reconhecer(imagem: bytes) -> list:
+    """Executa o OCR de uma imagem dentro do processo do pool."""
+    if _reader is None:
+        raise RuntimeError('EasyOCR indisponível no worker de OCR')
+
+    import numpy as np
+    from PIL import Image
+
+    img_array = np.array(Image.open(BytesIO(imagem)))
+    itens = _reader.readtext(img_array, detail=1)
+    # Tipos nativos para a resposta (bbox vem com numpy)
+    return [
+        ([[float(x), float(y)] for x, y in bbox], str(texto), float(conf))
+        for bbox, texto, conf in itens
+    ]
+
+
+class ServicoOCR:
+    """Servidor local que distribui imagens para o pool de OCR."""
+
+    def __init__(self, host: str = OCR_SERVICO_HOST, porta: int = OCR_SERVICO_PORTA,
+                 processos: int = OCR_SERVICO_PROCESSOS, chave: str = OCR_SERVICO_CHAVE):
+        self.endereco = (host, porta)
+        self.processos = max(1, processos)
+        self.chave = chave.encode('utf-8')
+        self._pool = None
+        self._aquecidos = None
+        self._atendidas = 0
+        # Cada conexão é atendida em uma thread própria
+        self._trava_atendidas = threading.Lock()
+        self._inicio = None
+
+    def executar(self):
+        """Sobe o pool e atende conexões até o processo ser encerrado."""
+        if chave_insegura(self.chave.decode('utf-8')):
+            logger.error("[OCR] AGILIZA_OCR_CHAVE vazia ou com a chave padrão pública; serviço não iniciado")
+            return
+
+        ctx = multiprocessing.get_context('spawn')
+        self._aquecidos = ctx.Value('i', 0)
+        self._pool = ctx.Pool(self.processos, initializer=_inicializar_worker, initargs=(self._aquecidos,))
+        self._inicio = time.time()
+        logger.info("[OCR] Serviço ouvindo em %s:%s (%s processo(s))",
+                    self.endereco[0], self.endereco[1], self.processos)
+
+        try:
+            with Listener(self.endereco, authkey=self.chave) as listener:
+                while True:
+                    try:
+                        conn = listener.accept()
+                    except Exception as e:
+                        # Cliente com chave errada ou conexão interrompida
+                        logger.warning("[OCR] Conexão recusada: %s", e)
+                        continue
+                    threading.Thread(target=self._atender, args=(conn,), daemon=True).start()
+        finally:
+            self._pool.terminate()
+            self._pool.join()
+
+    def _atender(self, conn):
+        """Responde às mensagens de uma conexão."""
+        with conn:
+            while True:
+                try:
+                    mensagem = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send(self._responder(mensagem))
+                except (EOFError, OSError):
+                    return
+
+    def _responder(self, mensagem: dict) -> dict:
+        tipo = mensagem.get('tipo')
+        if tipo == 'ping':
+            return {'ok': True, **self.status()}
+        if tipo == 'encerrar':
+            # Encerra pool e processo sem depender de sinais (não disponíveis no Windows)
+            logger.info("[OCR] Encerrando serviço")
+            self._pool.terminate()
+            os._exit(0)
+        if tipo == 'ocr':
+            try:
+                itens = self._pool.apply(_reconhecer, (mensagem['imagem'],))
+                with self._trava_atendidas:
+                    self._atendidas += 1
+                return {'ok': True, 'itens': itens}
+            except Exception as e:
+                return {'ok': False, 'erro': str(e)}
+        return {'ok': False, 'erro': f'Mensagem desconhecida: {tipo}'}
+
+    def status(self) -> dict:
+        """Estado do pool: processos aquecidos e imagens atendidas."""
+        aquecidos = self._aquecidos.value if self._aquecidos is not None else 0
+        return {
+            'status': 'pronto' if aquecidos >= self.processos else 'aquecendo',
+            'processos': self.processos,
+            'aquecidos': aquecidos,
+            'atendidas': self._atendidas,
+            'tempo_ativo': round(time.time() - self._inicio, 1) if self._inicio else 0,
+        }
+
+
+class ClienteOCR:
+    """Cliente do serviço de OCR usado pelo ImageProcessor e pelo health check."""
+
+    def __init__(self, host: str = OCR_SERVICO_HOST, porta: int = OCR_SERVICO_PORTA,
+                 chave: str = OCR_SERVICO_CHAVE, timeout: int = OCR_SERVICO_TIMEOUT,
+                 ativo: bool = OCR_SERVICO_ATIVO):
+        self.endereco = (host, porta)
+        self.chave = chave.encode('utf-8')
+        self.timeout = timeout
+        self.ativo = ativo
+
+    def _enviar(self, mensagem: dict, timeout: float) -> dict | None:
+        """Envia uma mensagem e aguarda a resposta; None se o serviço não responder."""
+        if not self.chave:
+            # Sem chave o serviço não foi iniciado por este app (ver iniciar_servico)
+            return None
+        try:
+            with Client(self.endereco, authkey=self.chave) as conn:
+                conn.send(mensagem)
+                if not conn.poll(timeout):
+                    logger.warning("[OCR] Serviço não respondeu em %ss", timeout)
+                    return None
+                return conn.recv()
+        except (OSError, EOFError, multiprocessing.AuthenticationError):
+            return None
+
+    def reconhecer(self, imagem: bytes) -> list | None:
+        """
+        Executa o OCR no serviço.
+
+        Returns:
+            Lista de (bbox, texto, confiança) ou None se o serviço estiver
+            indisponível (o chamador usa o reader local)
+        """
+        if not self.ativo:
+            return None
+        resposta = self._enviar({'tipo': 'ocr', 'imagem': imagem}, self.timeout)
+        if resposta is None:
+            return None
+        if not resposta.get('ok'):
+            logger.error("[OCR] Erro no serviço: %s", resposta.get('erro'))
+            return None
+        return resposta['itens']
+
+    def encerrar(self):
+        """Pede ao serviço que encerre o pool e o processo."""
+        self._enviar({'tipo': 'encerrar'}, 1)
+
+    def health(self) -> dict:
+        """Consulta o estado do serviço."""
+        if not self.ativo:
+            return {'status': 'desativado'}
+        resposta = self._enviar({'tipo': 'ping'}, 5)
+        if resposta is None:
+            return {'status': 'indisponivel'}
+        resposta.pop('ok', None)
+        return resposta
+
+
+def iniciar_servico() -> subprocess.Popen | None:
+    """
+    Inicia o serviço em um processo separado (chamado pelo app.py).
+
+    Roda como `python -m src.processing.ocr_service` para que o processo e
+    seus workers não importem a aplicação FastAPI. Sem AGILIZA_OCR_CHAVE, gera
+    uma chave aleatória e a coloca no ambiente, herdado pelo serviço e pelos
+    workers uvicorn.
+
+    Returns:
+        Processo do serviço, ou None se desativado, sem EasyOCR, com a chave
+        padrão pública ou já em execução
+    """
+    if not OCR_SERVICO_ATIVO:
+        return None
+    if not easyocr_instalado():
+        logger.warning("[OCR] EasyOCR não instalado; serviço de OCR não iniciado")
+        return None
+
+    chave = OCR_SERVICO_CHAVE
+    if chave == _CHAVE_PUBLICA:
+        logger.error("[OCR] AGILIZA_OCR_CHAVE com a chave padrão pública; serviço de OCR não iniciado")
+        return None
+    if not chave:
+        chave = secrets.token_hex(32)
+        os.environ['AGILIZA_OCR_CHAVE'] = chave
+        cliente_ocr.chave = chave.encode('utf-8')
+    if cliente_ocr.health()['status'] != 'indisponivel':
+        logger.info("[OCR] Serviço de OCR já em execução")
+        return None
+
+    return subprocess.Popen([sys.executable, '-m', 'src.processing.ocr_service'], cwd=BASE_DIR)
+
+
+def parar_servico(processo: subprocess.Popen):
+    """Encerra o serviço iniciado por `iniciar_servico`."""
+    cliente_ocr.encerrar()
+    try:
+        processo.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        processo.terminate()
+        processo.wait()
+
+
+def _encerrar_por_sinal(signum, frame):
+    raise SystemExit(0)
+
+
+def _executar_servico():
+    signal.signal(signal.SIGTERM, _encerrar_por_sinal)
+    ServicoOCR().executar()
+
+
+# Cliente compartilhado pelo processador de imagens
+cliente_ocr = ClienteOCR()
+
+
+if __name__ == '__main__':
+    try:
+        _executar_servico()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,100 @@
+"""Iteração de páginas de PDF com memória limitada.
+
+O pdfplumber guarda em cada objeto de página os caracteres, linhas e o layout
+já extraídos (extract_text/extract_tables), e o PDF mantém a lista de todas as
+páginas até ser fechado. Percorrer um PDF grande com `for pagina in pdf.pages`
+faz a memória crescer com o número de páginas (~3 MB por página de pedido).
+`iterar_paginas` libera o cache de cada página assim que ela sai da janela de
+páginas em uso, e mede o tempo de cada página (abertura + o que o processador
+faz com ela até pedir a próxima) no histograma agiliza_pdf_pagina_segundos.
+
+`LayoutPagina` guarda o que os processadores extraem de cada página (texto e
+tabelas), para que o processador especializado e o genérico que o segue sobre
+o mesmo documento não extraiam a página de novo.
+"""
+
+import time
+from collections import deque
+from functools import cached_property
+
+from src.config.settings import PDF_JANELA_PAGINAS
+from src.utils.metricas import metricas
+
+
+def iterar_paginas(pdf, inicio: int = 0, fim: int | None = None, janela: int = PDF_JANELA_PAGINAS):
+    """
+    Percorre as páginas [inicio, fim) de um PDF aberto com pdfplumber.
+
+    As `janela` últimas páginas entregues continuam com o cache intacto (para
+    quem consulta a página anterior); as mais antigas são fechadas
+    (Page.close) e o restante das páginas é fechado ao fim da iteração.
+
+    Yields:
+        (num_pagina, pagina) - num_pagina começa em 0
+    """
+    paginas = pdf.pages
+    fim = len(paginas) if fim is None else min(fim, len(paginas))
+    em_uso = deque()
+    try:
+        for num_pagina in range(inicio, fim):
+            inicio_pagina = time.perf_counter()
+            pagina = paginas[num_pagina]
+            em_uso.append(pagina)
+            while len(em_uso) > max(1, janela):
+                em_uso.popleft().close()
+            try:
+                yield num_pagina, pagina
+            finally:
+                # Rótulos (processador, extensão) vêm do contexto definido pelo executor
+                metricas.observar('agiliza_pdf_pagina_segundos', time.perf_counter() - inicio_pagina)
+    finally:
+        for pagina in em_uso:
+            pagina.close()
+
+
+class LayoutPagina:
+    """
+    Texto e tabelas de uma página, extraídos uma vez e guardados.
+
+    Só os resultados ficam no objeto; os caracteres continuam no cache da
+    página do pdfplumber e são liberados quando a página é fechada.
+    """
+
+    def __init__(self, pagina):
+        self.pagina = pagina
+
+    @cached_property
+    def texto(self) -> str:
+        """Texto da página, igual a `pagina.extract_text()`."""
+        return self.pagina.extract_text()
+
+    @cached_property
+    def tabelas(self) -> list[list[list[str | None]]]:
+        """Grades das tabelas da página (`pagina.extract_tables()`)."""
+        return self.pagina.extract_tables()
+
+
+def iterar_layouts(pdf, inicio: int = 0, fim: int | None = None, janela: int = PDF_JANELA_PAGINAS,
+                   layouts: dict | None = None):
+    """
+    Como `iterar_paginas`, mas entrega o `LayoutPagina` de cada página.
+
+    Args:
+        layouts: Cache opcional {num_pagina: LayoutPagina}; layouts já
+            presentes são reaproveitados com o que já foi extraído
+
+    Yields:
+        (num_pagina, layout) - num_pagina começa em 0
+    """
+    for num_pagina, pagina in iterar_paginas(pdf, inicio, fim, janela):
+        if layouts is None:
+            yield num_pagina, LayoutPagina(pagina)
+            continue
+        if num_pagina not in layouts:
+            layouts[num_pagina] = LayoutPagina(pagina)
+        yield num_pagina, layouts[num_pagina]
+
+
+def texto_documento(pdf, layouts: dict | None = None) -> str:
+    """Texto de todas as páginas, cada uma seguida de quebra de linha (páginas sem texto são puladas)."""
+    return ''.join(layout.texto + '\n' for _, layout in iterar_layouts(pdf, layouts=layouts) if layout.texto)
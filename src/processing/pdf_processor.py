@@ -1,12 +1,28 @@
 """Processador de arquivos PDF."""
 
-import re
-from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-import pdfplumber
+from src.config.settings import PDF_PARALELO_MIN_PAGINAS, PDF_PARALELO_PROCESSOS
 from src.processing.base import FileProcessor
+from src.processing.documento import DocumentoCarregado
+from src.processing.pdf_paginas import LayoutPagina
 from src.utils.constants import EXCEL_COLUMNS
 from src.utils.validators import extract_cnpj, extract_all_cnpjs, extract_ean13, normalizar_preco, extract_multiplicador_fardos, extract_numero_pedido
+from src.utils import patterns
+from src.utils.metricas import metricas
+from src.utils.patterns import (
+    LETRA, VALOR_MONETARIO, PDF_UN_1_X, PDF_APOS_EAN, PDF_NUMERO_INICIAL, PDF_DESCRICOES, EAN_DELIMITADO,
+)
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+
+def _processar_intervalo(file_content: bytes, inicio: int, fim: int) -> tuple[list, dict, dict]:
+    """Executado no pool: extrai os produtos de um intervalo de páginas (e devolve os contadores de regex e métricas)."""
+    with metricas.contexto(processador='pdf', extensao='pdf'):
+        produtos = PDFProcessor()._processar_intervalo(file_content, inicio, fim)
+    return produtos, patterns.coletar_estatisticas(), metricas.coletar()
 
 
 class PDFProcessor(FileProcessor):
@@ -14,59 +30,47 @@ class PDFProcessor(FileProcessor):
 
     def process(self, file_content: bytes, filename: str = None) -> pd.DataFrame | None:
         """Processa PDF e extrai dados de pedidos."""
+        with DocumentoCarregado(file_content, filename) as documento:
+            return self.processar_documento(documento)
+
+    def processar_documento(self, documento: DocumentoCarregado) -> pd.DataFrame | None:
+        """Processa o PDF do upload já carregado (páginas já lidas são reaproveitadas)."""
         try:
-            return self._extract_data(file_content)
+            return self._extract_data(documento)
         except Exception as e:
-            print(f"Erro ao processar PDF: {e}")
+            logger.error("Erro ao processar PDF: %s", e)
+            self.falhou = True
             return None
 
-    def _extract_data(self, file_content: bytes) -> pd.DataFrame | None:
+    def _extract_data(self, documento: DocumentoCarregado) -> pd.DataFrame | None:
         """Extrai dados do PDF, detectando CNPJ por seção/página quando possível."""
-        produtos = []
+        produtos = None
         numero_pedido_global = ''
         
-        with pdfplumber.open(BytesIO(file_content)) as pdf:
-            # Tenta extrair número do pedido do documento inteiro (primeira vez)
-            if not numero_pedido_global and len(pdf.pages) > 0:
-                primeira_pagina = pdf.pages[0]
-                texto_primeira = primeira_pagina.extract_text()
-                if texto_primeira:
-                    numero_pedido_global = extract_numero_pedido(texto_primeira) or ''
-                    if numero_pedido_global:
-                        print(f"[PDF PROCESSOR] Número do Pedido detectado: {numero_pedido_global}")
-            
+        total_paginas = documento.total_paginas
+        
+        # Tenta extrair número do pedido do documento inteiro (primeira vez)
+        if not numero_pedido_global and total_paginas > 0:
+            texto_primeira = documento.layout(0).texto
+            if texto_primeira:
+                numero_pedido_global = extract_numero_pedido(texto_primeira) or ''
+                if numero_pedido_global:
+                    logger.debug("[PDF PROCESSOR] Número do Pedido detectado: %s", numero_pedido_global)
+        
+        if self._usar_paralelo(total_paginas):
+            produtos = self._extrair_paginas_paralelo(documento.conteudo, total_paginas)
+        
+        if produtos is None:
             # Processa cada página, detectando CNPJ no contexto da página
-            for num_pagina, pagina in enumerate(pdf.pages):
-                print(f"\n[PDF PROCESSOR] Processando página {num_pagina + 1} de {len(pdf.pages)}")
-                
-                # Extrair CNPJ da página atual
-                texto_pagina = pagina.extract_text()
-                cnpj_pagina = ''
-                if texto_pagina:
-                    cnpj_pagina = extract_cnpj(texto_pagina)
-                    if cnpj_pagina:
-                        print(f"[PDF PROCESSOR] CNPJ detectado na página: {cnpj_pagina}")
-                
-                # Tenta extrair de tabelas estruturadas
-                tables = pagina.extract_tables()
-                if tables:
-                    print(f"[PDF PROCESSOR] {len(tables)} tabela(s) encontrada(s) na página")
-                    for idx_tabela, table in enumerate(tables):
-                        produtos_tabela = self._extrair_de_tabela(table, cnpj_pagina)
-                        print(f"[PDF PROCESSOR] Tabela {idx_tabela + 1}: {len(produtos_tabela)} produtos extraídos")
-                        produtos.extend(produtos_tabela)
-                else:
-                    # Se não houver tabelas, tenta texto
-                    if texto_pagina:
-                        produtos_texto = self._extrair_produtos(texto_pagina, cnpj_pagina)
-                        print(f"[PDF PROCESSOR] Texto: {len(produtos_texto)} produtos extraídos")
-                        produtos.extend(produtos_texto)
+            produtos = []
+            for num_pagina, layout in documento.layouts():
+                produtos.extend(self._processar_pagina(layout, num_pagina, total_paginas))
         
         if not produtos:
-            print("[PDF PROCESSOR] Nenhum produto encontrado!")
+            logger.warning("[PDF PROCESSOR] Nenhum produto encontrado!")
             return None
         
-        print(f"\n[PDF PROCESSOR] Total de {len(produtos)} produtos extraídos")
+        logger.info("[PDF PROCESSOR] Total de %s produtos extraídos", len(produtos))
         
         # Cria DataFrame com os produtos
         dados = []
@@ -99,6 +103,87 @@ class PDFProcessor(FileProcessor):
         
         return df
 
+    def _processar_pagina(self, layout: LayoutPagina, num_pagina: int, total_paginas: int) -> list:
+        """Extrai os produtos de uma página, com o CNPJ encontrado nela."""
+        logger.debug("[PDF PROCESSOR] Processando página %s de %s", num_pagina + 1, total_paginas)
+        produtos = []
+        
+        # Extrair CNPJ da página atual
+        texto_pagina = layout.texto
+        cnpj_pagina = ''
+        if texto_pagina:
+            cnpj_pagina = extract_cnpj(texto_pagina)
+            if cnpj_pagina:
+                logger.debug("[PDF PROCESSOR] CNPJ detectado na página: %s", cnpj_pagina)
+        
+        # Tenta extrair de tabelas estruturadas
+        tables = layout.tabelas
+        if tables:
+            logger.debug("[PDF PROCESSOR] %s tabela(s) encontrada(s) na página", len(tables))
+            for idx_tabela, table in enumerate(tables):
+                produtos_tabela = self._extrair_de_tabela(table, cnpj_pagina)
+                logger.debug("[PDF PROCESSOR] Tabela %s: %s produtos extraídos", idx_tabela + 1, len(produtos_tabela))
+                produtos.extend(produtos_tabela)
+        else:
+            # Se não houver tabelas, tenta texto
+            if texto_pagina:
+                produtos_texto = self._extrair_produtos(texto_pagina, cnpj_pagina)
+                logger.debug("[PDF PROCESSOR] Texto: %s produtos extraídos", len(produtos_texto))
+                produtos.extend(produtos_texto)
+        
+        return produtos
+
+    def _processar_intervalo(self, file_content: bytes, inicio: int, fim: int) -> list:
+        """Abre o PDF e extrai os produtos das páginas [inicio, fim)."""
+        produtos = []
+        with DocumentoCarregado(file_content) as documento:
+            total_paginas = documento.total_paginas
+            for num_pagina, layout in documento.layouts(inicio, fim):
+                produtos.extend(self._processar_pagina(layout, num_pagina, total_paginas))
+        return produtos
+
+    @staticmethod
+    def _usar_paralelo(total_paginas: int) -> bool:
+        """PDFs grandes têm as páginas divididas entre processos."""
+        return (PDF_PARALELO_MIN_PAGINAS > 0 and PDF_PARALELO_PROCESSOS > 1
+                and total_paginas >= PDF_PARALELO_MIN_PAGINAS)
+
+    def _extrair_paginas_paralelo(self, file_content: bytes, total_paginas: int) -> list | None:
+        """
+        Divide as páginas em intervalos contíguos e processa cada intervalo em um
+        processo, que abre o PDF por conta própria.
+        
+        Como o CNPJ é detectado por página, os intervalos são independentes; os
+        resultados são concatenados na ordem das páginas.
+        
+        Returns:
+            Lista de produtos, ou None se o pool falhar (o chamador processa em série)
+        """
+        # Dois intervalos por processo equilibram páginas com mais e menos itens
+        partes = min(total_paginas, PDF_PARALELO_PROCESSOS * 2)
+        limites = [round(i * total_paginas / partes) for i in range(partes + 1)]
+        intervalos = list(zip(limites[:-1], limites[1:]))
+        logger.debug("[PDF PROCESSOR] %s páginas em %s intervalos (%s processos)",
+                     total_paginas, len(intervalos), PDF_PARALELO_PROCESSOS)
+        
+        # Pool por arquivo: um pool mantido vivo dentro de um worker do executor
+        # impede o worker de encerrar no shutdown; criar os processos custa ~10ms
+        try:
+            with ProcessPoolExecutor(max_workers=min(PDF_PARALELO_PROCESSOS, len(intervalos))) as pool:
+                resultados = pool.map(
+                    _processar_intervalo, [file_content] * len(intervalos),
+                    [inicio for inicio, _ in intervalos], [fim for _, fim in intervalos],
+                )
+                produtos = []
+                for produtos_intervalo, contadores, observacoes in resultados:
+                    produtos.extend(produtos_intervalo)
+                    patterns.mesclar_estatisticas(contadores)
+                    metricas.mesclar(observacoes)
+            return produtos
+        except Exception as e:
+            logger.warning("[PDF PROCESSOR] Erro no processamento paralelo: %s. Processando em série...", e)
+            return None
+
     def _extrair_de_tabela(self, table: list, cnpj_pagina: str = '') -> list:
         """Extrai produtos de uma tabela estruturada."""
         produtos = []
@@ -107,7 +192,7 @@ class PDFProcessor(FileProcessor):
             if not s:
                 return None
             txt = str(s).strip()
-            if re.search(r'[A-Za-z]', txt):
+            if LETRA.search(txt):
                 return None
             try:
                 val = int(float(txt.replace('.', '').replace(',', '')))
@@ -119,7 +204,7 @@ class PDFProcessor(FileProcessor):
             if not s:
                 return None
             txt = str(s).strip()
-            m = re.search(r"\d{1,3}(?:\.\d{3})*,\d{2}|\d+,\d{2}|\d+\.\d{2}", txt)
+            m = VALOR_MONETARIO.search(txt)
             return normalizar_preco(m.group(0)) if m else None
 
         for row in table:
@@ -187,7 +272,7 @@ class PDFProcessor(FileProcessor):
             qtd = 1
             preco_unit = 0.0
             
-            m = re.search(r'\bUN\s+1\s+X\s+\d+\s+(\d+)\s+([\d,\.]+)', linha, re.IGNORECASE)
+            m = PDF_UN_1_X.search(linha)
             if m:
                 try:
                     qtd = int(m.group(1))
@@ -195,7 +280,7 @@ class PDFProcessor(FileProcessor):
                 except:
                     pass
             else:
-                m = re.search(rf"0?{ean}\s+(.+?)\s+(\d{{1,4}})\s+([\d.,]+)", linha)
+                m = self._buscar_apos_ean(linha, ean)
                 if m:
                     try:
                         qtd = int(m.group(2))
@@ -204,13 +289,13 @@ class PDFProcessor(FileProcessor):
                         qtd = self._extrair_quantidade(linha)
 
             desc = ''
-            ean_match = re.search(rf'\b0?{ean}\b', linha)
+            ean_match = next((m for m in EAN_DELIMITADO.finditer(linha) if m.group(1) == ean), None)
             if ean_match:
                 resto = linha[ean_match.end():].strip()
-                resto = re.sub(r'^\d+\s+', '', resto)
+                resto = PDF_NUMERO_INICIAL.sub('', resto)
                 
-                for pattern in [r'(.+?)\s+UN\b', r'(.+?)\s+1\s+X\b', r'(.+?)\s+[\d,\.]+\s+[\d,\.]+']:
-                    md = re.match(pattern, resto, re.IGNORECASE)
+                for pattern in PDF_DESCRICOES:
+                    md = pattern.match(resto)
                     if md:
                         desc = md.group(1).strip()
                         break
@@ -226,6 +311,21 @@ class PDFProcessor(FileProcessor):
 
         return produtos
 
+    @staticmethod
+    def _buscar_apos_ean(linha: str, ean: str):
+        """
+        Descrição, quantidade e preço logo após o EAN (primeira ocorrência em que casam).
+        
+        Equivale a `re.search(rf"0?{ean}\s+(.+?)\s+(\d{{1,4}})\s+([\d.,]+)", linha)`
+        com a regex compilada uma vez; os grupos 1-3 são os mesmos.
+        """
+        pos = linha.find(ean)
+        while pos >= 0:
+            if m := PDF_APOS_EAN.match(linha, pos + len(ean)):
+                return m
+            pos = linha.find(ean, pos + 1)
+        return None
+
     def _extrair_quantidade(self, linha: str) -> int:
         """Extrai quantidade de uma linha."""
         partes = ' '.join(linha.split()).split()
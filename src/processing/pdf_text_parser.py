@@ -1,9 +1,11 @@
 """Parser genérico para PDFs em formato textual."""
 
-import re
 import pandas as pd
 from typing import List, Dict, Optional
 from src.utils.validators import extract_cnpj, extract_ean13, normalizar_preco, extract_multiplicador_fardos
+from src.utils.patterns import (
+    CNPJ_FORMATADO, EAN_PREFIXO, VALOR_DECIMAL, TEXTO_QTDE_ISOLADA, TEXTO_PRECO_ESPACO, TEXTO_NUMERO_ESPACO,
+)
 
 
 class PDFTextParser:
@@ -36,7 +38,7 @@ class PDFTextParser:
         
         # Extrair CNPJ do texto se não foi fornecido
         if not cnpj_hint:
-            cnpj_matches = re.findall(r'\d{2}\.\d{3}\.\d{3}/0\d{3}-\d{2}', texto[:500])
+            cnpj_matches = CNPJ_FORMATADO.findall(texto[:500])
             if cnpj_matches:
                 cnpj_hint = cnpj_matches[0]
         
@@ -56,7 +58,7 @@ class PDFTextParser:
                 break
             
             # Procurar por EAN (13 dígitos começando com 3-8)
-            if re.search(r'\b[3678]\d{12}\b', linha):
+            if EAN_PREFIXO.search(linha):
                 produto = PDFTextParser._parse_linha_produto(linha, cnpj_hint)
                 if produto:
                     dados.append(produto)
@@ -72,7 +74,7 @@ class PDFTextParser:
         try:
             # Procurar por EAN (13 dígitos que começam com 3, 6, 7 ou 8)
             # Padrão brasileiro: 78XXXXXXXXXXX, 38XXXXXXXXXXX, 69XXXXXXXXXXX, 79XXXXXXXXXXX, etc
-            ean_match = re.search(r'\b([3678]\d{12})\b', linha)
+            ean_match = EAN_PREFIXO.search(linha)
             if not ean_match:
                 return None
             
@@ -87,8 +89,7 @@ class PDFTextParser:
             # Os números com virgula são preços
             
             # Primeiro, procurar preços (números com vírgula/ponto)
-            preco_pattern = r'(\d+[.,]\d{2})'
-            precos = re.findall(preco_pattern, after_ean)
+            precos = VALOR_DECIMAL.findall(after_ean)
             
             preco = None
             if precos:
@@ -101,8 +102,7 @@ class PDFTextParser:
             
             # Procurar por quantidade (número inteiro pequeno, 1-999)
             qtde = 1
-            qtde_pattern = r'\s(\d{1,3})\s'
-            qtde_matches = re.findall(qtde_pattern, ' ' + after_ean + ' ')
+            qtde_matches = TEXTO_QTDE_ISOLADA.findall(' ' + after_ean + ' ')
             
             for match_qtde in qtde_matches:
                 try:
@@ -115,8 +115,8 @@ class PDFTextParser:
             
             # Descrição é tudo entre EAN e a quantidade
             # Estratégia: limpar tudo que vem depois (números, preços)
-            desc = re.sub(r'\s+\d+[.,]\d{2}', '', after_ean)  # Remove preços
-            desc = re.sub(r'\s+\d+\s+', ' ', desc)  # Remove quantidade
+            desc = TEXTO_PRECO_ESPACO.sub('', after_ean)  # Remove preços
+            desc = TEXTO_NUMERO_ESPACO.sub(' ', desc)  # Remove quantidade
             desc = desc.strip()
             
             # Limitar a 100 caracteres (proteção contra quebras de linha)
@@ -0,0 +1,328 @@
+"""Pipeline de processamento de arquivos compartilhado pelo upload direto e pelos jobs."""
+
+from datetime import datetime
+import asyncio
+import logging
+import time
+import pandas as pd
+
+from src.processing.factory import get_processor, get_processor_class, PROCESSOR_CLASSES
+from src.processing.executor import processor_executor
+from src.processing.cache import result_cache, hash_conteudo
+from src.utils.validators import validate_file, validate_ean13_array, validate_cnpj_array
+from src.config.model_processor_mapping import (
+    detect_model_from_filename,
+    get_processor_for_model,
+)
+from src.utils.metricas import metricas
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+# Processadores genéricos, criados sob demanda (o módulo só é importado no primeiro uso)
+generic_processors = {}
+
+# Cache de processadores especializados
+specialized_processors = {}
+
+def get_generic_processor(processor_type: str):
+    """Obtém a instância do processador genérico, criando-a no primeiro uso."""
+    if processor_type not in generic_processors:
+        generic_processors[processor_type] = get_processor(processor_type)
+    return generic_processors[processor_type]
+
+
+def get_available_processor(detected_model: str, file_ext: str):
+    """
+    Obtém o processador apropriado: especializado se disponível, senão genérico.
+    
+    Args:
+        detected_model: Modelo detectado (ex: 'BIOMAXFARMA')
+        file_ext: Extensão do arquivo (ex: 'xlsx')
+    
+    Returns:
+        Tuple (processor, processor_type, is_specialized)
+    """
+    model_upper = detected_model.upper()
+    processor_config = get_processor_for_model(model_upper, file_ext)
+    processor_type = processor_config['processor']
+    
+    logger.debug("[GET_PROCESSOR] Modelo: %s, Extensão: %s", model_upper, file_ext)
+    logger.debug("[GET_PROCESSOR] Tipo configurado: %s", processor_type)
+    
+    # Tenta usar processador especializado
+    if processor_type in PROCESSOR_CLASSES:
+        # Verifica se é um processador especializado (não genérico)
+        if processor_type not in ['pdf', 'txt', 'excel', 'image']:
+            if processor_type not in specialized_processors:
+                specialized_processors[processor_type] = get_processor(processor_type)
+            processor_instance = specialized_processors[processor_type]
+            if processor_instance:
+                logger.debug("[GET_PROCESSOR] ✓ Usando processador ESPECIALIZADO: %s", processor_type)
+                return processor_instance, processor_type, True
+    
+    # Fallback para processadores genéricos
+    if processor_type in ['pdf', 'txt', 'excel', 'image', 'labotrat']:
+        logger.debug("[GET_PROCESSOR] ✓ Usando processador genérico: %s", processor_type)
+        return get_generic_processor(processor_type), processor_type, False
+    
+    # Fallback final
+    logger.warning("[GET_PROCESSOR] ⚠ Fallback to excel")
+    return get_generic_processor('excel'), 'excel', False
+
+
+def _chave_cache(processor_type: str, file_ext: str, conteudo_hash: str) -> str:
+    processor_class = get_processor_class(processor_type)
+    versao = getattr(processor_class, 'VERSION', '1')
+    return result_cache.montar_chave(conteudo_hash, file_ext, processor_type, versao)
+
+
+async def executar_com_cache(tipos: list[str], file_content: bytes, filename: str,
+                             file_ext: str, conteudo_hash: str) -> tuple[pd.DataFrame | None, str]:
+    """
+    Executa os processadores em ordem (especializado, depois genérico) até um
+    extrair dados, consultando antes o cache de resultados de cada um.
+    
+    Os que não estão no cache vão juntos para o executor, que carrega o
+    arquivo uma vez para todos (ver executor.executar_processadores).
+    
+    O DataFrame é guardado exatamente como o processador o devolveu, antes de
+    processar_modelo, então o mesmo cache atende winthor e planilha. Execuções
+    em que o processador falhou (FileProcessor.falhou, ex: OCR fora do ar) não são
+    guardadas, para a próxima tentativa rodar de novo.
+    
+    Returns:
+        Tuple (dataframe, tipo do processador que o produziu ou o último tentado)
+    """
+    dataframe, processor_type = None, tipos[0]
+    for indice, processor_type in enumerate(tipos):
+        chave = _chave_cache(processor_type, file_ext, conteudo_hash)
+        encontrado, dataframe = await asyncio.to_thread(result_cache.obter, chave)
+        if not encontrado:
+            resultados = await processor_executor.executar_em_sequencia(
+                tipos[indice:], file_content, filename, file_ext
+            )
+            for processor_type, dataframe, falhou in resultados:
+                if falhou:
+                    logger.warning("[CACHE] %s falhou em %s; resultado não guardado", processor_type, filename)
+                    continue
+                await asyncio.to_thread(
+                    result_cache.guardar, _chave_cache(processor_type, file_ext, conteudo_hash), dataframe
+                )
+            return dataframe, processor_type
+
+        logger.debug("[CACHE] ✓ Resultado reaproveitado: %s (%s)", filename, processor_type)
+        if dataframe is not None and not dataframe.empty:
+            break
+    return dataframe, processor_type
+
+
+async def processar_arquivo(filename: str, file_content: bytes, model: str) -> tuple:
+    """
+    Processa um único arquivo (upload direto ou job).
+    
+    Returns:
+        Tuple (dataframe, info, erro) - dataframe/info são None quando há erro
+    """
+    try:
+        # Validação
+        is_valid, error_msg = validate_file(filename, len(file_content))
+        if not is_valid:
+            return None, None, error_msg
+
+        # ===== DETECÇÃO DE MODELO E ROTEAMENTO =====
+        inicio = time.perf_counter()
+        detected_model = detect_model_from_filename(filename)
+        file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else 'unknown'
+        processor_config = get_processor_for_model(detected_model, file_ext)
+        processor_type = processor_config['processor']
+        processor_desc = processor_config['description']
+        
+        logger.info("[ROTEAMENTO] Arquivo: %s | modelo: %s | processador: %s - %s",
+                    filename, detected_model, processor_type, processor_desc)
+        
+        # Obtém o processador apropriado
+        _, actual_processor_type, is_specialized = get_available_processor(detected_model, file_ext)
+        rotulos = {'processador': actual_processor_type, 'extensao': file_ext}
+        metricas.observar('agiliza_etapa_segundos', time.perf_counter() - inicio, etapa='deteccao', **rotulos)
+        
+        if is_specialized:
+            logger.debug("[ROTEAMENTO] ✓ Usando processador ESPECIALIZADO para %s", detected_model)
+        
+        # Se o especializado não extrair nada, tenta o genérico sobre o mesmo documento carregado
+        tipos = [actual_processor_type]
+        if is_specialized:
+            generic_processor_type = get_processor_for_model('GENERIC', file_ext)['processor']
+            if generic_processor_type != actual_processor_type:
+                tipos.append(generic_processor_type)
+        
+        # Processamento fora do event loop (thread pool ou process pool), com cache por conteúdo
+        # (inclui cache, fila e a execução do especializado e do fallback, medidos à parte)
+        with metricas.medir('agiliza_etapa_segundos', etapa='processamento', **rotulos):
+            conteudo_hash = await asyncio.to_thread(hash_conteudo, file_content)
+            dataframe, _ = await executar_com_cache(tipos, file_content, filename, file_ext, conteudo_hash)
+        
+        if dataframe is None or dataframe.empty:
+            return None, None, f'{filename}: Nenhum dado extraído'
+
+        # DEBUG: Mostrar dados logo após processador (só monta os dumps se o nível estiver ativo)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[UPLOAD] Após processador (%s):", filename)
+            logger.debug("[UPLOAD] Colunas: %s", list(dataframe.columns))
+            if 'QTDE' in dataframe.columns:
+                logger.debug("[UPLOAD] QTDE (primeiras 3): %s", dataframe['QTDE'].head(3).tolist())
+            if 'PREÇO' in dataframe.columns:
+                logger.debug("[UPLOAD] PREÇO (primeiras 3): %s", dataframe['PREÇO'].head(3).tolist())
+            logger.debug("[UPLOAD] Shape: %s", dataframe.shape)
+            logger.debug("[UPLOAD] Dtypes:\n%s", dataframe.dtypes)
+
+        with metricas.medir('agiliza_etapa_segundos', etapa='validacao', **rotulos):
+            validacao = validar_identificadores(dataframe)
+
+        # Adiciona coluna com informação do modelo e processador
+        dataframe['MODELO'] = detected_model
+        dataframe['PROCESSADOR'] = processor_type
+        
+        # Processa preços conforme modelo de negócio (winthor ou planilha)
+        with metricas.medir('agiliza_etapa_segundos', etapa='processar_modelo', **rotulos):
+            dataframe = processar_modelo(dataframe, model)
+        
+        # Rastreia qual processador foi usado
+        info = {
+            'arquivo': filename,
+            'modelo': detected_model,
+            'processador': processor_type,
+            'descricao': processor_desc,
+            **validacao
+        }
+        return dataframe, info, None
+
+    except Exception as e:
+        return None, None, f'{filename}: {str(e)}'
+
+
+def _coluna_texto(serie: pd.Series) -> pd.Series:
+    """Coluna como texto sem formatação ('.0' de floats, pontuação e espaços removidos)."""
+    if serie.dtype.kind == 'f':
+        # Só valores inteiros (e que cabem em int64) perdem o '.0'; os demais
+        # (7891000100103.5, inf) seguem como texto e não passam na validação
+        inteiros = (serie.mod(1) == 0) & (serie.abs() < 2 ** 63)
+        serie = serie.where(inteiros).astype('Int64').astype(str).where(inteiros, serie.astype(str))
+    return serie.astype(str).str.replace(r'\D', '', regex=True).fillna('')
+
+
+def validar_identificadores(dataframe: pd.DataFrame) -> dict:
+    """
+    Confere os dígitos verificadores de EAN e CNPJ extraídos, uma operação por coluna.
+    
+    Só informa (log e info do arquivo): as linhas não são removidas, já que
+    alguns pedidos trazem DUN-14 ou códigos internos na coluna de EAN.
+    
+    Returns:
+        Dict com a quantidade de EANs/CNPJs preenchidos que não passaram na validação
+    """
+    resultado = {}
+    for coluna, validar, chave in (('EAN', validate_ean13_array, 'ean_invalidos'),
+                                   ('CNPJ', validate_cnpj_array, 'cnpj_invalidos')):
+        if coluna not in dataframe.columns:
+            continue
+        try:
+            valores = _coluna_texto(dataframe[coluna])
+            preenchidos = (valores != '').to_numpy()
+            invalidos = int((preenchidos & ~validar(valores)).sum())
+        except Exception as e:
+            # Validação só informativa: não rejeita o arquivo
+            logger.warning("[VALIDACAO] %s: não foi possível validar: %s", coluna, e)
+            continue
+        resultado[chave] = invalidos
+        if invalidos:
+            logger.warning("[VALIDACAO] %s: %s de %s com dígito verificador inválido",
+                           coluna, invalidos, int(preenchidos.sum()))
+    return resultado
+
+
+def combinar_resultados(all_dataframes: list[pd.DataFrame]) -> pd.DataFrame:
+    """Combina os DataFrames dos arquivos e mantém apenas as colunas de saída."""
+    # Combina todos os DataFrames
+    combined_df = pd.concat(all_dataframes, ignore_index=True)
+
+    # Garante que DESCRICAO existe (cria se não existir)
+    if 'DESCRICAO' not in combined_df.columns:
+        combined_df['DESCRICAO'] = ''
+
+    # Remove colunas que possam estar vazias ou não essenciais
+    # Mantém todas as colunas que foram adicionadas (PREÇO UNITÁRIO, PREÇO TOTAL, etc)
+    colunas_base = ['MODELO', 'PROCESSADOR', 'CNPJ', 'EAN', 'DESCRICAO', 'QTDE']
+    colunas_finais = [col for col in colunas_base if col in combined_df.columns]
+
+    # Adiciona colunas de preço (pode ser PREÇO, PREÇO UNITÁRIO, PREÇO TOTAL, etc)
+    for col in combined_df.columns:
+        if 'PREÇO' in col and col not in colunas_finais:
+            colunas_finais.append(col)
+
+    combined_df = combined_df[colunas_finais]
+
+    return combined_df
+
+
+def nome_arquivo_saida(extensao: str = 'xlsx') -> str:
+    """Nome do arquivo gerado, no padrão "AgilizaConverter{dd.mm.yyyy}.{extensao}"."""
+    data_atual = datetime.now().strftime("%d.%m.%Y")
+    return f"AgilizaConverter{data_atual}.{extensao}"
+
+
+def processar_modelo(df: pd.DataFrame, model: str) -> pd.DataFrame:
+    """Processa o DataFrame conforme o modelo escolhido."""
+    try:
+        df = df.copy()
+        
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("[PROCESSA_MODELO] Model: %s", model)
+            logger.debug("[PROCESSA_MODELO] Colunas antes: %s", list(df.columns))
+            logger.debug("[PROCESSA_MODELO] QTDE antes: %s", df['QTDE'].head(3).tolist() if 'QTDE' in df.columns else 'N/A')
+            logger.debug("[PROCESSA_MODELO] PREÇO antes: %s", df['PREÇO'].head(3).tolist() if 'PREÇO' in df.columns else 'N/A')
+        
+        # Remove PEDIDO e CODCLI se existirem
+        df = df.drop(columns=['PEDIDO', 'CODCLI'], errors='ignore')
+        
+        if model == 'winthor':
+            # Preço sempre em branco
+            if 'PREÇO' in df.columns:
+                df['PREÇO'] = ''
+            if 'VALOR_TOTAL' in df.columns:
+                df['VALOR_TOTAL'] = ''
+            # Reordena colunas
+            colunas = ['CNPJ', 'EAN', 'DESCRICAO', 'QTDE']
+            df = df[[col for col in colunas if col in df.columns]]
+        elif model == 'planilha':
+            # Usa PREÇO como PREÇO UNITÁRIO
+            if 'PREÇO' in df.columns and 'QTDE' in df.columns:
+                # Renomeia PREÇO para PREÇO UNITÁRIO
+                df.rename(columns={'PREÇO': 'PREÇO UNITÁRIO'}, inplace=True)
+                
+                if debug:
+                    logger.debug("[PROCESSA_MODELO] Após rename:")
+                    logger.debug("[PROCESSA_MODELO] PREÇO UNITÁRIO: %s", df['PREÇO UNITÁRIO'].head(3).tolist())
+                
+                # Reordena as colunas
+                colunas = ['CNPJ', 'EAN', 'DESCRICAO', 'QTDE', 'PREÇO UNITÁRIO']
+                colunas_existentes = [col for col in colunas if col in df.columns]
+                logger.debug("[PROCESSA_MODELO] Colunas a selecionar: %s", colunas_existentes)
+                df = df[colunas_existentes]
+                
+                # Ajusta nome para atender ao solicitado: PREÇO UNIT.
+                df.rename(columns={'PREÇO UNITÁRIO': 'PREÇO UNIT.'}, inplace=True)
+            else:
+                # Se não tem PREÇO/QTDE, reordena mesmo assim
+                colunas = ['CNPJ', 'EAN', 'DESCRICAO', 'QTDE', 'PREÇO']
+                df = df[[col for col in colunas if col in df.columns]]
+        
+        if debug:
+            logger.debug("[PROCESSA_MODELO] Colunas após: %s", list(df.columns))
+            logger.debug("[PROCESSA_MODELO] QTDE após: %s", df['QTDE'].head(3).tolist() if 'QTDE' in df.columns else 'N/A')
+        
+        return df
+    except Exception as e:
+        logger.error("[PROCESSA_MODELO] ERRO: %s", e)
+        raise
@@ -1,10 +1,13 @@
 """Processador especializado para Poupaminas."""
 
 import pandas as pd
-from io import BytesIO
 from .base import FileProcessor
+from .documento import DocumentoCarregado
 from .pdf_text_parser import PDFTextParser
 from src.utils.validators import extract_cnpj, extract_ean13, normalizar_preco, extract_multiplicador_fardos
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
 
 
 class PoupaminasProcessor(FileProcessor):
@@ -12,172 +15,68 @@ class PoupaminasProcessor(FileProcessor):
     
     def process(self, file_content: bytes, filename: str = None) -> pd.DataFrame:
         """Processa arquivo Poupaminas e extrai dados estruturados."""
-        print(f"\n[POUPAMINAS] Processando: {filename or 'arquivo'}")
-        
-        try:
-            ext = filename.rsplit('.', 1)[1].lower() if filename and '.' in filename else 'xlsx'
-            
-            if ext in ['xlsx', 'xls']:
-                return self._processar_excel(file_content, ext)
-            elif ext == 'pdf':
-                return self._processar_pdf(file_content)
-            elif ext == 'txt':
-                return self._processar_txt(file_content)
-            else:
-                return None
-                
-        except Exception as e:
-            print(f"[POUPAMINAS] ERRO: {type(e).__name__}: {str(e)}")
-            return None
-    
-    def _processar_excel(self, file_content: bytes, ext: str) -> pd.DataFrame | None:
-        """Processa arquivo Excel Poupaminas."""
-        try:
-            engine = 'openpyxl' if ext == 'xlsx' else 'xlrd'
-            df = pd.read_excel(BytesIO(file_content), engine=engine)
-            df.columns = [str(col).strip() for col in df.columns]
-            return self._extrair_dados(df)
-        except Exception as e:
-            print(f"[POUPAMINAS] ERRO ao processar Excel: {e}")
-            return None
-    
-    def _processar_pdf(self, file_content: bytes) -> pd.DataFrame | None:
-        """Processa arquivo PDF."""
-        try:
-            import pdfplumber
-            
-            with pdfplumber.open(BytesIO(file_content)) as pdf:
-                # Concatenar texto de todas as páginas
-                texto_completo = ''
-                for pagina in pdf.pages:
-                    texto = pagina.extract_text()
-                    if texto:
-                        texto_completo += texto + '\n'
-            
-            # Extrair CNPJ do texto
-            cnpj = extract_cnpj(texto_completo) or ''
-            
-            # Usar parser genérico de texto
-            df = PDFTextParser.extract_data_from_text(texto_completo, cnpj)
-            return df
-        except Exception as e:
-            print(f"[{proc_name.upper()}] ERRO ao processar PDF: {e}")
-            return None
+        with DocumentoCarregado(file_content, filename) as documento:
+            return self.processar_documento(documento)
     
-
-    def process(self, file_content: bytes, filename: str = None) -> pd.DataFrame:
-        """Processa arquivo Poupaminas e extrai dados estruturados."""
-        print(f"\n[POUPAMINAS] Processando: {filename or 'arquivo'}")
+    def processar_documento(self, documento: DocumentoCarregado) -> pd.DataFrame:
+        """Processa o upload já carregado (Excel, PDF ou TXT)."""
+        logger.info("[POUPAMINAS] Processando: %s", documento.nome or 'arquivo')
         
         try:
-            ext = filename.rsplit('.', 1)[1].lower() if filename and '.' in filename else 'xlsx'
+            ext = documento.ext or 'xlsx'
             
             if ext in ['xlsx', 'xls']:
-                return self._processar_excel(file_content, ext)
+                return self._processar_excel(documento, ext)
             elif ext == 'pdf':
-                return self._processar_pdf(file_content)
+                return self._processar_pdf(documento)
             elif ext == 'txt':
-                return self._processar_txt(file_content)
+                return self._processar_txt(documento)
             else:
                 return None
                 
         except Exception as e:
-            print(f"[POUPAMINAS] ERRO: {type(e).__name__}: {str(e)}")
+            logger.error("[POUPAMINAS] ERRO: %s: %s", type(e).__name__, str(e))
+            self.falhou = True
             return None
     
-    def _processar_excel(self, file_content: bytes, ext: str) -> pd.DataFrame | None:
+    def _processar_excel(self, documento: DocumentoCarregado, ext: str) -> pd.DataFrame | None:
         """Processa arquivo Excel Poupaminas."""
         try:
             engine = 'openpyxl' if ext == 'xlsx' else 'xlrd'
-            df = pd.read_excel(BytesIO(file_content), engine=engine)
+            df = documento.planilha(engine).dataframe()
             df.columns = [str(col).strip() for col in df.columns]
             return self._extrair_dados(df)
         except Exception as e:
-            print(f"[POUPAMINAS] ERRO ao processar Excel: {e}")
+            logger.error("[POUPAMINAS] ERRO ao processar Excel: %s", e)
+            self.falhou = True
             return None
     
-    def _processar_pdf(self, file_content: bytes) -> pd.DataFrame | None:
-        """Processa arquivo PDF."""
-        try:
-            import pdfplumber
-            
-            with pdfplumber.open(BytesIO(file_content)) as pdf:
-                # Concatenar texto de todas as páginas
-                texto_completo = ''
-                for pagina in pdf.pages:
-                    texto = pagina.extract_text()
-                    if texto:
-                        texto_completo += texto + '\n'
-            
-            # Extrair CNPJ do texto
-            cnpj = extract_cnpj(texto_completo) or ''
-            
-            # Usar parser genérico de texto
-            df = PDFTextParser.extract_data_from_text(texto_completo, cnpj)
-            return df
-        except Exception as e:
-            print(f"[{proc_name.upper()}] ERRO ao processar PDF: {e}")
-            return None
-    
-
-    def process(self, file_content: bytes, filename: str = None) -> pd.DataFrame:
-        """Processa arquivo Poupaminas e extrai dados estruturados."""
-        print(f"\n[POUPAMINAS] Processando: {filename or 'arquivo'}")
-        
-        try:
-            ext = filename.rsplit('.', 1)[1].lower() if filename and '.' in filename else 'xlsx'
-            
-            if ext in ['xlsx', 'xls']:
-                return self._processar_excel(file_content, ext)
-            elif ext == 'pdf':
-                return self._processar_pdf(file_content)
-            elif ext == 'txt':
-                return self._processar_txt(file_content)
-            else:
-                return None
-                
-        except Exception as e:
-            print(f"[POUPAMINAS] ERRO: {type(e).__name__}: {str(e)}")
-            return None
-    
-    def _processar_excel(self, file_content: bytes, ext: str) -> pd.DataFrame | None:
-        """Processa arquivo Excel Poupaminas."""
-        try:
-            engine = 'openpyxl' if ext == 'xlsx' else 'xlrd'
-            df = pd.read_excel(BytesIO(file_content), engine=engine)
-            df.columns = [str(col).strip() for col in df.columns]
-            return self._extrair_dados(df)
-        except Exception as e:
-            print(f"[POUPAMINAS] ERRO ao processar Excel: {e}")
-            return None
-    
-    def _processar_pdf(self, file_content: bytes) -> pd.DataFrame | None:
+    def _processar_pdf(self, documento: DocumentoCarregado) -> pd.DataFrame | None:
         """Processa arquivo PDF Poupaminas."""
         try:
-            import pdfplumber
             dados = []
             
-            with pdfplumber.open(BytesIO(file_content)) as pdf:
-                for pagina in pdf.pages:
-                    texto = pagina.extract_text()
-                    if not texto:
-                        continue
-                    
-                    cnpj = extract_cnpj(texto) or ''
-                    tables = pagina.extract_tables()
-                    for table in tables or []:
-                        produtos = self._extrair_de_tabela(table, cnpj)
-                        dados.extend(produtos)
+            for _, layout in documento.layouts():
+                texto = layout.texto
+                if not texto:
+                    continue
+                
+                cnpj = extract_cnpj(texto) or ''
+                tables = layout.tabelas
+                for table in tables or []:
+                    produtos = self._extrair_de_tabela(table, cnpj)
+                    dados.extend(produtos)
             
             return pd.DataFrame(dados) if dados else None
         except Exception as e:
-            print(f"[POUPAMINAS] ERRO ao processar PDF: {e}")
+            logger.error("[POUPAMINAS] ERRO ao processar PDF: %s", e)
+            self.falhou = True
             return None
     
-    def _processar_txt(self, file_content: bytes) -> pd.DataFrame | None:
+    def _processar_txt(self, documento: DocumentoCarregado) -> pd.DataFrame | None:
         """Processa arquivo TXT Poupaminas."""
         try:
-            texto = file_content.decode('utf-8', errors='ignore')
+            texto = documento.texto
             linhas = texto.split('\n')
             
             cnpj = extract_cnpj(texto) or ''
@@ -189,7 +88,8 @@ class PoupaminasProcessor(FileProcessor):
             
             return pd.DataFrame(dados) if dados else None
         except Exception as e:
-            print(f"[POUPAMINAS] ERRO ao processar TXT: {e}")
+            logger.error("[POUPAMINAS] ERRO ao processar TXT: %s", e)
+            self.falhou = True
             return None
     
     def _extrair_dados(self, df: pd.DataFrame) -> pd.DataFrame | None:
@@ -213,7 +113,7 @@ class PoupaminasProcessor(FileProcessor):
             # Forçar uso exclusivo da coluna 'Qtd.' para QTDE
             col_qtde = self._buscar_coluna(df.columns, ['Qtd.'])
             if not col_qtde:
-                print("[POUPAMINAS] ERRO: Coluna 'Qtd.' não encontrada. Não será extraída QTDE.")
+                logger.error("[POUPAMINAS] ERRO: Coluna 'Qtd.' não encontrada. Não será extraída QTDE.")
                 return None
             col_preco = self._buscar_coluna(df.columns, ['Preço Compra', 'Preço', 'Custo'])
             
@@ -229,10 +129,10 @@ class PoupaminasProcessor(FileProcessor):
                 if not qtde_raw.isdigit():
                     # Se contém vírgula ou ponto, é erro de extração
                     if ',' in qtde_raw or '.' in qtde_raw:
-                        print(f"[POUPAMINAS] ERRO: QTDE inválida (valor decimal): '{qtde_raw}' na linha com EAN {ean}")
+                        logger.warning("[POUPAMINAS] ERRO: QTDE inválida (valor decimal): '%s' na linha com EAN %s", qtde_raw, ean)
                         continue
                     # Se não é número, também rejeita
-                    print(f"[POUPAMINAS] ERRO: QTDE inválida (não inteiro): '{qtde_raw}' na linha com EAN {ean}")
+                    logger.warning("[POUPAMINAS] ERRO: QTDE inválida (não inteiro): '%s' na linha com EAN %s", qtde_raw, ean)
                     continue
                 qtde = int(qtde_raw)
                 if not ean or not desc or qtde <= 0:
@@ -249,7 +149,8 @@ class PoupaminasProcessor(FileProcessor):
                 })
             return pd.DataFrame(dados) if dados else None
         except Exception as e:
-            print(f"[POUPAMINAS] ERRO ao extrair dados: {e}")
+            logger.error("[POUPAMINAS] ERRO ao extrair dados: %s", e)
+            self.falhou = True
             return None
     
     def _extrair_de_tabela(self, table: list, cnpj: str) -> list:
@@ -265,7 +166,7 @@ class PoupaminasProcessor(FileProcessor):
             idx_qtde = header.index('Qtd.')
             idx_preco = header.index('Preço Compra') if 'Preço Compra' in header else None
         except ValueError as e:
-            print(f"[POUPAMINAS] ERRO: Cabeçalho esperado não encontrado: {e}")
+            logger.error("[POUPAMINAS] ERRO: Cabeçalho esperado não encontrado: %s", e)
             return dados
         for row in table[1:]:
             if not row or len(row) <= max(idx_ean, idx_desc, idx_qtde):
@@ -277,9 +178,9 @@ class PoupaminasProcessor(FileProcessor):
                 # QTDE deve ser inteiro, sem vírgula ou ponto
                 if not qtde_raw.isdigit():
                     if ',' in qtde_raw or '.' in qtde_raw:
-                        print(f"[POUPAMINAS] ERRO: QTDE inválida (valor decimal): '{qtde_raw}' na linha com EAN {ean}")
+                        logger.warning("[POUPAMINAS] ERRO: QTDE inválida (valor decimal): '%s' na linha com EAN %s", qtde_raw, ean)
                         continue
-                    print(f"[POUPAMINAS] ERRO: QTDE inválida (não inteiro): '{qtde_raw}' na linha com EAN {ean}")
+                    logger.warning("[POUPAMINAS] ERRO: QTDE inválida (não inteiro): '%s' na linha com EAN %s", qtde_raw, ean)
                     continue
                 qtde = int(qtde_raw)
                 if not ean or not desc or qtde <= 0:
@@ -295,7 +196,7 @@ class PoupaminasProcessor(FileProcessor):
                     'PREÇO': preco if preco > 0 else None
                 })
             except Exception as e:
-                print(f"[POUPAMINAS] ERRO ao extrair linha de tabela: {e}")
+                logger.warning("[POUPAMINAS] ERRO ao extrair linha de tabela: %s", e)
                 continue
         return dados
     
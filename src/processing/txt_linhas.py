@@ -0,0 +1,96 @@
+"""Leitura de TXT linha a linha, com cada linha classificada uma única vez.
+
+O TXTProcessor decodificava o upload inteiro, montava a lista de linhas e,
+para cada uma, fazia várias chamadas a upper(), buscas de substring e regex
+até decidir o que ela era; nas linhas de produto o EAN ainda era procurado de
+novo pelos extratores de campo. `tokenizar` lê um fluxo de bytes sem montar a
+lista de linhas, faz um único upper() por linha, aplica as mesmas verificações
+de antes na mesma ordem de prioridade e leva o EAN (com a posição) e a linha em
+maiúsculas para os extratores.
+"""
+
+from src.utils.patterns import EAN14_ZERO, EAN_DOIS_PONTOS, EAN_INICIO_LINHA
+from src.utils.validators import extract_ean13
+
+# Tipos de linha
+PEDIDO = 'pedido'
+CNPJ = 'cnpj'
+PRODUTO = 'produto'
+RUIDO = 'ruido'
+
+
+class LinhaTXT:
+    """Linha não vazia do TXT, com o tipo e, nas de produto, o EAN e a posição dele."""
+
+    __slots__ = ('texto', 'upper', 'tipo', 'ean', 'ean_pos', 'winthor')
+
+    def __init__(self, texto: str, upper: str, tipo: str, ean: str | None = None, ean_pos: int = -1):
+        self.texto = texto
+        self.upper = upper
+        self.tipo = tipo
+        self.ean = ean
+        self.ean_pos = ean_pos
+        # Indicador de pedido Winthor (WINTHOR ou coluna LABORATORIO) nesta linha
+        self.winthor = 'WINTHOR' in upper or 'LABORATORIO' in upper
+
+    def __repr__(self):
+        return f"LinhaTXT({self.tipo!r}, {self.texto!r}, ean={self.ean!r})"
+
+
+def iterar_linhas(fluxo):
+    """
+    Linhas de um fluxo de bytes decodificadas como UTF-8 (bytes inválidos ignorados).
+
+    Equivale a `conteudo.decode('utf-8', errors='ignore').split('\\n')` sem a
+    lista: nenhum caractere de várias posições em UTF-8 contém o byte '\\n'.
+    """
+    for bruta in fluxo:
+        yield bruta.decode('utf-8', errors='ignore').removesuffix('\n')
+
+
+def classificar(linha: str) -> LinhaTXT | None:
+    """
+    Classifica uma linha como pedido, CNPJ, produto ou ruído (None se vazia).
+
+    Prioridade: número de pedido (evita "Pedido" de linhas de data, como
+    "Dt. Pedido: 08/01/2026"), CNPJ/Filial e, nas demais, produto quando tem
+    "Código de Barras:", EAN em coluna ':' ou no início da linha, ou um EAN-13
+    em qualquer posição (extract_ean13).
+    """
+    if not linha.strip():
+        return None
+
+    upper = linha.upper()
+    if ("NÚMERO PEDIDO" in upper or "NUMERO PEDIDO" in upper
+            or ("Pedido" in linha and "DT." not in linha and "DATA" not in upper and "EMISSÃO" not in upper)):
+        return LinhaTXT(linha, upper, PEDIDO)
+    if "CNPJ" in linha or "Filial" in linha:
+        return LinhaTXT(linha, upper, CNPJ)
+
+    ean = None
+    if not ("Código de Barras:" in linha or "Codigo de Barras:" in linha
+            or EAN_DOIS_PONTOS.search(linha) or EAN_INICIO_LINHA.match(linha)):
+        ean = extract_ean13(linha)
+        if ean is None:
+            return LinhaTXT(linha, upper, RUIDO)
+
+    # EAN-14 com 0 inicial tem prioridade sobre o EAN-13
+    ean14 = EAN14_ZERO.search(linha)
+    if ean14:
+        ean = ean14.group(1)[1:]
+    elif ean is None:
+        ean = extract_ean13(linha)
+    return LinhaTXT(linha, upper, PRODUTO, ean, linha.find(ean) if ean else -1)
+
+
+def tokenizar(fluxo):
+    """
+    Linhas não vazias do fluxo de bytes, classificadas (ver `classificar`).
+
+    Yields:
+        LinhaTXT, na ordem do arquivo
+    """
+    for linha in iterar_linhas(fluxo):
+        token = classificar(linha)
+        if token is not None:
+            yield token
@@ -1,10 +1,18 @@
 """Processador de arquivos TXT."""
 
-import re
 import pandas as pd
 from src.processing.base import FileProcessor
+from src.processing.documento import DocumentoCarregado
 from src.utils.constants import EXCEL_COLUMNS
-from src.utils.validators import extract_cnpj, is_valid_cnpj, extract_ean13, normalizar_preco, extract_multiplicador_fardos
+from src.utils.validators import extract_cnpj, is_valid_cnpj, normalizar_preco, extract_multiplicador_fardos
+from src.processing.txt_linhas import LinhaTXT, tokenizar, PEDIDO, CNPJ, PRODUTO
+from src.utils.patterns import (
+    fim_ean, VALOR_MONETARIO, TXT_NUMERO_PEDIDO, TXT_DESCRICOES, TXT_PRECOS_COMPLETO,
+    TXT_QTDE_NOVO_FORMATO, TXT_QTDE_TABULAR, TXT_QTDE_COLUNA, TXT_QTDE_ROTULO, TXT_NUMEROS,
+)
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
 
 
 class TXTProcessor(FileProcessor):
@@ -12,48 +20,38 @@ class TXTProcessor(FileProcessor):
 
     def process(self, file_content: bytes, filename: str = None) -> pd.DataFrame | None:
         """Processa TXT e extrai dados."""
+        return self.processar_documento(DocumentoCarregado(file_content, filename))
+
+    def processar_documento(self, documento: DocumentoCarregado) -> pd.DataFrame | None:
+        """Processa o upload lendo o TXT linha a linha."""
         try:
-            texto = file_content.decode('utf-8', errors='ignore')
-            # Detectar se é formato Winthor
-            self.is_winthor = self._detectar_winthor(texto)
-            return self._extract_data(texto)
+            return self._extract_data(documento.fluxo())
         except Exception as e:
-            print(f"Erro ao processar TXT: {e}")
+            logger.error("Erro ao processar TXT: %s", e)
+            self.falhou = True
             return None
-    
-    def _detectar_winthor(self, texto: str) -> bool:
-        """
-        Detecta se o TXT é no formato Winthor.
-        Winthor: não tem coluna de PREÇO válida, tem apenas QTD e TOTAL (em unidades).
+
+    def _extract_data(self, fluxo) -> pd.DataFrame | None:
         """
-        # Verificar se há indicadores de Winthor no texto
-        if 'WINTHOR' in texto.upper():
-            return True
-        
-        # Se tem "LABORATORIO" como coluna, é provável que seja Winthor
-        if 'LABORATORIO' in texto.upper():
-            return True
-        
-        return False
+        Extrai dados do TXT a partir do fluxo de bytes (linhas classificadas em txt_linhas).
 
-    def _extract_data(self, texto: str) -> pd.DataFrame | None:
-        """Extrai dados do TXT."""
-        linhas = texto.split('\n')
+        Também detecta o formato Winthor (não tem coluna de PREÇO válida, tem
+        apenas QTD e TOTAL em unidades): "WINTHOR" ou a coluna "LABORATORIO" em
+        qualquer linha do arquivo.
+        """
         produtos_por_pedido = {}
         pedido_atual = None
         cnpj_atual = None
         numero_pedido_pendente = None
+        self.is_winthor = False
         
-        for idx, linha in enumerate(linhas):
-            linha_strip = linha.strip()
-            if not linha_strip:
-                continue
+        for linha in tokenizar(fluxo):
+            if linha.winthor:
+                self.is_winthor = True
             
-            # Tenta extrair número do pedido primeiro (pode vir antes do CNPJ)
-            # Padrão mais específico para evitar pegar "08" de datas como "08/01/2026"
-            if ("NÚMERO PEDIDO" in linha.upper() or "NUMERO PEDIDO" in linha.upper() or 
-                (linha.count("Pedido") > 0 and "DT." not in linha and "DATA" not in linha.upper() and "EMISSÃO" not in linha.upper())):
-                match = re.search(r'(?:Número\s+Pedido|NÚMERO\s+PEDIDO|Numero\s+Pedido|NUMERO\s+PEDIDO)[:\s.]+(\d+)', linha, re.IGNORECASE)
+            # Número do pedido (pode vir antes do CNPJ)
+            if linha.tipo == PEDIDO:
+                match = TXT_NUMERO_PEDIDO.search(linha.texto)
                 if match:
                     numero_pedido_atual = match.group(1).strip()
                     # Se mudou o número de pedido, atualiza para criar nova chave
@@ -61,9 +59,9 @@ class TXTProcessor(FileProcessor):
                         numero_pedido_pendente = numero_pedido_atual
                         pedido_atual = None  # Reset para criar novo grupo se necessário
             
-            # Tenta extrair CNPJ
-            elif "CNPJ" in linha or "Filial" in linha:
-                cnpj = extract_cnpj(linha)
+            # CNPJ / Filial
+            elif linha.tipo == CNPJ:
+                cnpj = extract_cnpj(linha.texto)
                 if cnpj:
                     cnpj_atual = cnpj
                     # Criar chave única: pedido_numero + CNPJ
@@ -75,9 +73,9 @@ class TXTProcessor(FileProcessor):
                         }
                     pedido_atual = chave_pedido
             
-            # Processa linhas que contêm produtos (têm "Código de Barras" ou estão em formato tabular)
-            # Opção 1: linha com "Código de Barras:"
-            elif "Código de Barras:" in linha or "Codigo de Barras:" in linha:
+            # Produto: "Código de Barras:", formato tabular :EAN:, linha iniciando com EAN-13/EAN-14
+            # ou EAN-13 em qualquer lugar da linha
+            elif linha.tipo == PRODUTO:
                 if not pedido_atual:
                     # Cria pedido padrão quando não há CNPJ mas há itens
                     chave_pedido = f"{numero_pedido_pendente or 'SEM_NUMERO'}_SEM_CNPJ"
@@ -85,85 +83,49 @@ class TXTProcessor(FileProcessor):
                         produtos_por_pedido[chave_pedido] = {'cnpj': cnpj_atual or '', 'produtos': [], 'numero_pedido': numero_pedido_pendente or ''}
                     pedido_atual = chave_pedido
                 self._processar_linha_produto(linha, pedido_atual, produtos_por_pedido)
-            
-            # Opção 2: formato tabular com :XXXXXXXX: (tipo :7896018750845: )
-            elif re.search(r':\d{13}\s', linha):
-                if not pedido_atual:
-                    chave_pedido = f"{numero_pedido_pendente or 'SEM_NUMERO'}_SEM_CNPJ"
-                    if chave_pedido not in produtos_por_pedido:
-                        produtos_por_pedido[chave_pedido] = {'cnpj': cnpj_atual or '', 'produtos': [], 'numero_pedido': numero_pedido_pendente or ''}
-                    pedido_atual = chave_pedido
-                self._processar_linha_produto(linha, pedido_atual, produtos_por_pedido)
-            
-            # Opção 3: linhas tabulares iniciando com EAN-13 ou EAN-14 (14 dígitos começando com 0)
-            else:
-                # Busca por EAN-13 ou EAN-14 no início da linha
-                if re.match(r'^\s*0?\d{13}', linha):
-                    if not pedido_atual:
-                        chave_pedido = f"{numero_pedido_pendente or 'SEM_NUMERO'}_SEM_CNPJ"
-                        if chave_pedido not in produtos_por_pedido:
-                            produtos_por_pedido[chave_pedido] = {'cnpj': cnpj_atual or '', 'produtos': [], 'numero_pedido': numero_pedido_pendente or ''}
-                        pedido_atual = chave_pedido
-                    self._processar_linha_produto(linha, pedido_atual, produtos_por_pedido)
-                else:
-                    # Tenta buscar EAN-13 em qualquer lugar da linha
-                    ean_inline = extract_ean13(linha)
-                    if ean_inline:
-                        if not pedido_atual:
-                            chave_pedido = f"{numero_pedido_pendente or 'SEM_NUMERO'}_SEM_CNPJ"
-                            if chave_pedido not in produtos_por_pedido:
-                                produtos_por_pedido[chave_pedido] = {'cnpj': cnpj_atual or '', 'produtos': [], 'numero_pedido': numero_pedido_pendente or ''}
-                            pedido_atual = chave_pedido
-                        self._processar_linha_produto(linha, pedido_atual, produtos_por_pedido)
         
         if not produtos_por_pedido:
             return None
         
         return self._criar_dataframe(produtos_por_pedido)
 
-    def _processar_linha_produto(self, linha: str, pedido_atual: str, 
+    def _processar_linha_produto(self, linha: LinhaTXT, pedido_atual: str, 
                                  produtos_por_pedido: dict) -> None:
-        """Processa uma linha de produto."""
+        """Processa uma linha de produto (EAN e posição já encontrados pelo tokenizador)."""
+        texto = linha.texto
+        
         # Pula linhas que são separadores ou não têm dados
-        if any(x in linha.upper() for x in ["----", "COD. BARRAS", "CODIGO", "PRODUTO", "DESCRI", "QUANTIDADE", "PRE�O", "PREÇO"]):
+        if any(x in linha.upper for x in ["----", "COD. BARRAS", "CODIGO", "PRODUTO", "DESCRI", "QUANTIDADE", "PRE�O", "PREÇO"]):
             return
         
-        # Tenta extrair EAN-14 (14 dígitos começando com 0) ou EAN-13
-        ean = self._extrair_ean(linha)
+        # EAN-14 (14 dígitos começando com 0, sem o zero) ou EAN-13
+        ean = linha.ean
         
         if not ean:
             return
         
         # Extrai descrição do produto
-        descricao = self._extrair_descricao(linha, ean)
+        descricao = self._extrair_descricao(texto, ean, linha.ean_pos)
         
         # Encontra quantidade usando múltiplas estratégias
-        qtd = self._extrair_quantidade_linha(linha, ean)
+        qtd = self._extrair_quantidade_linha(texto, ean, linha.ean_pos)
         
         if not qtd or qtd <= 0:
             qtd = 1  # Padrão: quantidade 1 se não encontrar
 
         # Extrai preços (unitário e total líquido) quando disponíveis
-        preco_unitario, total_liquido = self._extrair_precos(linha, qtd)
+        preco_unitario, total_liquido = self._extrair_precos(texto, qtd)
         
-        if ean:
-            produtos_por_pedido[pedido_atual]['produtos'].append({
-                'barras': ean,
-                'quantidade': qtd,
-                'descricao': descricao,
-                'preco': preco_unitario,
-                'total': total_liquido
-            })
+        produtos_por_pedido[pedido_atual]['produtos'].append({
+            'barras': ean,
+            'quantidade': qtd,
+            'descricao': descricao,
+            'preco': preco_unitario,
+            'total': total_liquido
+        })
     
-    def _extrair_ean(self, linha: str) -> str | None:
-        """Extrai EAN-14 (com 0 inicial) ou EAN-13 da linha."""
-        match = re.search(r'\b(0\d{13})\b', linha)
-        if match:
-            return match.group(1)[1:]  # Remove o zero inicial
-        return extract_ean13(linha)
-    
-    def _extrair_descricao(self, linha: str, ean: str) -> str:
-        """Extrai a descrição do produto da linha."""
+    def _extrair_descricao(self, linha: str, ean: str, ean_pos: int) -> str:
+        """Extrai a descrição do produto da linha (ean_pos: linha.find(ean))."""
         if ':' in linha:
             partes = linha.split(':')
             for i, parte in enumerate(partes):
@@ -176,15 +138,14 @@ class TXTProcessor(FileProcessor):
                 if len(parte_limpa) > 10 and not parte_limpa.replace('.', '').replace(',', '').isdigit():
                     return parte_limpa
         
-        ean_pattern = r'0?' + re.escape(ean)
-        match = re.search(ean_pattern, linha)
-        if not match:
+        fim = fim_ean(linha, ean, ean_pos)
+        if fim is None:
             return ''
         
-        resto = linha[match.end():].lstrip()
+        resto = linha[fim:].lstrip()
         
-        for pattern in [r'(.+?)\s{2,}\d+\s+[\d,\.]+', r'(.+?)\s+\d+\s*$', r'(.+?)\s+[\d,\.]+\s*$']:
-            m = re.match(pattern, resto)
+        for pattern in TXT_DESCRICOES:
+            m = pattern.match(resto)
             if m:
                 return m.group(1).strip()
         
@@ -196,28 +157,28 @@ class TXTProcessor(FileProcessor):
         total_liquido = 0.0
 
         # Padrão mais completo: quantidade + preços + descontos + total
-        padrao_completo = rf"\b{quantidade}\b\s+([\d.,]+)\s+[\d.,]+\s+[\d.,]+\s+[\d.,]+\s+([\d.,]+)\s*$"
-        match = re.search(padrao_completo, linha)
-        if match:
-            preco_unitario = normalizar_preco(match.group(1))
-            total_liquido = normalizar_preco(match.group(2))
+        # (o padrão só casa em uma posição; vale se o número ali for a quantidade)
+        match = TXT_PRECOS_COMPLETO.search(linha)
+        if match and match.group(1) == str(quantidade):
+            preco_unitario = normalizar_preco(match.group(2))
+            total_liquido = normalizar_preco(match.group(3))
             return preco_unitario, total_liquido
 
         # Fallback: pega tokens monetários (com vírgula ou ponto) e usa primeiro e último
-        valores_monetarios = re.findall(r"\d{1,3}(?:\.\d{3})*,\d{2}|\d+,\d{2}|\d+\.\d{2}", linha)
+        valores_monetarios = VALOR_MONETARIO.findall(linha)
         if valores_monetarios:
             preco_unitario = normalizar_preco(valores_monetarios[0])
             total_liquido = normalizar_preco(valores_monetarios[-1])
 
         return preco_unitario, total_liquido
     
-    def _extrair_quantidade_linha(self, linha: str, ean: str) -> int:
-        """Extrai quantidade de uma linha de produto com múltiplas estratégias."""
+    def _extrair_quantidade_linha(self, linha: str, ean: str, ean_pos: int) -> int:
+        """Extrai quantidade de uma linha de produto com múltiplas estratégias (ean_pos: linha.find(ean))."""
         qtd = None
 
         # Estratégia para formato: EAN-14 + DESCRIÇÃO + QUANTIDADE + PREÇO
         # Exemplo: "07896110007502    ABS SYM PROT DIARIO 15UN C/PERF                                2            4,55"
-        match_novo_formato = re.search(r'^\s*0?\d{13}\s+.*?\s+(\d{1,4})\s+[\d,\.]+\s*$', linha)
+        match_novo_formato = TXT_QTDE_NOVO_FORMATO.search(linha)
         if match_novo_formato:
             try:
                 num = int(match_novo_formato.group(1))
@@ -228,7 +189,7 @@ class TXTProcessor(FileProcessor):
 
         # Estratégia GAMA: linha tabular inicia com EAN e a quantidade vem antes do primeiro preço
         # Exemplo: "7891000261965 0365685 LEITE ...   12    34.99"
-        match_tabular = re.search(r'^\s*\d{13}.*?\s(\d{1,4})\s+[\d]{1,3}[.,]\d{2}\b', linha)
+        match_tabular = TXT_QTDE_TABULAR.search(linha)
         if match_tabular:
             try:
                 num = int(match_tabular.group(1))
@@ -239,7 +200,7 @@ class TXTProcessor(FileProcessor):
         
         # Estratégia 0: CRÍTICA - Procura por padrões numéricos específicos antes de tudo
         # Procura por :00X: (quantidade em coluna com padding) - mais específico
-        match = re.search(r':\s*(\d{1,2})\s*(?:$|[\r\n|:])', linha)
+        match = TXT_QTDE_COLUNA.search(linha)
         if match:
             num_str = match.group(1)
             try:
@@ -250,7 +211,6 @@ class TXTProcessor(FileProcessor):
                 pass
         
         # Estratégia 1: Procura pela posição após o EAN (para formato tabular :EAN:DESC:FAB:QTD)
-        ean_pos = linha.find(ean)
         if ean_pos >= 0:
             # Tudo após o EAN
             depois_ean = linha[ean_pos + len(ean):]
@@ -272,7 +232,7 @@ class TXTProcessor(FileProcessor):
                         pass
         
         # Estratégia 2: Procura por "Qtd:" ou variações (mais específico)
-        match = re.search(r'(?:Qtd|QTD|Qtde|QTDE|quantidade)[.:\s]+(\d+)', linha, re.IGNORECASE)
+        match = TXT_QTDE_ROTULO.search(linha)
         if match:
             try:
                 qtd = int(match.group(1))
@@ -297,8 +257,7 @@ class TXTProcessor(FileProcessor):
         
         # Estratégia 4: Procura pelo último número menor que 100 (quantidade típica)
         # Isso ajuda a evitar pegar 360, 200ML, etc
-        import re as regex_module
-        todos_numeros = regex_module.findall(r'\b(\d+)\b', linha)
+        todos_numeros = TXT_NUMEROS.findall(linha)
         
         # Filtra para apenas números que parecem ser quantidade (< 100)
         quantidades_possiveis = []
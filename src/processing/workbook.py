@@ -0,0 +1,146 @@
+"""Pasta de trabalho Excel aberta uma única vez por upload.
+
+Os processadores de planilha costumavam chamar `pd.read_excel` várias vezes
+sobre os mesmos bytes (leitura normal, detecção de cabeçalho, busca de CNPJ,
+fallbacks), e cada chamada abria o arquivo e percorria todas as células de
+novo. `Planilha` abre o arquivo uma vez, guarda a grade de células de cada aba
+e monta DataFrames a partir dessa grade com o mesmo parser do `read_excel`.
+
+Planilhas com metadados acima da tabela (CNPJ nas primeiras linhas, cabeçalho
+mais abaixo) espiam essas linhas com `linhas()` e montam os dados com
+`dataframe(header=N)`, sem abrir o arquivo de novo. Pastas com várias abas
+são consultadas pelo `indice` (nomes e dimensões declaradas, sem ler células)
+e só a aba escolhida é lida.
+
+A grade em cache usa o leitor interno do `pd.ExcelFile` (`_reader`,
+`get_sheet_data`, `_parse_sheet`), que não é API pública. Se ele faltar ou
+mudar de assinatura, `dataframe()` passa a usar `ExcelFile.parse`: mesmo
+resultado, só relendo a aba a cada chamada.
+"""
+
+from io import BytesIO
+
+import pandas as pd
+
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+# Métodos do leitor interno do pandas usados pela grade em cache
+_METODOS_LEITOR = ('get_sheet_by_name', 'get_sheet_by_index', 'get_sheet_data', '_parse_sheet')
+
+
+class Planilha:
+    """Pasta de trabalho com as grades de células por aba em cache."""
+
+    def __init__(self, file_content: bytes, engine: str | None = None):
+        """
+        Args:
+            file_content: Conteúdo do arquivo (.xlsx ou .xls)
+            engine: Engine do pandas; None detecta pelo conteúdo (xlsx -> openpyxl, xls -> xlrd)
+        """
+        self._arquivo = pd.ExcelFile(BytesIO(file_content), engine=engine)
+        self._reader = getattr(self._arquivo, '_reader', None)
+        if self._reader is not None and not all(hasattr(self._reader, m) for m in _METODOS_LEITOR):
+            self._sem_cache("leitor interno sem os métodos esperados")
+        self.engine = self._arquivo.engine
+        self._grades = {}
+        self._indice = None
+
+    def _sem_cache(self, motivo):
+        """Desliga a grade em cache; as abas passam a ser lidas pelo ExcelFile.parse."""
+        logger.warning("[PLANILHA] Grade em cache indisponível (pandas %s): %s; usando ExcelFile.parse",
+                       pd.__version__, motivo)
+        self._reader = None
+        self._grades = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    @property
+    def abas(self) -> list:
+        """Nomes das abas, na ordem do arquivo."""
+        return self._arquivo.sheet_names
+
+    @property
+    def book(self):
+        """Workbook da biblioteca de leitura (xlrd.Book ou openpyxl.Workbook)."""
+        return self._arquivo.book
+
+    @property
+    def indice(self) -> list[tuple[str, int | None, int | None]]:
+        """
+        Abas com (nome, linhas, colunas), sem ler as células.
+
+        No .xlsx as dimensões são as declaradas no arquivo (None se ausentes) e
+        podem incluir linhas/colunas vazias no fim.
+        """
+        if self._indice is None:
+            book = self.book
+            indice = []
+            for nome in self.abas:
+                if hasattr(book, 'sheet_by_name'):
+                    sheet = book.sheet_by_name(nome)
+                    indice.append((nome, sheet.nrows, sheet.ncols))
+                else:
+                    sheet = book[nome]
+                    indice.append((nome, getattr(sheet, 'max_row', None), getattr(sheet, 'max_column', None)))
+            self._indice = indice
+        return self._indice
+
+    def abas_por_nome(self, padrao) -> list[str]:
+        """Abas cujo nome inteiro casa com `padrao` (regex compilada), na ordem do arquivo."""
+        return [nome for nome in self.abas if padrao.fullmatch(nome.strip())]
+
+    def grade(self, aba: int | str = 0) -> list[list]:
+        """
+        Células da aba (lista de linhas), lidas do arquivo apenas na primeira chamada.
+
+        Usa o leitor interno do pandas (AttributeError se indisponível).
+        """
+        if aba not in self._grades:
+            if isinstance(aba, str):
+                sheet = self._reader.get_sheet_by_name(aba)
+            else:
+                sheet = self._reader.get_sheet_by_index(aba)
+            self._grades[aba] = self._reader.get_sheet_data(sheet, None)
+        return self._grades[aba]
+
+    def dataframe(self, aba: int | str = 0, header: int | None = 0, nrows: int | None = None,
+                  **kwargs) -> pd.DataFrame:
+        """
+        Monta um DataFrame da aba a partir da grade em cache.
+
+        Equivale a `pd.read_excel(arquivo, sheet_name=aba, header=header, nrows=nrows, ...)`.
+        """
+        if self._reader is not None:
+            try:
+                grade = self.grade(aba)
+                if not grade:
+                    return pd.DataFrame()
+                # Cópia rasa: o parser pode substituir linhas de cabeçalho na lista
+                saida = self._reader._parse_sheet(data=list(grade), output={}, asheetname=aba,
+                                                  header=header, nrows=nrows, **kwargs)
+                return saida[aba]
+            except AttributeError as e:
+                # API interna do pandas mudou (os métodos já foram conferidos na abertura):
+                # relê a aba pelo caminho público. Erros dos dados (aba inexistente etc.) sobem
+                self._sem_cache(f"{type(e).__name__}: {e}")
+
+        return self._arquivo.parse(aba, header=header, nrows=nrows, **kwargs)
+
+    def linhas(self, quantidade: int, aba: int | str = 0) -> pd.DataFrame:
+        """
+        Primeiras `quantidade` linhas da aba, sem cabeçalho (metadados acima da tabela).
+
+        Equivale a `pd.read_excel(arquivo, sheet_name=aba, header=None, nrows=quantidade)`,
+        mas reaproveita a grade em cache, que o `dataframe(header=N)` seguinte também usa.
+        """
+        return self.dataframe(aba, header=None, nrows=quantidade)
+
+    def fechar(self):
+        """Libera o workbook."""
+        self._arquivo.close()
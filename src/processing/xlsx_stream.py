@@ -0,0 +1,209 @@
+"""Escrita de XLSX em fluxo, com memória constante.
+
+O `DataFrame.to_excel` (openpyxl) monta a pasta de trabalho inteira em memória
+antes de salvar, e o resultado ainda é copiado para bytes e para o corpo da
+resposta. Aqui a planilha é gerada linha a linha direto no ZIP: o conteúdo
+comprimido sai em blocos (`gerar_xlsx`) que a StreamingResponse envia ou o job
+grava em disco à medida que são produzidos.
+
+A saída é uma planilha mínima (uma aba, textos inline e o cabeçalho no mesmo
+estilo do pandas: negrito, borda fina e centralizado), lida pelo Excel,
+LibreOffice, openpyxl e pandas como a do `to_excel`.
+"""
+
+import math
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+import pandas as pd
+
+# Caracteres de controle não permitidos em XML 1.0 (o openpyxl recusa a célula inteira)
+_CARACTERES_ILEGAIS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{aba}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Estilo 1 = cabeçalho do pandas (negrito, borda fina, centralizado no topo)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="2"><fill><patternFill/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="2">'
+    '<border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border>'
+    '</borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1" '
+    'applyAlignment="1"><alignment horizontal="center" vertical="top"/></xf>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+class SaidaEmBlocos:
+    """Arquivo só de escrita que acumula o que foi escrito até o próximo `retirar`.
+
+    Serve de destino para escritores que esperam um arquivo (zipfile, pyarrow)
+    quando os bytes devem sair em blocos, sem `seek`.
+    """
+
+    def __init__(self):
+        self._partes = []
+        self.closed = False
+
+    def write(self, dados) -> int:
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def retirar(self) -> bytes:
+        dados = b''.join(self._partes)
+        self._partes = []
+        return dados
+
+
+def _letra_coluna(indice: int) -> str:
+    """0 -> A, 25 -> Z, 26 -> AA..."""
+    letras = ''
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def _texto(ref: str, valor: str, estilo: str = '') -> str:
+    valor = _CARACTERES_ILEGAIS.sub('', valor)
+    espaco = ' xml:space="preserve"' if valor != valor.strip() else ''
+    return f'<c r="{ref}"{estilo} t="inlineStr"><is><t{espaco}>{escape(valor)}</t></is></c>'
+
+
+def _celula(ref: str, valor) -> str:
+    """XML de uma célula; vazia ('') para NaN/None, como o na_rep='' do to_excel."""
+    if valor is None or valor is pd.NA or valor is pd.NaT:
+        return ''
+    if isinstance(valor, bool):
+        return f'<c r="{ref}" t="b"><v>{int(valor)}</v></c>'
+    if isinstance(valor, int):
+        return f'<c r="{ref}"><v>{valor}</v></c>'
+    if isinstance(valor, float):
+        if math.isnan(valor):
+            return ''
+        if math.isinf(valor):
+            # inf_rep padrão do to_excel
+            return _texto(ref, 'inf' if valor > 0 else '-inf')
+        return f'<c r="{ref}"><v>{valor!r}</v></c>'
+    return _texto(ref, str(valor))
+
+
+def _linhas_xml(dataframe: pd.DataFrame, letras: list[str], inicio: int, fim: int) -> str:
+    """XML das linhas [inicio, fim) do DataFrame (a linha 1 da aba é o cabeçalho)."""
+    bloco = dataframe.iloc[inicio:fim]
+    colunas = [bloco.iloc[:, i].tolist() for i in range(bloco.shape[1])]
+    partes = []
+    for deslocamento, valores in enumerate(zip(*colunas)):
+        num = inicio + deslocamento + 2
+        celulas = ''.join(_celula(f'{letra}{num}', valor) for letra, valor in zip(letras, valores))
+        partes.append(f'<row r="{num}">{celulas}</row>')
+    return ''.join(partes)
+
+
+def gerar_xlsx(dataframe: pd.DataFrame, sheet_name: str = 'Pedido', linhas_por_bloco: int = 5000,
+               nivel_compressao: int = 6):
+    """
+    Gera o XLSX do DataFrame em blocos de bytes (sem o índice, como `to_excel(index=False)`).
+
+    Args:
+        dataframe: Dados da planilha; a primeira linha é o cabeçalho
+        sheet_name: Nome da aba
+        linhas_por_bloco: Linhas escritas entre um bloco entregue e o próximo
+        nivel_compressao: Nível do deflate (1 = mais rápido, 9 = menor)
+
+    Yields:
+        Pedaços consecutivos do arquivo .xlsx
+    """
+    saida = SaidaEmBlocos()
+    letras = [_letra_coluna(i) for i in range(dataframe.shape[1])]
+    total = len(dataframe)
+    ultima = f'{letras[-1]}{total + 1}' if letras else 'A1'
+
+    with zipfile.ZipFile(saida, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=nivel_compressao) as zf:
+        zf.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        zf.writestr('_rels/.rels', _RELS)
+        zf.writestr('xl/workbook.xml', _WORKBOOK.format(aba=escape(sheet_name, {'"': '&quot;'})))
+        zf.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        zf.writestr('xl/styles.xml', _STYLES)
+        yield saida.retirar()
+
+        with zf.open('xl/worksheets/sheet1.xml', 'w') as planilha:
+            cabecalho = ''.join(_texto(f'{letra}1', str(coluna), ' s="1"')
+                                for letra, coluna in zip(letras, dataframe.columns))
+            planilha.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                f'<dimension ref="A1:{ultima}"/><sheetData><row r="1">{cabecalho}</row>'
+            ).encode('utf-8'))
+
+            for inicio in range(0, total, linhas_por_bloco):
+                fim = min(inicio + linhas_por_bloco, total)
+                planilha.write(_linhas_xml(dataframe, letras, inicio, fim).encode('utf-8'))
+                dados = saida.retirar()
+                if dados:
+                    yield dados
+
+            planilha.write(b'</sheetData></worksheet>')
+
+    yield saida.retirar()
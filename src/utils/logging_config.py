@@ -0,0 +1,85 @@
+"""Configuração dos logs da aplicação (níveis, formato texto ou JSON).
+
+Os módulos obtêm o logger com `obter_logger(__name__)` e registram mensagens
+com argumentos (`logger.debug("[TAG] %s itens", n)`), que só são formatadas se
+o nível estiver habilitado. Dumps caros de montar (DataFrames, listas de
+valores) ficam dentro de `if logger.isEnabledFor(logging.DEBUG):`.
+
+Nível e formato vêm de AGILIZA_LOG_NIVEL e AGILIZA_LOG_FORMATO (ver
+settings.py). A configuração é aplicada uma vez por processo, no primeiro
+`obter_logger`, então vale também para os processos dos pools.
+"""
+
+import json
+import logging
+import sys
+import threading
+from datetime import datetime, timezone
+
+from src.config.settings import LOG_NIVEL, LOG_FORMATO
+
+# Raiz dos loggers da aplicação (módulos em src.*)
+LOGGER_RAIZ = 'src'
+
+# Atributos padrão do LogRecord; o que passar disso veio em `extra=` e vai para o JSON
+_ATRIBUTOS_PADRAO = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_configurado = False
+_lock = threading.Lock()
+
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por registro: data, nível, logger, pid, mensagem e campos extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'pid': record.process,
+            'msg': record.getMessage(),
+        }
+        for chave, valor in vars(record).items():
+            if chave not in _ATRIBUTOS_PADRAO and not chave.startswith('_'):
+                dados[chave] = valor
+        if record.exc_info:
+            dados['exc'] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+def configurar_logging(nivel: str | None = None, formato: str | None = None, stream=None):
+    """
+    Configura o logger raiz da aplicação (substitui a configuração anterior).
+
+    Args:
+        nivel: DEBUG, INFO, WARNING ou ERROR (None = AGILIZA_LOG_NIVEL)
+        formato: 'texto' ou 'json' (None = AGILIZA_LOG_FORMATO)
+        stream: Destino das linhas (None = stdout)
+    """
+    global _configurado
+
+    nivel = (nivel or LOG_NIVEL).upper()
+    formato = (formato or LOG_FORMATO).lower()
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    if formato == 'json':
+        handler.setFormatter(FormatadorJSON())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)-7s %(message)s'))
+
+    raiz = logging.getLogger(LOGGER_RAIZ)
+    for antigo in list(raiz.handlers):
+        raiz.removeHandler(antigo)
+    raiz.addHandler(handler)
+    raiz.setLevel(getattr(logging, nivel, logging.INFO))
+    raiz.propagate = False
+    _configurado = True
+
+
+def obter_logger(nome: str) -> logging.Logger:
+    """Logger do módulo, configurando os logs do processo na primeira chamada."""
+    if not _configurado:
+        with _lock:
+            if not _configurado:
+                configurar_logging()
+    return logging.getLogger(nome)
@@ -0,0 +1,238 @@
+"""Histogramas de tempo por etapa do processamento, no formato do Prometheus.
+
+Cada processo acumula em memória as observações (`medir`/`observar`) por
+histograma e rótulos. Os workers do process pool devolvem o que acumularam
+junto com o resultado de cada arquivo (ver executor.py), como os contadores de
+regex; o worker uvicorn soma ao seu e, ao fim de cada upload/job, grava os
+incrementos em um SQLite em METRICAS_DIR, compartilhado pelos workers.
+GET /api/metrics lê desse banco a soma de todos os workers.
+
+Rótulos que dependem de onde o código roda (processador, extensão) podem ser
+definidos uma vez com `contexto(...)`, e valem para as medições feitas dentro
+dele (ex: páginas de PDF e chamadas de OCR do processador em execução).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from src.config.settings import METRICAS_ATIVO, METRICAS_DIR
+from src.utils.logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+# Limites superiores (segundos) dos buckets, comuns a todos os histogramas
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Histogramas expostos: descrição e nomes dos rótulos (ausentes ficam vazios)
+HISTOGRAMAS = {
+    'agiliza_etapa_segundos': (
+        'Tempo de cada etapa do processamento (leitura, deteccao, fila, parse, fallback, '
+        'processamento, validacao, processar_modelo, concat, exportacao, upload)',
+        ('etapa', 'processador', 'extensao'),
+    ),
+    'agiliza_pdf_pagina_segundos': (
+        'Tempo de cada página de PDF percorrida por um processador',
+        ('processador', 'extensao'),
+    ),
+    'agiliza_ocr_segundos': (
+        'Tempo de cada chamada de OCR (servico, easyocr ou tesseract)',
+        ('processador', 'extensao', 'origem'),
+    ),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS amostras (
+    nome TEXT NOT NULL,
+    rotulos TEXT NOT NULL,
+    campo TEXT NOT NULL,
+    valor REAL NOT NULL,
+    PRIMARY KEY (nome, rotulos, campo)
+);
+"""
+
+# Campos gravados por série: um por bucket (contagem não cumulativa), soma e contagem
+_CAMPOS = tuple(repr(limite) for limite in BUCKETS) + ('+Inf', 'soma', 'contagem')
+
+_rotulos_contexto = ContextVar('rotulos_metricas', default=None)
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formatar_numero(valor: float) -> str:
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
+
+
+class RegistroMetricas:
+    """Histogramas acumulados no processo e persistidos no banco compartilhado."""
+
+    def __init__(self, base_dir: str = METRICAS_DIR, ativo: bool = METRICAS_ATIVO):
+        self.base_dir = base_dir
+        self.ativo = ativo
+        self.db_path = os.path.join(base_dir, 'metricas.db')
+        self._inicializado = False
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    # ===== MEDIÇÃO =====
+
+    def observar(self, nome: str, segundos: float, **rotulos):
+        """Registra uma duração no histograma `nome` (rótulos do `contexto` atual incluídos)."""
+        if not self.ativo:
+            return
+        contexto = _rotulos_contexto.get()
+        if contexto:
+            rotulos = {**contexto, **rotulos}
+        chave = (nome, tuple(str(rotulos.get(rotulo) or '') for rotulo in HISTOGRAMAS[nome][1]))
+        indice = bisect_left(BUCKETS, segundos)
+        with self._lock:
+            valores = self._valores.get(chave)
+            if valores is None:
+                valores = self._valores[chave] = [0] * (len(BUCKETS) + 1) + [0.0, 0]
+            valores[indice] += 1
+            valores[-2] += segundos
+            valores[-1] += 1
+
+    @contextmanager
+    def medir(self, nome: str, **rotulos):
+        """Mede o tempo do bloco `with` (também em caso de exceção)."""
+        if not self.ativo:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(nome, time.perf_counter() - inicio, **rotulos)
+
+    @contextmanager
+    def contexto(self, **rotulos):
+        """Rótulos aplicados às medições feitas dentro do bloco (nesta thread/tarefa)."""
+        token = _rotulos_contexto.set({**(_rotulos_contexto.get() or {}), **rotulos})
+        try:
+            yield
+        finally:
+            _rotulos_contexto.reset(token)
+
+    # ===== ENTRE PROCESSOS =====
+
+    def _apos_fork(self):
+        """No processo filho (pool): descarta o que foi herdado do pai, que o pai ainda vai gravar."""
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def coletar(self) -> dict:
+        """Retira as observações acumuladas (para um worker enviar ao processo principal)."""
+        with self._lock:
+            coletados, self._valores = self._valores, {}
+        return coletados
+
+    def mesclar(self, coletados: dict):
+        """Soma observações recebidas de outro processo (ver coletar)."""
+        if not coletados:
+            return
+        with self._lock:
+            for chave, recebidos in coletados.items():
+                valores = self._valores.get(chave)
+                if valores is None:
+                    self._valores[chave] = list(recebidos)
+                else:
+                    for indice, valor in enumerate(recebidos):
+                        valores[indice] += valor
+
+    # ===== BANCO COMPARTILHADO =====
+
+    def _conectar(self) -> sqlite3.Connection:
+        if not self._inicializado:
+            os.makedirs(self.base_dir, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        if not self._inicializado:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            self._inicializado = True
+        return conn
+
+    def gravar(self):
+        """Soma as observações deste processo ao banco compartilhado pelos workers."""
+        coletados = self.coletar()
+        if not coletados:
+            return
+        linhas = [
+            (nome, json.dumps(rotulos, ensure_ascii=False), campo, valor)
+            for (nome, rotulos), valores in coletados.items()
+            for campo, valor in zip(_CAMPOS, valores)
+            if valor
+        ]
+        try:
+            conn = self._conectar()
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.executemany(
+                    "INSERT INTO amostras (nome, rotulos, campo, valor) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (nome, rotulos, campo) DO UPDATE SET valor = valor + excluded.valor",
+                    linhas,
+                )
+                conn.execute('COMMIT')
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # Mantém as observações para a próxima gravação
+            logger.warning("[METRICAS] Falha ao gravar métricas: %s", e)
+            self.mesclar(coletados)
+
+    def _ler(self) -> dict:
+        """Séries somadas de todos os workers: {(nome, rotulos): [buckets..., soma, contagem]}."""
+        series = {}
+        conn = self._conectar()
+        try:
+            linhas = conn.execute('SELECT nome, rotulos, campo, valor FROM amostras').fetchall()
+        finally:
+            conn.close()
+        for nome, rotulos, campo, valor in linhas:
+            if nome not in HISTOGRAMAS or campo not in _CAMPOS:
+                continue
+            chave = (nome, tuple(json.loads(rotulos)))
+            valores = series.setdefault(chave, [0] * len(_CAMPOS))
+            valores[_CAMPOS.index(campo)] = valor
+        return series
+
+    def exportar(self) -> str:
+        """Histogramas no formato texto do Prometheus, somados entre os workers."""
+        self.gravar()
+        try:
+            series = self._ler()
+        except sqlite3.Error as e:
+            logger.warning("[METRICAS] Falha ao ler métricas compartilhadas: %s", e)
+            with self._lock:
+                series = {chave: list(valores) for chave, valores in self._valores.items()}
+
+        linhas = []
+        for nome, (descricao, nomes_rotulos) in HISTOGRAMAS.items():
+            linhas.append(f"# HELP {nome} {descricao}")
+            linhas.append(f"# TYPE {nome} histogram")
+            for (serie, rotulos), valores in sorted(series.items()):
+                if serie != nome:
+                    continue
+                base = ','.join(f'{rotulo}="{_escapar(valor)}"' for rotulo, valor in zip(nomes_rotulos, rotulos))
+                prefixo = base + ',' if base else ''
+                acumulado = 0
+                for limite, contagem in zip(_CAMPOS[:len(BUCKETS) + 1], valores):
+                    acumulado += contagem
+                    linhas.append(f'{nome}_bucket{{{prefixo}le="{limite}"}} {_formatar_numero(acumulado)}')
+                linhas.append(f'{nome}_sum{{{base}}} {repr(float(valores[-2]))}')
+                linhas.append(f'{nome}_count{{{base}}} {_formatar_numero(valores[-1])}')
+        return '\n'.join(linhas) + '\n'
+
+
+# Registro do processo (worker uvicorn ou worker do pool)
+metricas = RegistroMetricas()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=metricas._apos_fork)
@@ -0,0 +1,215 @@
+"""Regex pré-compiladas dos parsers, com contadores opcionais de uso.
+
+Os processadores chamavam `re.search(...)` com padrões montados dentro dos
+loops (ex: o EAN da linha interpolado na regex), o que recompila a expressão a
+cada linha e ainda expulsa as outras do cache interno do `re`. Aqui ficam os
+padrões compilados uma vez, por nome; os que dependiam de um valor da linha
+capturam o valor em um grupo e o chamador compara o grupo.
+
+Com AGILIZA_REGEX_STATS=1, cada padrão conta chamadas, acertos e tempo gasto;
+`estatisticas()` devolve os números (também em GET /api/regex/stats). Os
+workers do process pool devolvem seus contadores junto com o resultado de cada
+arquivo (ver executor.py). Desligado, os métodos são os do próprio
+re.Pattern, sem custo extra.
+"""
+
+import re
+import threading
+import time
+
+from src.config.settings import REGEX_ESTATISTICAS
+
+_METODOS = ('search', 'match', 'fullmatch', 'findall', 'finditer', 'sub', 'split')
+
+_registro = {}
+_lock = threading.Lock()
+
+
+class Padrao:
+    """Regex compilada e registrada por nome."""
+
+    def __init__(self, nome: str, padrao: str, flags: int = 0, estatisticas: bool = REGEX_ESTATISTICAS):
+        self.nome = nome
+        self.regex = re.compile(padrao, flags)
+        self.pattern = self.regex.pattern
+        self.chamadas = 0
+        self.acertos = 0
+        self.tempo = 0.0
+
+        for metodo in _METODOS:
+            original = getattr(self.regex, metodo)
+            setattr(self, metodo, self._medir(original) if estatisticas else original)
+
+    def _medir(self, metodo):
+        """Envolve um método do re.Pattern contando chamadas, acertos e tempo."""
+        def medido(*args, **kwargs):
+            inicio = time.perf_counter()
+            resultado = metodo(*args, **kwargs)
+            if metodo.__name__ == 'finditer':
+                resultado = list(resultado)
+            decorrido = time.perf_counter() - inicio
+            with _lock:
+                self.chamadas += 1
+                self.tempo += decorrido
+                if resultado:
+                    self.acertos += 1
+            return iter(resultado) if metodo.__name__ == 'finditer' else resultado
+        return medido
+
+    def __repr__(self):
+        return f"Padrao({self.nome!r}, {self.pattern!r})"
+
+
+def registrar(nome: str, padrao: str, flags: int = 0) -> Padrao:
+    """Compila e registra um padrão; nomes repetidos devolvem o já registrado."""
+    with _lock:
+        if nome not in _registro:
+            _registro[nome] = Padrao(nome, padrao, flags)
+        existente = _registro[nome]
+    if existente.pattern != padrao:
+        raise ValueError(f"Padrão '{nome}' já registrado com outra expressão")
+    return existente
+
+
+def estatisticas() -> list[dict]:
+    """Contadores por padrão, do que mais consome tempo para o que menos consome."""
+    with _lock:
+        linhas = [
+            {
+                'nome': p.nome,
+                'padrao': p.pattern,
+                'chamadas': p.chamadas,
+                'acertos': p.acertos,
+                'tempo_ms': round(p.tempo * 1000, 3),
+            }
+            for p in _registro.values()
+        ]
+    return sorted(linhas, key=lambda linha: linha['tempo_ms'], reverse=True)
+
+
+def coletar_estatisticas() -> dict:
+    """Retira os contadores acumulados (para um worker enviar ao processo principal)."""
+    coletados = {}
+    with _lock:
+        for nome, p in _registro.items():
+            if p.chamadas:
+                coletados[nome] = (p.chamadas, p.acertos, p.tempo)
+                p.chamadas, p.acertos, p.tempo = 0, 0, 0.0
+    return coletados
+
+
+def mesclar_estatisticas(coletados: dict):
+    """Soma contadores recebidos de outro processo (ver coletar_estatisticas)."""
+    with _lock:
+        for nome, (chamadas, acertos, tempo) in coletados.items():
+            p = _registro.get(nome)
+            if p is not None:
+                p.chamadas += chamadas
+                p.acertos += acertos
+                p.tempo += tempo
+
+
+def zerar_estatisticas():
+    """Zera os contadores de todos os padrões."""
+    coletar_estatisticas()
+
+
+def imprimir_estatisticas(limite: int = 20):
+    """Imprime os padrões que mais consumiram tempo."""
+    for linha in estatisticas()[:limite]:
+        print(f"[REGEX] {linha['nome']:<32} {linha['chamadas']:>9} chamadas "
+              f"{linha['acertos']:>9} acertos {linha['tempo_ms']:>10.1f} ms")
+
+
+def fim_ean(linha: str, ean: str, pos: int | None = None) -> int | None:
+    """
+    Posição logo após `0?{ean}` na linha, como `re.search(r'0?' + re.escape(ean), linha).end()`,
+    sem montar uma regex por EAN.
+
+    Args:
+        pos: `linha.find(ean)`, se o chamador já tiver
+
+    Returns:
+        Índice após o EAN (None se o EAN não aparece)
+    """
+    if pos is None:
+        pos = linha.find(ean)
+    if pos < 0:
+        return None
+    # O match mais à esquerda começa no '0' anterior, se houver; a partir daí o
+    # '0?' guloso tenta consumir um '0' e achar o EAN logo depois
+    inicio = pos - 1 if pos > 0 and linha[pos - 1] == '0' else pos
+    if linha[inicio] == '0' and linha.startswith(ean, inicio + 1):
+        return inicio + 1 + len(ean)
+    return inicio + len(ean)
+
+
+# ===== EAN =====
+# Sequências de 13 ou mais dígitos (candidatos do extract_ean13)
+SEQUENCIA_EAN = registrar('ean.sequencia', r'\d{13,}')
+# EAN-13 com prefixo brasileiro/GS1 comum (3, 6, 7 ou 8), isolado
+EAN_PREFIXO = registrar('ean.prefixo', r'\b([3678]\d{12})\b')
+# EAN-13 ou EAN-14 (0 + EAN-13) isolado; o grupo é o EAN-13
+EAN_DELIMITADO = registrar('ean.delimitado', r'\b0?(\d{13})\b')
+# EAN-14 com 0 inicial
+EAN14_ZERO = registrar('ean.ean14_zero', r'\b(0\d{13})\b')
+# Linha que começa com EAN-13/EAN-14
+EAN_INICIO_LINHA = registrar('ean.inicio_linha', r'^\s*0?\d{13}')
+# EAN em coluna delimitada por ':' (formato tabular)
+EAN_DOIS_PONTOS = registrar('ean.dois_pontos', r':\d{13}\s')
+
+# ===== VALORES =====
+VALOR_MONETARIO = registrar('valor.monetario', r"\d{1,3}(?:\.\d{3})*,\d{2}|\d+,\d{2}|\d+\.\d{2}")
+VALOR_DECIMAL = registrar('valor.decimal', r'(\d+[,\.]\d{2})')
+LETRA = registrar('texto.letra', r'[A-Za-z]')
+ESPACOS = registrar('texto.espacos', r'\s+')
+
+# ===== PDF =====
+PDF_UN_1_X = registrar('pdf.un_1_x', r'\bUN\s+1\s+X\s+\d+\s+(\d+)\s+([\d,\.]+)', re.IGNORECASE)
+# Depois do EAN: descrição, quantidade e preço (aplicado logo após o EAN com .match)
+PDF_APOS_EAN = registrar('pdf.apos_ean', r'\s+(.+?)\s+(\d{1,4})\s+([\d.,]+)')
+PDF_NUMERO_INICIAL = registrar('pdf.numero_inicial', r'^\d+\s+')
+PDF_DESCRICOES = [
+    registrar('pdf.descricao_un', r'(.+?)\s+UN\b', re.IGNORECASE),
+    registrar('pdf.descricao_1_x', r'(.+?)\s+1\s+X\b', re.IGNORECASE),
+    registrar('pdf.descricao_valores', r'(.+?)\s+[\d,\.]+\s+[\d,\.]+', re.IGNORECASE),
+]
+
+# ===== TXT =====
+TXT_NUMERO_PEDIDO = registrar(
+    'txt.numero_pedido',
+    r'(?:Número\s+Pedido|NÚMERO\s+PEDIDO|Numero\s+Pedido|NUMERO\s+PEDIDO)[:\s.]+(\d+)',
+    re.IGNORECASE,
+)
+TXT_DESCRICOES = [
+    registrar('txt.descricao_colunas', r'(.+?)\s{2,}\d+\s+[\d,\.]+'),
+    registrar('txt.descricao_qtde_final', r'(.+?)\s+\d+\s*$'),
+    registrar('txt.descricao_valor_final', r'(.+?)\s+[\d,\.]+\s*$'),
+]
+# Quantidade + preço + três colunas + total no fim da linha; o grupo 1 é a
+# quantidade, comparada pelo chamador com a quantidade já extraída
+TXT_PRECOS_COMPLETO = registrar(
+    'txt.precos_completo',
+    r'\b(\d+)\b\s+([\d.,]+)\s+[\d.,]+\s+[\d.,]+\s+[\d.,]+\s+([\d.,]+)\s*$',
+)
+TXT_QTDE_NOVO_FORMATO = registrar('txt.qtde_novo_formato', r'^\s*0?\d{13}\s+.*?\s+(\d{1,4})\s+[\d,\.]+\s*$')
+TXT_QTDE_TABULAR = registrar('txt.qtde_tabular', r'^\s*\d{13}.*?\s(\d{1,4})\s+[\d]{1,3}[.,]\d{2}\b')
+TXT_QTDE_COLUNA = registrar('txt.qtde_coluna', r':\s*(\d{1,2})\s*(?:$|[\r\n|:])')
+TXT_QTDE_ROTULO = registrar('txt.qtde_rotulo', r'(?:Qtd|QTD|Qtde|QTDE|quantidade)[.:\s]+(\d+)', re.IGNORECASE)
+TXT_NUMEROS = registrar('txt.numeros', r'\b(\d+)\b')
+
+# ===== PDF TEXTUAL (PDFTextParser) =====
+CNPJ_FORMATADO = registrar('cnpj.formatado', r'\d{2}\.\d{3}\.\d{3}/0\d{3}-\d{2}')
+TEXTO_QTDE_ISOLADA = registrar('pdf_texto.qtde', r'\s(\d{1,3})\s')
+TEXTO_PRECO_ESPACO = registrar('pdf_texto.remove_preco', r'\s+\d+[.,]\d{2}')
+TEXTO_NUMERO_ESPACO = registrar('pdf_texto.remove_qtde', r'\s+\d+\s+')
+
+# ===== LABOTRAT =====
+# Aba do pedido: "TABELA VENDA 2025.2", "Tabela Venda", "TABELA VENDA 2026.1"...
+# (o grupo é a versão da tabela, quando houver)
+LABOTRAT_ABA_VENDA = registrar('labotrat.aba_venda', r'tabela\s+venda\b\s*(\d+(?:\.\d+)*)?.*', re.IGNORECASE)
+# CNPJ formatado (xx.xxx.xxx/xxxx-xx) na linha 5 da planilha
+LABOTRAT_CNPJ = registrar('labotrat.cnpj', r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}')
+
+# Regex de layouts de fornecedor (ex: prudence.loja) são registradas pelo
+# layout_engine a partir de src/processing/layouts/*.json
@@ -2,7 +2,12 @@
 
 import re
 from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
 from src.utils.constants import ALLOWED_EXTENSIONS, MAX_FILE_SIZE
+from src.utils.patterns import SEQUENCIA_EAN
 
 
 def is_allowed_file(filename: str) -> bool:
@@ -112,6 +117,85 @@ def extract_all_cnpjs(text: str) -> dict[str, str] | None:
     return cnpjs_dict if cnpjs_dict else None
 
 
+# Rótulos aceitos antes do EAN, na ordem de prioridade de extract_ean13. Cada
+# rótulo é uma lista de palavras separadas por espaços no texto; o segundo
+# item é um sufixo opcional (regex) logo após a última palavra
+_ROTULOS_EAN = [
+    (['Código', 'de', 'Barras'], ''),
+    (['Codigo', 'de', 'Barras'], ''),
+    (['Código', 'Barras'], ''),
+    (['Codigo', 'Barras'], ''),
+    (['CodBarra'], ''),
+    (['Cod', 'Barra'], ''),
+    (['Ref'], r'\.?'),
+    (['Referência'], ''),
+    (['Referencia'], ''),
+    (['EAN'], ''),
+    (['Barras'], ''),
+]
+
+# Padrões sem rótulo, depois dos rótulos na prioridade
+_EAN_DOIS_PONTOS = len(_ROTULOS_EAN)        # ':7891234567890 ' (formato tabular)
+_EAN_ISOLADO = len(_ROTULOS_EAN) + 1        # 13 dígitos isolados por espaços
+_TOTAL_PADROES_EAN = len(_ROTULOS_EAN) + 2
+
+
+def _rotulo_invertido(palavras: list[str], sufixo: str) -> re.Pattern:
+    """
+    Regex do rótulo + separador (\s*:?\s*) aplicada ao texto invertido, a partir
+    da posição imediatamente antes do número.
+    """
+    invertidas = [re.escape(palavra[::-1]) for palavra in reversed(palavras)]
+    return re.compile(r'\s*:?\s*' + sufixo + r'\s+'.join(invertidas), re.IGNORECASE)
+
+
+_ROTULOS_EAN_INVERTIDOS = [_rotulo_invertido(palavras, sufixo) for palavras, sufixo in _ROTULOS_EAN]
+
+# Todos os padrões exigem um não-dígito antes do número, então só o início de
+# cada sequência de 13+ dígitos (SEQUENCIA_EAN) pode ser um EAN
+_ESPACO = re.compile(r'\s')
+
+
+def iter_ean13(text: str):
+    """
+    Percorre o texto uma vez e devolve cada candidato a EAN-13 com seu contexto.
+    
+    Yields:
+        (ean, inicio, padroes) em ordem de posição - ean são os 13 primeiros
+        dígitos da sequência, inicio sua posição no texto e padroes o conjunto
+        de índices (prioridade de extract_ean13) dos padrões que o aceitam
+    """
+    if not text:
+        return
+    
+    invertido = None
+    for match in SEQUENCIA_EAN.finditer(text):
+        inicio = match.start()
+        fim = inicio + 13
+        padroes = set()
+        
+        # Rótulos: casados de trás para frente a partir do início do número
+        if inicio > 0:
+            if invertido is None:
+                invertido = text[::-1]
+            pos = len(text) - inicio
+            for indice, rotulo in enumerate(_ROTULOS_EAN_INVERTIDOS):
+                if rotulo.match(invertido, pos):
+                    padroes.add(indice)
+        
+        # ':' colado no número e espaço depois dele (sequências longas não casam)
+        seguido_de_espaco = fim < len(text) and _ESPACO.match(text, fim) is not None
+        if inicio > 0 and text[inicio - 1] == ':' and seguido_de_espaco:
+            padroes.add(_EAN_DOIS_PONTOS)
+        
+        # Isolado: início do texto ou espaço antes, fim do texto ou espaço depois
+        if (inicio == 0 or _ESPACO.match(text, inicio - 1)) and (fim == len(text) or seguido_de_espaco):
+            padroes.add(_EAN_ISOLADO)
+        
+        if padroes:
+            yield match.group()[:13], inicio, padroes
+
+
 def extract_ean13(text: str) -> str | None:
     """
     Extrai EAN-13 do texto buscando por diversos padrões de nome.
@@ -124,38 +208,25 @@ def extract_ean13(text: str) -> str | None:
     - Barras: XXXXXXXXXXXXX
     - etc.
     
+    Para cada padrão, em ordem de prioridade, vale a primeira ocorrência no
+    texto; se o EAN dela for inválido, passa ao próximo padrão.
+    
     Args:
         text: Texto contendo o EAN-13
         
     Returns:
         EAN-13 (13 dígitos) ou None se não encontrado
     """
-    if not text:
+    candidatos = list(iter_ean13(text))
+    if not candidatos:
         return None
     
-    # Lista de variações de nomes para EAN
-    variacoes = [
-        r'Código\s+de\s+Barras\s*:?\s*(\d{13})',
-        r'Codigo\s+de\s+Barras\s*:?\s*(\d{13})',
-        r'Código\s+Barras\s*:?\s*(\d{13})',
-        r'Codigo\s+Barras\s*:?\s*(\d{13})',
-        r'CodBarra\s*:?\s*(\d{13})',
-        r'Cod\s+Barra\s*:?\s*(\d{13})',
-        r'Ref\.?\s*:?\s*(\d{13})',
-        r'Referência\s*:?\s*(\d{13})',
-        r'Referencia\s*:?\s*(\d{13})',
-        r'EAN\s*:?\s*(\d{13})',
-        r'Barras\s*:?\s*(\d{13})',
-        r':(\d{13})\s',  # EAN entre dois-pontos com espaço após (formato tabular)
-        r'(?:^|\s)(\d{13})(?:\s|$)',  # Apenas 13 dígitos isolados
-    ]
-    
-    for pattern in variacoes:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            ean = match.group(1)
-            if is_valid_ean13(ean):
-                return ean
+    for indice in range(_TOTAL_PADROES_EAN):
+        for ean, _, padroes in candidatos:
+            if indice in padroes:
+                if is_valid_ean13(ean):
+                    return ean
+                break
     
     return None
 
@@ -244,8 +315,7 @@ def is_valid_cnpj(cnpj: str) -> bool:
         return False
     
     # Calcula primeiro check digit
-    sequencia = '5432109876543'
-    soma = sum(int(d) * int(s) for d, s in zip(cnpj[:12], sequencia))
+    soma = sum(int(d) * p for d, p in zip(cnpj[:12], _PESOS_CNPJ[1:]))
     primeiro_digito = 11 - (soma % 11)
     primeiro_digito = 0 if primeiro_digito > 9 else primeiro_digito
     
@@ -253,14 +323,84 @@ def is_valid_cnpj(cnpj: str) -> bool:
         return False
     
     # Calcula segundo check digit
-    sequencia = '6543210987654'
-    soma = sum(int(d) * int(s) for d, s in zip(cnpj[:13], sequencia))
+    soma = sum(int(d) * p for d, p in zip(cnpj[:13], _PESOS_CNPJ))
     segundo_digito = 11 - (soma % 11)
     segundo_digito = 0 if segundo_digito > 9 else segundo_digito
     
     return int(cnpj[13]) == segundo_digito
 
 
+# Pesos do segundo dígito verificador do CNPJ; o primeiro usa os 12 últimos
+_PESOS_CNPJ = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+
+# Pesos do dígito verificador do EAN-13 (posições 1 a 12)
+_PESOS_EAN13 = np.array([1, 3] * 6)
+
+
+def _matriz_digitos(valores, tamanho: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converte uma coluna de strings em matriz de dígitos (n, tamanho).
+    
+    Returns:
+        (digitos, completos) - completos indica as entradas com exatamente
+        `tamanho` dígitos ASCII; as demais linhas da matriz não têm significado
+    """
+    valores = np.asarray(valores, dtype=object).ravel()
+    # Um caractere a mais que o tamanho esperado basta para detectar strings longas
+    texto = np.array([v if isinstance(v, str) else '' for v in valores], dtype=f'U{tamanho + 1}')
+    codigos = texto.view(np.uint32).reshape(len(texto), tamanho + 1)
+    
+    digitos = codigos[:, :tamanho].astype(np.int64) - ord('0')
+    completos = ((digitos >= 0) & (digitos <= 9)).all(axis=1) & (codigos[:, tamanho] == 0)
+    return digitos, completos
+
+
+def validate_ean13_array(eans) -> np.ndarray:
+    """
+    Versão vetorizada de is_valid_ean13.
+    
+    Args:
+        eans: Series, array ou lista de strings; valores que não são string são inválidos
+        
+    Returns:
+        Array booleano com o resultado de cada EAN
+    """
+    digitos, validos = _matriz_digitos(eans, 13)
+    if not len(digitos):
+        return validos
+    
+    # Rejeita sequências repetidas
+    validos &= (digitos != digitos[:, :1]).any(axis=1)
+    
+    check_digit = (10 - (digitos[:, :12] @ _PESOS_EAN13) % 10) % 10
+    return validos & (digitos[:, 12] == check_digit)
+
+
+def validate_cnpj_array(cnpjs) -> np.ndarray:
+    """
+    Versão vetorizada de is_valid_cnpj.
+    
+    Args:
+        cnpjs: Series, array ou lista de CNPJs limpos (apenas dígitos)
+        
+    Returns:
+        Array booleano com o resultado de cada CNPJ
+    """
+    digitos, validos = _matriz_digitos(cnpjs, 14)
+    if not len(digitos):
+        return validos
+    
+    # Rejeita sequências repetidas (ex: 00000000000000)
+    validos &= (digitos != digitos[:, :1]).any(axis=1)
+    
+    primeiro_digito = 11 - (digitos[:, :12] @ _PESOS_CNPJ[1:]) % 11
+    primeiro_digito[primeiro_digito > 9] = 0
+    segundo_digito = 11 - (digitos[:, :13] @ _PESOS_CNPJ) % 11
+    segundo_digito[segundo_digito > 9] = 0
+    
+    return validos & (digitos[:, 12] == primeiro_digito) & (digitos[:, 13] == segundo_digito)
+
+
 def validate_file(filename: str, file_size: int) -> tuple[bool, str]:
     """
     Valida um arquivo completamente.
@@ -329,6 +469,104 @@ def extract_multiplicador_fardos(descricao: str) -> tuple[str, int]:
     return descricao, 1
 
 
+# Padrões de extract_multiplicador_fardos em uma única regex. Cada padrão termina
+# em um caractere diferente (')', ']', dígito, 'un'/'unidades'), então no máximo um
+# deles casa com uma descrição e a ordem de prioridade não muda o resultado. O
+# prefixo (.*?) captura a descrição antes do multiplicador: como o padrão termina
+# em \s*$, remover o match (re.sub) equivale a ficar só com o prefixo
+_PADRAO_FARDOS = re.compile(
+    r'^(.*?)(?:'
+    r'\(\s*(\d+)\s*\)'                        # PRODUTO (12)
+    r'|\[\s*(\d+)\s*\]'                       # PRODUTO [12]
+    r'|[xX]\s*(\d+)'                           # PRODUTO x12
+    r'|(\d+)\s*(?i:un(?:idades)?)'              # PRODUTO 12un / 12 unidades
+    r')\s*$',
+    re.DOTALL
+)
+
+
+def extract_multiplicador_fardos_serie(descricoes: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """
+    Versão vetorizada de extract_multiplicador_fardos para uma coluna de descrições.
+    
+    Args:
+        descricoes: Series de strings não vazias
+        
+    Returns:
+        (descricoes_limpas, multiplicadores) com o mesmo índice da entrada
+    """
+    limpas = descricoes.copy()
+    multiplicadores = pd.Series(1, index=descricoes.index, dtype='int64')
+    if descricoes.empty:
+        return limpas, multiplicadores
+    
+    partes = descricoes.str.extract(_PADRAO_FARDOS)
+    numero = partes[1].fillna(partes[2]).fillna(partes[3]).fillna(partes[4])
+    encontrados = numero.notna()
+    if encontrados.any():
+        idx = partes.index[encontrados]
+        mult = numero[encontrados].map(int)
+        mult = mult.where(mult > 1, 1)
+        if mult.max() >= 2 ** 63:
+            # Multiplicador fora do int64: mantém inteiros do Python
+            multiplicadores = multiplicadores.astype(object)
+        multiplicadores.loc[idx] = mult
+        limpas.loc[idx] = partes.loc[encontrados, 0].str.strip()
+    
+    return limpas, multiplicadores
+
+
+# Número simples (após limpeza de normalizar_preco), convertido igual por float() e to_numeric
+_NUMERO_SIMPLES = r'^[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)$'
+
+
+def normalizar_preco_serie(precos: pd.Series) -> pd.Series:
+    """
+    Versão vetorizada de normalizar_preco para uma coluna inteira.
+    
+    Números e strings em formato comum (3,99 / R$ 3.000,99) são convertidos com
+    operações de coluna; valores fora desses formatos usam normalizar_preco
+    elemento a elemento, então o resultado é sempre o mesmo.
+    """
+    kind = precos.dtype.kind
+    if kind in 'iu':
+        return precos.astype('float64')
+    if kind == 'f':
+        # normalizar_preco devolve 0.0 para zero (inclusive -0.0) e mantém NaN
+        return precos.where(precos != 0, 0.0).astype('float64')
+    
+    # Coluna de texto ou mista: separa números, strings e o resto
+    valores = precos.to_numpy(dtype=object)
+    eh_texto = np.fromiter((type(v) is str for v in valores), dtype=bool, count=len(valores))
+    eh_numero = np.fromiter((isinstance(v, (int, float)) for v in valores), dtype=bool, count=len(valores))
+    resultado = pd.Series(np.nan, index=precos.index, dtype='float64')
+    pendentes = ~eh_numero & ~eh_texto
+    
+    if eh_numero.any():
+        numeros = pd.Series(valores[eh_numero], index=precos.index[eh_numero]).astype('float64')
+        resultado[eh_numero] = numeros.where(numeros != 0, 0.0)
+    
+    if eh_texto.any():
+        texto = pd.Series(valores[eh_texto], index=precos.index[eh_texto], dtype=object)
+        texto = texto.str.strip().str.replace('\xa0', '', regex=False).str.replace(' ', '', regex=False)
+        texto = texto.str.replace('R$', '', regex=False).str.replace('r$', '', regex=False).str.strip()
+        
+        tem_virgula = texto.str.contains(',', regex=False)
+        tem_ponto = texto.str.contains('.', regex=False)
+        # Vírgula e ponto: formato brasileiro (3.000,99); só vírgula: decimal
+        texto = texto.where(~(tem_virgula & tem_ponto), texto.str.replace('.', '', regex=False))
+        texto = texto.where(~tem_virgula, texto.str.replace(',', '.', regex=False))
+        
+        simples = texto.str.match(_NUMERO_SIMPLES).astype(bool)
+        resultado[simples.index[simples]] = pd.to_numeric(texto[simples]).astype('float64')
+        pendentes[eh_texto] = ~simples.to_numpy()
+    
+    # Vazios, None e formatos incomuns (ex: '1e3', 'abc'): regra original
+    if pendentes.any():
+        resultado[pendentes] = precos[pendentes].map(normalizar_preco).astype('float64')
+    return resultado
+
+
 def normalizar_preco(preco: any) -> float:
     """
     Normaliza preço para float, tratando múltiplos formatos.